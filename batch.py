@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Batch module for parsing many markdown and YAML files in one run.
+"""
+
+import os
+import glob
+from pathlib import Path
+from functools import partial
+from typing import Dict, List, Any, Collection, Iterable, Optional, Tuple
+from loguru import logger
+
+from cache import SectionCache
+from ids import IdIndex
+from metrics import Metrics
+from parser import TestCaseParser
+
+
+# File extensions handled by the parser
+MARKDOWN_EXTENSIONS = ('.md', '.markdown')
+YAML_EXTENSIONS = ('.yaml', '.yml')
+SUPPORTED_EXTENSIONS = MARKDOWN_EXTENSIONS + YAML_EXTENSIONS
+
+# How to handle a section name defined by more than one input file
+CONFLICT_POLICIES = ("error", "suffix", "merge")
+
+
+def collect_inputs(patterns: Iterable[str]) -> List[str]:
+    """
+    Expand input files, directories and glob patterns into a list of files.
+
+    Directories are searched recursively for supported files. Files from a
+    directory or a glob pattern are sorted so that the result, and therefore
+    the handling of conflicting section names, is deterministic.
+
+    Args:
+        patterns: File paths, directory paths or glob patterns.
+
+    Returns:
+        List of unique file paths in the order they were given.
+
+    Raises:
+        ValueError: If a path does not exist, a file has an unsupported extension
+            or a pattern matches no supported file.
+    """
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            matches = sorted(
+                str(path) for path in Path(pattern).rglob("*")
+                if path.is_file() and path.suffix.lower() in SUPPORTED_EXTENSIONS
+            )
+            if not matches:
+                logger.warning(f"No markdown or YAML files found in directory: {pattern}")
+            files.extend(matches)
+        elif os.path.exists(pattern):
+            extension = Path(pattern).suffix.lower()
+            if extension not in SUPPORTED_EXTENSIONS:
+                raise ValueError(f"Unsupported file extension: {extension}. Use .md, .markdown, .yaml, or .yml")
+            files.append(pattern)
+        elif glob.has_magic(pattern):
+            matches = sorted(
+                path for path in glob.glob(pattern, recursive=True)
+                if os.path.isfile(path) and Path(path).suffix.lower() in SUPPORTED_EXTENSIONS
+            )
+            if not matches:
+                raise ValueError(f"No input files match pattern: {pattern}")
+            files.extend(matches)
+        else:
+            raise ValueError(f"Input file not found: {pattern}")
+            
+    # Drop duplicates while keeping the first occurrence
+    return list(dict.fromkeys(files))
+
+
+def parse_input(file_path: str, verbose: bool = False, yaml_backend: str = "auto", section_workers: int = 1,
+                cache_dir: Optional[str] = None, cache_size: int = SectionCache.DEFAULT_MAX_BYTES,
+                metrics: Optional[Metrics] = None, compact: bool = False,
+                skip_sections: Optional[Dict[str, Collection[str]]] = None,
+                id_index: Optional[IdIndex] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Parse a single markdown or YAML file.
+
+    This is a module-level function so that it can be sent to worker processes.
+
+    Args:
+        file_path: Path to the input file.
+        verbose: Whether to output detailed error messages and suggestions.
+        yaml_backend: YAML loader to use: "auto", "c" or "python".
+        section_workers: Number of worker processes used to load the sections of a large file.
+        cache_dir: Directory of the parsed section cache, or None to disable caching.
+        cache_size: Maximum size of the parsed section cache in bytes.
+        metrics: Collector of the time spent in each parsing stage.
+        compact: Whether to return the test cases as compact records.
+        skip_sections: Names of the sections not to parse, by input file path.
+        id_index: Index to which the test case IDs of each section are added.
+
+    Returns:
+        Dictionary with test case file names as keys and lists of test case dictionaries as values.
+
+    Raises:
+        IdError: If the ID index is strict and a test case ID is missing or repeated.
+    """
+    cache = SectionCache(cache_dir, max_bytes=cache_size) if cache_dir else None
+    parser = TestCaseParser(
+        verbose=verbose, yaml_backend=yaml_backend, section_workers=section_workers, cache=cache, metrics=metrics,
+        compact=compact, skip_sections=skip_sections, id_index=id_index,
+    )
+    if Path(file_path).suffix.lower() in YAML_EXTENSIONS:
+        return parser.parse_yaml_file(file_path)
+    return parser.parse_file(file_path)
+
+
+def _parse_input_measured(file_path: str, measure: bool = True, index_ids: bool = False, strict_ids: bool = False,
+                          **kwargs) -> Tuple[Dict[str, List[Dict[str, Any]]], List[Dict[str, Any]], Optional[IdIndex]]:
+    """Parse a single file in a worker process and return its result with the stage timings and the test case IDs."""
+    metrics = Metrics(enabled=measure)
+    id_index = IdIndex(strict=strict_ids) if index_ids else None
+    return parse_input(file_path, metrics=metrics, id_index=id_index, **kwargs), metrics.records, id_index
+
+
+def parse_inputs(file_paths: List[str], jobs: int = 1, verbose: bool = False, yaml_backend: str = "auto",
+                 section_workers: int = 1, cache_dir: Optional[str] = None,
+                 cache_size: int = SectionCache.DEFAULT_MAX_BYTES,
+                 metrics: Optional[Metrics] = None, compact: bool = False,
+                 skip_sections: Optional[Dict[str, Collection[str]]] = None,
+                 id_index: Optional[IdIndex] = None) -> List[Tuple[str, Dict[str, List[Dict[str, Any]]]]]:
+    """
+    Parse input files, in parallel worker processes when jobs > 1.
+
+    Args:
+        file_paths: Paths of the input files.
+        jobs: Number of worker processes.
+        verbose: Whether to output detailed error messages and suggestions.
+        yaml_backend: YAML loader to use: "auto", "c" or "python".
+        section_workers: Number of worker processes used to load the sections of a large file.
+        cache_dir: Directory of the parsed section cache, or None to disable caching.
+        cache_size: Maximum size of the parsed section cache in bytes.
+        metrics: Collector of the time spent in each parsing stage, including
+            the stages run in worker processes.
+        compact: Whether to return the test cases as compact records.
+        skip_sections: Names of the sections not to parse, by input file path,
+            see :func:`overwrite.plan_overwrites`.
+        id_index: Index to which the test case IDs of each section are added.
+            Worker processes index their own files, and their indexes are
+            merged in input order. If the index is strict, so are those of the
+            workers, and the files not parsed yet are cancelled on the first error.
+
+    Returns:
+        List of (file path, parsed test cases) tuples in input order.
+
+    Raises:
+        IdError: If the ID index is strict and a test case ID is missing or repeated.
+    """
+    for file_path in file_paths:
+        logger.info(f"Processing file: {file_path}")
+        
+    options = dict(
+        verbose=verbose, yaml_backend=yaml_backend, section_workers=section_workers,
+        cache_dir=cache_dir, cache_size=cache_size, compact=compact, skip_sections=skip_sections,
+    )
+    if jobs <= 1 or len(file_paths) <= 1:
+        worker = partial(parse_input, metrics=metrics, id_index=id_index, **options)
+        return list(zip(file_paths, map(worker, file_paths)))
+        
+    from concurrent.futures import ProcessPoolExecutor
+    
+    jobs = min(jobs, len(file_paths))
+    chunksize = max(1, len(file_paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        measure = metrics is not None and metrics.enabled
+        if not measure and id_index is None:
+            return list(zip(file_paths, executor.map(partial(parse_input, **options), file_paths, chunksize=chunksize)))
+            
+        worker = partial(
+            _parse_input_measured, measure=measure, index_ids=id_index is not None,
+            strict_ids=id_index is not None and id_index.strict, **options
+        )
+        results = []
+        try:
+            for file_path, (test_cases, records, file_ids) in zip(
+                file_paths, executor.map(worker, file_paths, chunksize=chunksize)
+            ):
+                if measure:
+                    metrics.extend(records)
+                if id_index is not None:
+                    id_index.merge(file_ids)
+                results.append((file_path, test_cases))
+        except BaseException:
+            executor.shutdown(wait=True, cancel_futures=True)
+            raise
+        return results
+
+
+def suffixed_name(file_name: str, taken: Dict[str, Any]) -> str:
+    """Return the first of "name_2.ext", "name_3.ext", ... that is not taken."""
+    path = Path(file_name)
+    index = 2
+    while True:
+        candidate = str(path.with_name(f"{path.stem}_{index}{path.suffix}"))
+        if candidate not in taken:
+            return candidate
+        index += 1
+
+
+def merge_results(results: List[Tuple[str, Dict[str, List[Dict[str, Any]]]]],
+                  on_conflict: str = "error") -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Merge parsed test cases of several files into one dictionary.
+
+    Args:
+        results: List of (file path, parsed test cases) tuples, in input order.
+        on_conflict: What to do when a section name is defined by more than one
+            file: "error" to fail, "suffix" to rename the later section to
+            "name_2", "name_3", ..., or "merge" to append its test cases.
+
+    Returns:
+        Dictionary with test case file names as keys and lists of test case dictionaries as values.
+
+    Raises:
+        ValueError: If on_conflict is unknown, or is "error" and a section name is defined twice.
+    """
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy: {on_conflict}. Use one of: {', '.join(CONFLICT_POLICIES)}")
+        
+    merged = {}
+    sources = {}
+    for file_path, test_cases in results:
+        for file_name, cases in test_cases.items():
+            if file_name not in merged:
+                merged[file_name] = cases
+                sources[file_name] = file_path
+            elif on_conflict == "error":
+                raise ValueError(f"Section {file_name} is defined in both {sources[file_name]} and {file_path}")
+            elif on_conflict == "suffix":
+                new_name = suffixed_name(file_name, merged)
+                logger.warning(f"Section {file_name} from {file_path} renamed to {new_name}")
+                merged[new_name] = cases
+                sources[new_name] = file_path
+            else:
+                logger.info(f"Merging section {file_name} from {file_path} into {sources[file_name]}")
+                merged[file_name] = list(merged[file_name] or []) + list(cases or [])
+                
+    return merged
@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark module with a synthetic spec generator and the standard benchmark scenarios.
+"""
+
+import os
+import sys
+import math
+import time
+import random
+import tempfile
+import platform
+import tracemalloc
+from collections import deque
+from typing import Dict, List, Any, Callable, Iterable, NamedTuple, Optional, Sequence
+from loguru import logger
+
+from converter import TestCaseConverter, normalize_cases
+from parser import TestCaseParser
+from version import __version__
+
+
+# Benchmark scenarios, in the order they run
+SCENARIOS = ("parse", "parse-yaml", "normalize", "csv", "xlsx")
+
+# Relative loss of throughput or growth of peak memory reported as a regression
+DEFAULT_TOLERANCE = 0.2
+
+# Words used for generated text
+_ASCII_WORDS = (
+    "open", "the", "login", "page", "enter", "valid", "user", "name", "and", "password",
+    "click", "submit", "button", "check", "that", "dashboard", "is", "shown", "with", "data",
+)
+_JAPANESE_WORDS = (
+    "ログイン", "画面", "を", "開く", "ユーザー名", "と", "パスワード", "入力", "する",
+    "ボタン", "押下", "ダッシュボード", "が", "表示", "される", "確認",
+)
+_PRIORITIES = ("High", "Medium", "Low")
+_STATUSES = ("Not executed", "Passed", "Failed")
+
+
+class SpecConfig(NamedTuple):
+    """Shape of a generated test specification."""
+
+    sections: int = 10
+    cases: int = 100
+    field_size: int = 40
+    multiline: bool = True
+    non_ascii: bool = True
+    seed: int = 0
+
+
+def _text(rng: random.Random, size: int, non_ascii: bool) -> str:
+    """Return a sentence of about size characters."""
+    words = []
+    length = 0
+    while length < size:
+        vocabulary = _JAPANESE_WORDS if non_ascii and rng.random() < 0.3 else _ASCII_WORDS
+        word = rng.choice(vocabulary)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)
+
+
+def generate_test_cases(config: SpecConfig = SpecConfig()) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generate test cases deterministically from a configuration.
+
+    Args:
+        config: Shape of the specification. The same configuration always
+            produces the same test cases.
+
+    Returns:
+        Dictionary with test case file names as keys and lists of test case dictionaries as values.
+    """
+    rng = random.Random(config.seed)
+    test_cases = {}
+    for section in range(config.sections):
+        cases = []
+        for index in range(config.cases):
+            if config.multiline:
+                steps = "".join(
+                    f"{step}. {_text(rng, config.field_size, config.non_ascii)}\n" for step in range(1, 4)
+                )
+            else:
+                steps = _text(rng, config.field_size, config.non_ascii)
+            cases.append({
+                "ID": f"TC{section:03d}-{index:05d}",
+                "Name": _text(rng, config.field_size // 2, config.non_ascii),
+                "Desc": _text(rng, config.field_size, config.non_ascii),
+                "Test Steps": steps,
+                "Expected Result": _text(rng, config.field_size, config.non_ascii),
+                "Priority": rng.choice(_PRIORITIES),
+                "Status": rng.choice(_STATUSES),
+            })
+        test_cases[f"bench_section_{section:03d}.md"] = cases
+    return test_cases
+
+
+def _yaml_cases(cases: List[Dict[str, Any]], indent: str = "") -> Iterable[str]:
+    """Write test cases as a YAML list, using literal block scalars for multiline values."""
+    for case in cases:
+        prefix = f"{indent}- "
+        for key, value in case.items():
+            if "\n" in value:
+                yield f"{prefix}{key}: |\n"
+                for line in value.splitlines():
+                    yield f"{indent}    {line}\n"
+            else:
+                yield f"{prefix}{key}: {value}\n"
+            prefix = f"{indent}  "
+
+
+def generate_markdown(config: SpecConfig = SpecConfig()) -> str:
+    """
+    Generate a markdown specification with one test case section per generated section.
+
+    Args:
+        config: Shape of the specification.
+
+    Returns:
+        Markdown document.
+    """
+    parts = ["# Benchmark specification\n"]
+    for file_name, cases in generate_test_cases(config).items():
+        parts.append(f"\n## Feature {file_name}\n\nGenerated section for benchmarking.\n\n")
+        parts.append(f"### TestCases ({file_name})\n")
+        parts.extend(_yaml_cases(cases))
+    return "".join(parts)
+
+
+def generate_yaml(config: SpecConfig = SpecConfig()) -> str:
+    """
+    Generate a YAML specification mapping test case file names to test cases.
+
+    Args:
+        config: Shape of the specification.
+
+    Returns:
+        YAML document.
+    """
+    parts = []
+    for file_name, cases in generate_test_cases(config).items():
+        parts.append(f"{file_name}:\n")
+        parts.extend(_yaml_cases(cases, indent="  "))
+    return "".join(parts)
+
+
+def percentile(values: Sequence[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of a non-empty list of values."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(len(ordered) * fraction))
+    return ordered[rank - 1]
+
+
+def measure(operation: Callable[[], Any], repeat: int = 5, warmup: int = 1) -> Dict[str, float]:
+    """
+    Time an operation and measure its peak memory.
+
+    The operation runs warmup times untimed, repeat times timed, and once more
+    under tracemalloc so that tracing does not distort the timings.
+
+    Args:
+        operation: Callable running one iteration of a scenario.
+        repeat: Number of timed iterations.
+        warmup: Number of untimed iterations run first.
+
+    Returns:
+        Dictionary with the number of iterations, operations per second,
+        p50 and p95 latency in milliseconds and peak memory in MiB.
+    """
+    for _ in range(warmup):
+        operation()
+        
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        operation()
+        timings.append(time.perf_counter() - start)
+        
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        
+    total = sum(timings)
+    return {
+        "iterations": len(timings),
+        "ops_per_sec": len(timings) / total if total else 0.0,
+        "p50_ms": percentile(timings, 0.5) * 1000,
+        "p95_ms": percentile(timings, 0.95) * 1000,
+        "peak_memory_mb": peak / 2**20,
+    }
+
+
+def run_benchmarks(scenarios: Sequence[str] = SCENARIOS, config: SpecConfig = SpecConfig(), repeat: int = 5,
+                   warmup: int = 1) -> Dict[str, Any]:
+    """
+    Run benchmark scenarios on a generated specification.
+
+    Args:
+        scenarios: Names of the scenarios to run, see ``SCENARIOS``.
+        config: Shape of the generated specification.
+        repeat: Number of timed iterations per scenario.
+        warmup: Number of untimed iterations run before timing.
+
+    Returns:
+        Dictionary with the environment, the configuration and the results of each scenario.
+
+    Raises:
+        ValueError: If a scenario is unknown.
+    """
+    unknown = [name for name in scenarios if name not in SCENARIOS]
+    if unknown:
+        raise ValueError(f"Unknown benchmark scenario: {', '.join(unknown)}. Use one of: {', '.join(SCENARIOS)}")
+        
+    test_cases = generate_test_cases(config)
+    num_cases = config.sections * config.cases
+    results = {}
+    
+    # The code under test logs every section and file; keep the output readable
+    logger.disable("parser")
+    logger.disable("converter")
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            parser = TestCaseParser()
+            converter = TestCaseConverter(output_dir=temp_dir, skip_unchanged=False)
+            markdown = generate_markdown(config)
+            yaml_path = os.path.join(temp_dir, "bench_spec.yaml")
+            with open(yaml_path, "w", encoding="utf-8") as f:
+                f.write(generate_yaml(config))
+                
+            operations = {
+                "parse": lambda: parser.parse_content(markdown, "bench_spec.md"),
+                "parse-yaml": lambda: parser.parse_yaml_file(yaml_path),
+                "normalize": lambda: [deque(normalize_cases(cases), maxlen=0) for cases in test_cases.values()],
+                "csv": lambda: converter.convert_to_csv(test_cases, force=True),
+                "xlsx": lambda: converter.convert_to_excel(test_cases, force=True),
+            }
+            for name in dict.fromkeys(scenarios):
+                result = measure(operations[name], repeat=repeat, warmup=warmup)
+                result["cases_per_sec"] = result["ops_per_sec"] * num_cases
+                results[name] = result
+    finally:
+        logger.enable("parser")
+        logger.enable("converter")
+        
+    return {
+        "version": __version__,
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "config": config._asdict(),
+        "scenarios": results,
+    }
+
+
+def compare_results(results: Dict[str, Any], baseline: Dict[str, Any],
+                    tolerance: float = DEFAULT_TOLERANCE) -> List[str]:
+    """
+    Compare benchmark results with a saved baseline.
+
+    A scenario regresses when its throughput drops, or its peak memory grows,
+    by more than the tolerance relative to the baseline. Scenarios missing
+    from either side are ignored.
+
+    Args:
+        results: Results returned by :func:`run_benchmarks`.
+        baseline: Earlier results in the same format.
+        tolerance: Allowed relative change, e.g. 0.2 for 20 percent.
+
+    Returns:
+        Descriptions of the regressions found; empty if there are none.
+    """
+    regressions = []
+    for name, current in results.get("scenarios", {}).items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if not previous:
+            continue
+            
+        if current["ops_per_sec"] < previous["ops_per_sec"] * (1 - tolerance):
+            regressions.append(
+                f"{name}: {current['ops_per_sec']:.2f} ops/s is slower than the baseline "
+                f"{previous['ops_per_sec']:.2f} ops/s"
+            )
+        if current["peak_memory_mb"] > previous["peak_memory_mb"] * (1 + tolerance):
+            regressions.append(
+                f"{name}: peak memory {current['peak_memory_mb']:.1f} MiB exceeds the baseline "
+                f"{previous['peak_memory_mb']:.1f} MiB"
+            )
+    return regressions
+
+
+def format_results(results: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Format benchmark results as a table.
+
+    Args:
+        results: Results returned by :func:`run_benchmarks`.
+        baseline: Earlier results to show the change in throughput against.
+
+    Returns:
+        Table with one line per scenario.
+    """
+    lines = [f"{'scenario':<11} {'ops/s':>9} {'cases/s':>11} {'p50 ms':>9} {'p95 ms':>9} {'peak MiB':>9} {'change':>8}"]
+    for name, result in results["scenarios"].items():
+        previous = (baseline or {}).get("scenarios", {}).get(name)
+        change = ""
+        if previous and previous["ops_per_sec"]:
+            change = f"{(result['ops_per_sec'] / previous['ops_per_sec'] - 1) * 100:+.0f}%"
+        lines.append(
+            f"{name:<11} {result['ops_per_sec']:>9.2f} {result['cases_per_sec']:>11.0f} {result['p50_ms']:>9.1f} "
+            f"{result['p95_ms']:>9.1f} {result['peak_memory_mb']:>9.1f} {change:>8}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the CSV output written by one thread and by a pool of writer threads.
+
+Many small sections make the time spent opening, replacing and closing files
+dominate, as on a network file system. The output manifest is disabled, so
+every run writes all files. Usage:
+
+    python benchmarks/bench_csv_workers.py --sections 500 --cases 20 --workers 1 4 8
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+from typing import Optional
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from bench import SpecConfig, generate_test_cases
+from converter import TestCaseConverter
+
+
+def measure(workers: int, test_cases, num_files: int, output_dir: Optional[str] = None):
+    """Write the CSV files once with the given number of threads and report the elapsed time."""
+    with tempfile.TemporaryDirectory(dir=output_dir) as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, skip_unchanged=False, csv_workers=workers)
+        start = time.perf_counter()
+        converter.convert_to_csv(test_cases, force=True)
+        elapsed = time.perf_counter() - start
+    print(f"{workers:>3} workers {elapsed:>8.2f} s {num_files / elapsed:>10.0f} files/s")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sections", type=int, default=500, help="Number of generated sections")
+    arg_parser.add_argument("--cases", type=int, default=20, help="Number of test cases per section")
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="Numbers of writer threads to compare")
+    arg_parser.add_argument("--output-dir", help="Directory to write in, e.g. on a network file system (default: temporary directory)")
+    args = arg_parser.parse_args()
+    
+    logger.remove()
+    test_cases = generate_test_cases(SpecConfig(sections=args.sections, cases=args.cases, multiline=False))
+    for workers in args.workers:
+        measure(workers, test_cases, args.sections, args.output_dir)
+
+
+if __name__ == "__main__":
+    main()
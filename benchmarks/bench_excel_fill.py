@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing the previous and the single-pass worksheet fill.
+
+The previous fill created new style objects for every cell and measured
+column widths in a second pass over all cells. Usage:
+
+    python benchmarks/bench_excel_fill.py --rows 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import openpyxl
+from openpyxl.styles import Font, Alignment, PatternFill
+
+from bench import SpecConfig, generate_test_cases
+from converter import TEST_CASE_FIELDS, TestCaseConverter, normalize_cases
+
+
+def legacy_fill_sheet(sheet, cases, max_width=TestCaseConverter.MAX_COLUMN_WIDTH):
+    """Worksheet fill as previously done by convert_to_excel."""
+    for col_idx, field in enumerate(TEST_CASE_FIELDS, start=1):
+        cell = sheet.cell(row=1, column=col_idx, value=field)
+        cell.font = Font(bold=True)
+        cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
+        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+
+    for row_idx, row in enumerate(normalize_cases(cases, TEST_CASE_FIELDS), start=2):
+        for col_idx, value in enumerate(row, start=1):
+            cell = sheet.cell(row=row_idx, column=col_idx, value=str(value))
+            cell.alignment = Alignment(wrap_text=True)
+
+    for col in sheet.columns:
+        max_length = 0
+        column = col[0].column_letter
+        for cell in col:
+            if cell.value:
+                cell_length = len(str(cell.value))
+                if cell_length > max_length:
+                    max_length = cell_length
+        sheet.column_dimensions[column].width = min(max_length + 2, max_width)
+
+
+def measure(label: str, fill, cases):
+    """Fill a new worksheet and report the elapsed time."""
+    workbook = openpyxl.Workbook()
+    sheet = workbook.active
+    start = time.perf_counter()
+    fill(sheet, cases)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:>8.2f} s {len(cases) / elapsed:>12.0f} rows/s")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--rows", type=int, default=100000, help="Number of rows in the worksheet")
+    arg_parser.add_argument("--ascii-only", action="store_true", help="Generate ASCII text only")
+    args = arg_parser.parse_args()
+
+    config = SpecConfig(sections=1, cases=args.rows, non_ascii=not args.ascii_only)
+    cases = generate_test_cases(config)["bench_section_000.md"]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir)
+        legacy = measure("legacy", legacy_fill_sheet, cases)
+        single_pass = measure("single-pass", converter.fill_sheet, cases)
+    print(f"speed-up: {legacy / single_pass:.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the Excel output written as one workbook and as sharded workbooks built by worker processes.
+
+The output manifest is disabled, so every run builds all workbooks. Usage:
+
+    python benchmarks/bench_excel_shards.py --sections 16 --cases 5000 --workers 4
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from bench import SpecConfig, generate_test_cases
+from converter import TestCaseConverter
+
+
+def measure(label: str, test_cases, num_cases: int, **options):
+    """Write the Excel output once with the given converter options and report the elapsed time."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, skip_unchanged=False, **options)
+        start = time.perf_counter()
+        converter.convert_to_excel(test_cases, force=True, streaming=True)
+        elapsed = time.perf_counter() - start
+    print(f"{label:<22} {elapsed:>8.2f} s {num_cases / elapsed:>12.0f} cases/s")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sections", type=int, default=16, help="Number of generated sections")
+    arg_parser.add_argument("--cases", type=int, default=5000, help="Number of test cases per section")
+    arg_parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Number of worker processes")
+    args = arg_parser.parse_args()
+    
+    logger.remove()
+    test_cases = generate_test_cases(SpecConfig(sections=args.sections, cases=args.cases, multiline=False))
+    num_cases = args.sections * args.cases
+    
+    measure("single workbook", test_cases, num_cases)
+    measure("per section, 1 worker", test_cases, num_cases, excel_shard="section")
+    measure(f"per section, {args.workers} workers", test_cases, num_cases,
+            excel_shard="section", excel_workers=args.workers)
+
+
+if __name__ == "__main__":
+    main()
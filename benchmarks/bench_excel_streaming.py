@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing the in-memory and streaming Excel writers.
+
+Each mode runs in a fresh interpreter so that peak RSS is measured in
+isolation. Usage:
+
+    python benchmarks/bench_excel_streaming.py --cases 200000
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import resource
+import subprocess
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def make_test_cases(num_cases: int, sections: int):
+    """Build a synthetic test case dictionary."""
+    per_section = max(1, num_cases // sections)
+    test_cases = {}
+    for section in range(sections):
+        cases = []
+        for i in range(per_section):
+            cases.append({
+                "ID": f"TC{section:03d}{i:06d}",
+                "Name": f"Synthetic test case {i}",
+                "Desc": "Generated description for benchmarking " * 2,
+                "Test Steps": "1. Open the page\n2. Submit the form\n3. Check the result",
+                "Expected Result": "The result is shown",
+                "Priority": ("High", "Medium", "Low")[i % 3],
+                "Status": "Not executed",
+            })
+        test_cases[f"section_{section}.md"] = cases
+    return test_cases
+
+
+def run_child(mode: str, num_cases: int, sections: int):
+    """Run a single conversion and print its metrics as JSON."""
+    from loguru import logger
+    from converter import TestCaseConverter
+
+    logger.remove()
+    test_cases = make_test_cases(num_cases, sections)
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir)
+        start = time.perf_counter()
+        converter.convert_to_excel(test_cases, force=True, streaming=(mode == "streaming"))
+        elapsed = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    scale = 1 if sys.platform == "darwin" else 1024
+    print(json.dumps({
+        "mode": mode,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss * scale / 2**20,
+        "writer_rss_mb": (peak_rss - baseline_rss) * scale / 2**20,
+    }))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--cases", type=int, default=50000, help="Total number of test cases")
+    arg_parser.add_argument("--sections", type=int, default=4, help="Number of sheets")
+    arg_parser.add_argument("--mode", choices=["in-memory", "streaming"], help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.mode:
+        run_child(args.mode, args.cases, args.sections)
+        return
+
+    print(f"{'mode':<10} {'seconds':>9} {'peak RSS MB':>12} {'writer RSS MB':>14}")
+    for mode in ("in-memory", "streaming"):
+        output = subprocess.run(
+            [sys.executable, __file__, "--mode", mode,
+             "--cases", str(args.cases), "--sections", str(args.sections)],
+            check=True, capture_output=True, text=True,
+        ).stdout
+        result = json.loads(output)
+        print(f"{mode:<10} {result['seconds']:>9.2f} {result['peak_rss_mb']:>12.1f} {result['writer_rss_mb']:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the flat YAML fast path against the libyaml and pure Python YAML loaders.
+
+The sections of a generated specification are loaded with each method, and
+the share of sections the fast path handles is reported. Usage:
+
+    python benchmarks/bench_flat_yaml.py --sections 50 --cases 200
+"""
+
+import io
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import yaml
+
+from bench import SpecConfig, generate_markdown
+from parser import parse_flat_yaml, scan_sections
+
+
+def measure(label: str, load, contents, num_cases: int, baseline: float = 0.0) -> float:
+    """Load every section once and report the elapsed time."""
+    start = time.perf_counter()
+    for content in contents:
+        load(content)
+    elapsed = time.perf_counter() - start
+    speedup = f"{baseline / elapsed:>6.1f}x" if baseline else ""
+    print(f"{label:<10} {elapsed:>8.3f} s {num_cases / elapsed:>10.0f} cases/s {speedup}")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sections", type=int, default=50, help="Number of generated sections")
+    arg_parser.add_argument("--cases", type=int, default=200, help="Number of test cases per section")
+    arg_parser.add_argument("--field-size", type=int, default=40, help="Approximate length of text fields")
+    arg_parser.add_argument("--no-multiline", action="store_true", help="Do not generate multiline block scalars")
+    args = arg_parser.parse_args()
+    
+    markdown = generate_markdown(SpecConfig(
+        sections=args.sections, cases=args.cases, field_size=args.field_size, multiline=not args.no_multiline
+    ))
+    contents = [section.content for section in scan_sections(io.StringIO(markdown))]
+    num_cases = args.sections * args.cases
+    
+    handled = sum(parse_flat_yaml(content) is not None for content in contents)
+    print(f"fast path handles {handled} of {len(contents)} sections")
+    baseline = measure("python", lambda content: yaml.load(content, Loader=yaml.SafeLoader), contents, num_cases)
+    if hasattr(yaml, "CSafeLoader"):
+        measure("libyaml", lambda content: yaml.load(content, Loader=yaml.CSafeLoader), contents, num_cases, baseline)
+    measure("flat", parse_flat_yaml, contents, num_cases, baseline)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing reading a markdown file into a string with memory-mapping it.
+
+Each mode runs in a fresh interpreter so that peak RSS is measured in
+isolation. Usage:
+
+    python benchmarks/bench_mmap.py --size-mb 512
+    python benchmarks/bench_mmap.py --size-mb 2048 --scan-only
+"""
+
+import os
+import sys
+import json
+import time
+import io
+import argparse
+import resource
+import subprocess
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+PROSE = "This chapter describes the behaviour of the feature in prose that is not a test case.\n" * 20
+
+
+def write_document(path: str, size_mb: int, cases_per_section: int):
+    """Write a synthetic markdown document of about size_mb megabytes."""
+    target = size_mb * 2**20
+    written = 0
+    section = 0
+    with open(path, "w", encoding="utf-8") as f:
+        while written < target:
+            lines = [f"## Chapter {section}\n\n", PROSE, f"\n### TestCases (section_{section}.md)\n"]
+            for i in range(cases_per_section):
+                lines.append(
+                    f"- ID: TC{section:05d}{i:04d}\n"
+                    f"  Name: Synthetic test case {i}\n"
+                    f"  Test Steps: |\n"
+                    f"    1. Open the page\n"
+                    f"    2. Submit the form\n"
+                    f"  Expected Result: The result is shown\n"
+                    f"  Priority: {('High', 'Medium', 'Low')[i % 3]}\n"
+                )
+            lines.append("\n")
+            chunk = "".join(lines)
+            f.write(chunk)
+            written += len(chunk.encode("utf-8"))
+            section += 1
+
+
+def run_child(mode: str, path: str, scan_only: bool):
+    """Parse or scan the document once and print its metrics as JSON."""
+    from loguru import logger
+    from parser import TestCaseParser, scan_sections, scan_mapped_sections
+
+    logger.remove()
+    baseline_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = time.perf_counter()
+    if scan_only and mode == "read":
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        count = sum(1 for _ in scan_sections(io.StringIO(content)))
+    elif scan_only:
+        import mmap
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            count = sum(1 for _ in scan_mapped_sections(buffer))
+    else:
+        threshold = 1 if mode == "mmap" else sys.maxsize
+        count = len(TestCaseParser(mmap_threshold=threshold).parse_file(path))
+    elapsed = time.perf_counter() - start
+
+    peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and in kilobytes elsewhere
+    scale = 1 if sys.platform == "darwin" else 1024
+    print(json.dumps({
+        "mode": mode,
+        "sections": count,
+        "seconds": elapsed,
+        "peak_rss_mb": peak_rss * scale / 2**20,
+        "input_rss_mb": (peak_rss - baseline_rss) * scale / 2**20,
+    }))
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--size-mb", type=int, default=256, help="Size of the generated document in MiB")
+    arg_parser.add_argument("--cases", type=int, default=20, help="Test cases per section")
+    arg_parser.add_argument("--scan-only", action="store_true",
+                            help="Only find the sections, without loading their YAML")
+    arg_parser.add_argument("--mode", choices=["read", "mmap"], help=argparse.SUPPRESS)
+    arg_parser.add_argument("--path", help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.mode:
+        run_child(args.mode, args.path, args.scan_only)
+        return
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "spec.md")
+        write_document(path, args.size_mb, args.cases)
+
+        print(f"{'mode':<6} {'sections':>9} {'seconds':>9} {'peak RSS MB':>12} {'input RSS MB':>13}")
+        for mode in ("read", "mmap"):
+            command = [sys.executable, __file__, "--mode", mode, "--path", path]
+            if args.scan_only:
+                command.append("--scan-only")
+            result = json.loads(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+            print(f"{mode:<6} {result['sections']:>9} {result['seconds']:>9.2f} "
+                  f"{result['peak_rss_mb']:>12.1f} {result['input_rss_mb']:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
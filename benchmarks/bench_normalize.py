@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Micro-benchmark for resolving test case fields into output rows.
+
+Compares the per-cell case-insensitive key search used before the shared
+normalization stage with the cached field plan. Usage:
+
+    python benchmarks/bench_normalize.py --cases 1000000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from converter import TEST_CASE_FIELDS, normalize_cases
+
+
+def legacy_normalize(cases, fields=TEST_CASE_FIELDS):
+    """Per-cell field resolution as previously done by the writers."""
+    for case in cases:
+        row = []
+        for field in fields:
+            if field in case:
+                row.append(case[field])
+            else:
+                field_lower = field.lower()
+                for key in case:
+                    if key.lower() == field_lower:
+                        row.append(case[key])
+                        break
+                else:
+                    row.append("")
+        yield tuple(row)
+
+
+def make_cases(num_cases: int):
+    """Build synthetic cases from a few key layouts, as produced by YAML specs."""
+    layouts = [
+        ["ID", "Name", "Desc", "Test Steps", "Expected Result", "Priority"],
+        list(TEST_CASE_FIELDS),
+        ["id", "name", "desc", "test steps", "expected result", "priority", "status"],
+        ["ID", "Name", "Priority", "Severity", "Owner", "Component"],
+    ]
+    templates = []
+    for i in range(1000):
+        layout = layouts[i % len(layouts)]
+        templates.append({key: f"{key} value {i}" for key in layout})
+    return [templates[i % len(templates)] for i in range(num_cases)]
+
+
+def measure(label: str, func, cases):
+    """Consume all rows produced by func and report the per-row cost."""
+    start = time.perf_counter()
+    count = 0
+    for _ in func(cases):
+        count += 1
+    elapsed = time.perf_counter() - start
+    print(f"{label:<8} {elapsed:>8.2f} s {elapsed / count * 1e9:>10.0f} ns/row")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--cases", type=int, default=1000000, help="Number of synthetic cases")
+    args = arg_parser.parse_args()
+
+    cases = make_cases(args.cases)
+    assert list(legacy_normalize(cases[:1000])) == list(normalize_cases(cases[:1000]))
+
+    before = measure("before", legacy_normalize, cases)
+    after = measure("after", normalize_cases, cases)
+    print(f"speedup  {before / after:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
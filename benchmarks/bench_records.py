@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark comparing the memory of parsed test cases kept as dictionaries and as compact records.
+
+A generated specification is parsed once per mode, and the memory retained
+by the parsed test cases is measured with tracemalloc. Usage:
+
+    python benchmarks/bench_records.py --sections 100 --cases 2000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from collections import deque
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from bench import SpecConfig, generate_markdown
+from converter import normalize_cases
+from parser import TestCaseParser
+
+
+def measure(label: str, markdown: str, compact: bool):
+    """Parse the document, then report the retained memory and the time to normalize all rows."""
+    parser = TestCaseParser(compact=compact)
+    tracemalloc.start()
+    test_cases = parser.parse_content(markdown)
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    num_cases = sum(len(cases) for cases in test_cases.values())
+    start = time.perf_counter()
+    for cases in test_cases.values():
+        deque(normalize_cases(cases), maxlen=0)
+    elapsed = time.perf_counter() - start
+    print(
+        f"{label:<8} {retained / 2**20:>9.1f} MiB {retained / num_cases:>7.0f} B/case "
+        f"{elapsed / num_cases * 1e9:>7.0f} ns/row"
+    )
+    return retained, test_cases
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sections", type=int, default=100, help="Number of generated sections")
+    arg_parser.add_argument("--cases", type=int, default=2000, help="Number of test cases per section")
+    arg_parser.add_argument("--field-size", type=int, default=20, help="Approximate length of text fields")
+    args = arg_parser.parse_args()
+    
+    logger.remove()
+    markdown = generate_markdown(SpecConfig(
+        sections=args.sections, cases=args.cases, field_size=args.field_size, multiline=False
+    ))
+    
+    before, dicts = measure("dict", markdown, compact=False)
+    del dicts
+    after, records = measure("records", markdown, compact=True)
+    del records
+    print(f"saved    {(1 - after / before) * 100:>9.0f} %")
+
+
+if __name__ == "__main__":
+    main()
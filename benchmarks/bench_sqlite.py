@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Benchmark of the SQLite output: a full load, then re-runs on an unchanged and a slightly edited corpus.
+
+The output manifest is disabled, so every run goes through the per-row
+content hashes instead of skipping the database as a whole. Usage:
+
+    python benchmarks/bench_sqlite.py --sections 100 --cases 1000 --changed 0.01
+"""
+
+import os
+import sys
+import time
+import random
+import argparse
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from loguru import logger
+
+from bench import SpecConfig, generate_test_cases
+from converter import TestCaseConverter
+
+
+def measure(label: str, converter: TestCaseConverter, test_cases, num_cases: int):
+    """Update the database once and report the elapsed time."""
+    start = time.perf_counter()
+    converter.convert_to_sqlite(test_cases, force=True)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<10} {elapsed:>8.2f} s {num_cases / elapsed:>12.0f} cases/s")
+    return elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--sections", type=int, default=100, help="Number of generated sections")
+    arg_parser.add_argument("--cases", type=int, default=1000, help="Number of test cases per section")
+    arg_parser.add_argument("--changed", type=float, default=0.01, help="Fraction of test cases edited before the last run")
+    args = arg_parser.parse_args()
+    
+    logger.remove()
+    test_cases = generate_test_cases(SpecConfig(sections=args.sections, cases=args.cases, multiline=False))
+    num_cases = args.sections * args.cases
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, skip_unchanged=False)
+        measure("load", converter, test_cases, num_cases)
+        measure("unchanged", converter, test_cases, num_cases)
+        
+        rng = random.Random(0)
+        for cases in test_cases.values():
+            for case in rng.sample(cases, int(len(cases) * args.changed)):
+                case["Status"] = "Edited"
+        measure("edited", converter, test_cases, num_cases)
+        size = os.path.getsize(os.path.join(temp_dir, TestCaseConverter.SQLITE_FILE_NAME))
+        print(f"database   {size / 2**20:>8.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
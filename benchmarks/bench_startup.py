@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Start-up benchmark for the command-line interface.
+
+Reports the cumulative import time of the cli module measured with
+``python -X importtime``, the slowest imported packages, and the median wall
+time of a few typical invocations. Usage:
+
+    python benchmarks/bench_startup.py --json startup.json --max-import-ms 200
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def import_times():
+    """Return the cumulative import time in microseconds of each imported module."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import cli"],
+        cwd=ROOT_DIR, check=True, capture_output=True, text=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        times[name.strip()] = int(cumulative_us)
+    return times
+
+
+def wall_time(args, repeat):
+    """Return the median wall time in milliseconds of running main.py with args."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "main.py", *args],
+            cwd=ROOT_DIR, check=True, capture_output=True,
+        )
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument("--repeat", type=int, default=5, help="Runs per invocation")
+    arg_parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    arg_parser.add_argument("--max-import-ms", type=float,
+                            help="Exit with status 1 if importing cli takes longer than this")
+    args = arg_parser.parse_args()
+
+    times = import_times()
+    top_level = {name: us for name, us in times.items() if "." not in name and name != "cli"}
+    slowest = sorted(top_level.items(), key=lambda item: item[1], reverse=True)[:8]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        invocations = {
+            "version": ["version"],
+            "convert": ["convert", "-i", "sample_input_file.md", "-o", temp_dir, "-F", "--no-cache"],
+            "convert-csv": ["convert", "-i", "sample_input_file.md", "-o", temp_dir, "-F", "--no-cache",
+                            "--format", "csv"],
+        }
+        walls = {name: wall_time(cli_args, args.repeat) for name, cli_args in invocations.items()}
+
+    results = {
+        "import_cli_ms": times.get("cli", 0) / 1000,
+        "slowest_imports_ms": {name: us / 1000 for name, us in slowest},
+        "wall_ms": walls,
+    }
+
+    print(f"import cli: {results['import_cli_ms']:.1f} ms")
+    for name, ms in results["slowest_imports_ms"].items():
+        print(f"  {name:<24} {ms:>8.1f} ms")
+    for name, ms in walls.items():
+        print(f"{name:<12} {ms:>8.1f} ms (median of {args.repeat})")
+
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if args.max_import_ms is not None and results["import_cli_ms"] > args.max_import_ms:
+        print(f"Importing cli took longer than {args.max_import_ms} ms", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
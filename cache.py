@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Cache module for reusing parsed sections between runs.
+"""
+
+import os
+import pickle
+import hashlib
+from typing import Dict, List, Any, Optional
+from loguru import logger
+
+from version import __version__
+
+
+class SectionCache:
+    """On-disk cache of parsed test case sections, keyed by a hash of the section content."""
+
+    # Default name of the cache directory inside the output directory
+    DIRECTORY_NAME = ".mdtc-cache"
+    
+    # Default upper bound for the total size of cached sections
+    DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+    
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir: Directory where cache entries are stored.
+            max_bytes: Maximum total size of the cached sections. The least
+                recently used entries are removed when it is exceeded.
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.sections_dir = os.path.join(cache_dir, "sections")
+        os.makedirs(self.sections_dir, exist_ok=True)
+        self._total_bytes = None
+        
+    @staticmethod
+    def section_key(content: str) -> str:
+        """
+        Compute the cache key of a section.
+
+        The tool version is part of the key so that entries written by another
+        version are never reused.
+
+        Args:
+            content: YAML content of the section.
+
+        Returns:
+            Hexadecimal SHA-256 digest.
+        """
+        digest = hashlib.sha256(__version__.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(content.encode('utf-8'))
+        return digest.hexdigest()
+        
+    def _entry_path(self, key: str) -> str:
+        """Return the path of the cache entry for a key."""
+        return os.path.join(self.sections_dir, f"{key}.pickle")
+        
+    def get(self, content: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Look up the parsed test cases of a section.
+
+        Args:
+            content: YAML content of the section.
+
+        Returns:
+            The cached list of test case dictionaries, or None on a cache miss.
+        """
+        path = self._entry_path(self.section_key(content))
+        try:
+            with open(path, 'rb') as f:
+                test_cases = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.debug(f"Ignoring unreadable cache entry {path}: {str(e)}")
+            return None
+            
+        # Mark the entry as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return test_cases
+        
+    def put(self, content: str, test_cases: List[Dict[str, Any]]):
+        """
+        Store the parsed test cases of a section.
+
+        Args:
+            content: YAML content of the section.
+            test_cases: Parsed list of test case dictionaries.
+        """
+        path = self._entry_path(self.section_key(content))
+        data = pickle.dumps(test_cases, protocol=pickle.HIGHEST_PROTOCOL)
+        # An entry written again replaces the earlier one, whose size is no longer counted
+        try:
+            old_size = os.path.getsize(path)
+        except OSError:
+            old_size = 0
+        try:
+            self._write_atomic(path, data)
+        except OSError as e:
+            logger.debug(f"Could not write cache entry {path}: {str(e)}")
+            return
+            
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_size()
+        else:
+            self._total_bytes += len(data) - old_size
+        if self._total_bytes > self.max_bytes:
+            self.evict()
+            
+    def _write_atomic(self, path: str, data: bytes):
+        """Write data to a temporary file and move it into place."""
+        import tempfile
+        
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+            
+    def _scan_size(self) -> int:
+        """Return the total size of all cache entries."""
+        total = 0
+        with os.scandir(self.sections_dir) as entries:
+            for entry in entries:
+                if entry.name.endswith(".pickle"):
+                    total += entry.stat().st_size
+        return total
+        
+    def evict(self):
+        """Remove the least recently used entries until the cache fits its size cap."""
+        entries = []
+        with os.scandir(self.sections_dir) as scan:
+            for entry in scan:
+                if entry.name.endswith(".pickle"):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, entry.path))
+                    
+        total = sum(size for _, size, _ in entries)
+        entries.sort()
+        removed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+            
+        self._total_bytes = total
+        if removed:
+            logger.debug(f"Evicted {removed} entries from cache {self.cache_dir}")
@@ -7,13 +7,20 @@ Command-line interface for the markdown_to_testcase tool.
 
 import os
 import sys
+import time
 import typer
-from typing import Optional
-from pathlib import Path
+from typing import Dict, FrozenSet, Optional, List
 from loguru import logger
 
-from parser import TestCaseParser
-from converter import TestCaseConverter
+from parser import TestCaseParser, YAML_BACKENDS, select_yaml_loader
+from converter import DEFAULT_FORMATS, EXCEL_SHARD_MODES, OUTPUT_WRITERS, TestCaseConverter
+from batch import CONFLICT_POLICIES, collect_inputs, parse_inputs, merge_results
+from cache import SectionCache
+from defaults import DEFAULT_CSV_WORKERS, DEFAULT_QUEUE_SIZE, DEFAULT_SERVER_WORKERS, DEFAULT_WATCH_INTERVAL
+from ids import IdError, IdIndex
+from metrics import PROFILERS, Metrics, profiled
+from overwrite import OVERWRITE_POLICIES, plan_overwrites
+from version import __version__
 
 app = typer.Typer(help="Tool to convert markdown test cases to CSV and Excel formats")
 
@@ -27,65 +34,502 @@ def configure_logger(debug: bool):
 
 @app.command()
 def convert(
-    input_file: str = typer.Option(
-        ..., "--input", "-i", help="Input markdown or YAML file path"
+    input_files: List[str] = typer.Option(
+        ..., "--input", "-i",
+        help="Input markdown or YAML file, directory or glob pattern (can be repeated)"
     ),
     force: bool = typer.Option(
-        False, "--force", "-F", help="Overwrite output files without asking"
+        False, "--force", "-F", help="Overwrite output files without asking (same as --overwrite always)"
+    ),
+    overwrite: str = typer.Option(
+        "ask", "--overwrite",
+        help=f"How to handle existing output files: {', '.join(OVERWRITE_POLICIES)}"
     ),
     output_dir: str = typer.Option(
         "output", "--output-dir", "-o", help="Directory to store output files"
     ),
+    formats: List[str] = typer.Option(
+        list(DEFAULT_FORMATS), "--format", "-f",
+        help=f"Output format to write (can be repeated): {', '.join(OUTPUT_WRITERS)}"
+    ),
     debug: bool = typer.Option(
         False, "--debug", "-d", help="Enable debug mode"
     ),
     verbose: bool = typer.Option(
         False, "--verbose", help="Show verbose error messages and suggestions"
     ),
+    stream_threshold: int = typer.Option(
+        TestCaseConverter.DEFAULT_STREAMING_THRESHOLD, "--stream-threshold",
+        help="Write the Excel file in streaming mode above this many test cases"
+    ),
+    yaml_backend: str = typer.Option(
+        "auto", "--yaml-backend", help=f"YAML loader to use: {', '.join(YAML_BACKENDS)}"
+    ),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j", help="Number of worker processes used to parse input files"
+    ),
+    section_workers: int = typer.Option(
+        1, "--section-workers",
+        help="Number of worker processes used to parse the sections of a large input file"
+    ),
+    on_conflict: str = typer.Option(
+        "error", "--on-conflict",
+        help=f"How to handle a section defined in several input files: {', '.join(CONFLICT_POLICIES)}"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write the parsed section cache"
+    ),
+    cache_size: int = typer.Option(
+        SectionCache.DEFAULT_MAX_BYTES // (1024 * 1024), "--cache-size",
+        help="Maximum size of the parsed section cache in MiB"
+    ),
+    timings: bool = typer.Option(
+        False, "--timings", help="Print the time spent in each stage after the conversion"
+    ),
+    metrics_out: Optional[str] = typer.Option(
+        None, "--metrics-out", help="Write per-stage and per-section timings to this JSON file"
+    ),
+    profile: Optional[str] = typer.Option(
+        None, "--profile",
+        help=f"Profile the run and save the statistics in the output directory: {', '.join(PROFILERS)}"
+    ),
+    pipeline: bool = typer.Option(
+        False, "--pipeline", help="Parse the input files in a background thread while the outputs are written"
+    ),
+    queue_size: int = typer.Option(
+        DEFAULT_QUEUE_SIZE, "--queue-size", help="Maximum number of parsed sections waiting to be written in pipeline mode"
+    ),
+    use_server: bool = typer.Option(
+        False, "--server", help="Forward the conversion to a running 'serve' process, if there is one (with --force or --overwrite always)"
+    ),
+    server_socket: Optional[str] = typer.Option(
+        None, "--server-socket", help="Socket of the server used with --server (default: $MDTC_SERVER_SOCKET or a per-user path)"
+    ),
+    strict_ids: bool = typer.Option(
+        False, "--strict-ids", help="Fail on the first test case with a missing or duplicate ID"
+    ),
+    id_index_path: Optional[str] = typer.Option(
+        None, "--id-index", help="ID index file checked and updated by the run, so later runs can check new files against it"
+    ),
+    excel_shard: str = typer.Option(
+        "none", "--excel-shard",
+        help=f"Split the Excel output into several workbooks listed in an index file: {', '.join(EXCEL_SHARD_MODES)}"
+    ),
+    excel_shard_size: int = typer.Option(
+        0, "--excel-shard-size", help="Number of sections (--excel-shard sections) or rows (--excel-shard rows) per workbook"
+    ),
+    excel_workers: int = typer.Option(
+        1, "--excel-workers", help="Number of worker processes building sharded Excel workbooks"
+    ),
+    csv_workers: int = typer.Option(
+        DEFAULT_CSV_WORKERS, "--csv-workers",
+        help="Number of threads writing CSV files, unless existing files may be asked about"
+    ),
 ):
-    """Convert test cases from markdown/YAML to CSV and Excel formats."""
+    """Convert test cases from markdown/YAML to CSV, Excel and other formats."""
     configure_logger(debug)
+    start_time = time.perf_counter()
     
-    logger.info(f"Processing file: {input_file}")
+    # Expand directories and glob patterns
+    try:
+        files = collect_inputs(input_files)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
     
-    # Check if input file exists
-    if not os.path.exists(input_file):
-        logger.error(f"Input file not found: {input_file}")
+    if on_conflict not in CONFLICT_POLICIES:
+        logger.error(f"Unknown conflict policy: {on_conflict}. Use one of: {', '.join(CONFLICT_POLICIES)}")
+        raise typer.Exit(code=1)
+    if pipeline and on_conflict == "merge":
+        logger.error("The merge conflict policy cannot be used in pipeline mode")
         raise typer.Exit(code=1)
     
+    unknown_formats = [name for name in formats if name not in OUTPUT_WRITERS]
+    if unknown_formats:
+        logger.error(f"Unknown output format: {', '.join(unknown_formats)}. Use one of: {', '.join(OUTPUT_WRITERS)}")
+        raise typer.Exit(code=1)
+    if "parquet" in formats:
+        # Checked before any work starts, since the Parquet writer could only report the missing package at the end
+        from importlib import import_module
+        
+        try:
+            import_module("pyarrow.parquet")
+        except ImportError:
+            logger.error("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+            raise typer.Exit(code=1)
+    
+    if profile is not None and profile not in PROFILERS:
+        logger.error(f"Unknown profiler: {profile}. Use one of: {', '.join(PROFILERS)}")
+        raise typer.Exit(code=1)
+    
+    if force:
+        overwrite = "always"
+    if overwrite not in OVERWRITE_POLICIES:
+        logger.error(f"Unknown overwrite policy: {overwrite}. Use one of: {', '.join(OVERWRITE_POLICIES)}")
+        raise typer.Exit(code=1)
+    if overwrite == "ask" and not sys.stdin.isatty():
+        logger.warning("Input is not a terminal, so existing output files are kept; use --overwrite to change this")
+        overwrite = "never"
+    force = overwrite == "always"
+    
     # Initialize parser and converter
-    parser = TestCaseParser(verbose=verbose)
-    converter = TestCaseConverter(output_dir=output_dir)
+    try:
+        select_yaml_loader(yaml_backend)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    cache = None
+    if not no_cache:
+        cache = SectionCache(
+            os.path.join(output_dir, SectionCache.DIRECTORY_NAME), max_bytes=cache_size * 1024 * 1024
+        )
+    metrics = Metrics(enabled=timings or metrics_out is not None)
+    try:
+        converter = TestCaseConverter(
+            output_dir=output_dir, streaming_threshold=stream_threshold, metrics=metrics, overwrite=overwrite,
+            excel_shard=excel_shard, excel_shard_size=excel_shard_size, excel_workers=excel_workers,
+            csv_workers=csv_workers,
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    
+    with profiled(profile, output_dir) as profile_path:
+        response = None
+        # A server never prompts and only runs plain batch conversions, so other conversions stay here
+        local_options = [option for option, used in (
+            ("--overwrite other than always", not force), ("--profile", profile is not None),
+            ("--strict-ids", strict_ids), ("--id-index", id_index_path is not None), ("--pipeline", pipeline),
+            ("--jobs", jobs > 1), ("--section-workers", section_workers > 1), ("--verbose", verbose),
+        ) if used]
+        if use_server and local_options:
+            logger.warning(f"Converting in this process, since the server does not support {', '.join(local_options)}")
+        elif use_server:
+            from server import default_socket_path, forward_job, unix_sockets_supported
+            
+            if not unix_sockets_supported():
+                logger.warning("Converting in this process, since Unix sockets are not supported on this platform")
+            else:
+                socket_path = server_socket or default_socket_path()
+                response = forward_job(socket_path, {
+                    "inputs": [os.path.abspath(path) for path in files],
+                    "output_dir": os.path.abspath(output_dir),
+                    "formats": formats,
+                    "on_conflict": on_conflict,
+                    "yaml_backend": yaml_backend,
+                    "stream_threshold": stream_threshold,
+                    "cache": not no_cache,
+                    "cache_size": cache_size * 1024 * 1024,
+                    "excel_shard": excel_shard,
+                    "excel_shard_size": excel_shard_size,
+                    "excel_workers": excel_workers,
+                    "csv_workers": csv_workers,
+                })
+                if response is None:
+                    logger.info(f"No server answered on {socket_path}; converting in this process")
+        plan = None
+        if response is None:
+            # Settle every existing output, asking all questions, before any input is parsed
+            with metrics.stage("scan", "overwrite check"):
+                plan = plan_overwrites(
+                    files, converter.output_path, formats, policy=overwrite, manifest=converter.manifest,
+                    on_conflict=on_conflict, in_place=[name for name in formats if OUTPUT_WRITERS[name].in_place],
+                )
+            converter.apply_overwrite_plan(plan)
+            # Strict ID checks need every section, including those only kept outputs are converted from
+            skip_sections = {} if strict_ids else plan.skip_sections
+            
+            # Sections parsed again replace their earlier entries in a persisted index
+            if id_index_path is not None:
+                try:
+                    id_index = IdIndex.load(id_index_path, strict=strict_ids, forget={
+                        file_path: skip_sections.get(file_path, ()) for file_path in files
+                    })
+                except IdError as e:
+                    logger.error(f"{id_index_path}: {str(e)}")
+                    raise typer.Exit(code=1)
+            else:
+                id_index = IdIndex(strict=strict_ids)
+            
+        if response is not None:
+            if response.get("status") != "ok":
+                logger.error(response.get("error", "Conversion failed on the server"))
+                raise typer.Exit(code=1)
+            logger.info(f"Converted by the server on {socket_path}")
+            metrics.extend(response["metrics"]["records"])
+            outputs, num_sections, num_cases = response["outputs"], response["sections"], response["cases"]
+            written, skipped, failed = response["written"], response["skipped"], response.get("failed", [])
+        elif not strict_ids and plan.decisions and not any(plan.decisions.values()):
+            logger.info("All existing output files are kept, nothing to convert")
+            outputs, num_sections, num_cases = {}, 0, 0
+        elif pipeline:
+            from pipeline import run_pipeline
+            
+            if jobs > 1 or section_workers > 1:
+                logger.warning("--jobs and --section-workers are ignored in pipeline mode")
+            parser = TestCaseParser(
+                verbose=verbose, yaml_backend=yaml_backend, cache=cache, metrics=metrics, compact=True,
+                skip_sections=skip_sections, id_index=id_index,
+            )
+            try:
+                result = run_pipeline(
+                    files, parser, converter, formats=formats, force=force, on_conflict=on_conflict,
+                    queue_size=queue_size, csv_workers=csv_workers,
+                )
+            except ValueError as e:
+                logger.error(str(e))
+                raise typer.Exit(code=1)
+            if not result.cases:
+                logger.error("No valid test cases found")
+                raise typer.Exit(code=1)
+            outputs = result.outputs
+            num_sections, num_cases = result.sections, result.cases
+        else:
+            outputs, num_sections, num_cases = _convert_batch(
+                files, converter, formats=formats, force=force, jobs=jobs, verbose=verbose,
+                yaml_backend=yaml_backend, section_workers=section_workers, on_conflict=on_conflict,
+                cache=cache, cache_size=cache_size, metrics=metrics, skip_sections=skip_sections,
+                id_index=id_index,
+            )
+        if response is None:
+            written, skipped, failed = converter.written, converter.skipped, converter.failed
+            id_index.report()
+            if id_index_path is not None:
+                id_index.save(id_index_path)
+        if "csv" in outputs and not outputs["csv"]:
+            logger.warning("No CSV files created")
+        if failed:
+            logger.error(f"Could not write {len(failed)} outputs: {', '.join(failed)}")
     
-    # Parse test cases
-    file_extension = Path(input_file).suffix.lower()
-    if file_extension in ['.md', '.markdown']:
-        test_cases = parser.parse_file(input_file)
-    elif file_extension in ['.yaml', '.yml']:
-        test_cases = parser.parse_yaml_file(input_file)
-    else:
-        logger.error(f"Unsupported file extension: {file_extension}. Use .md, .markdown, .yaml, or .yml")
+    if profile_path is not None:
+        logger.info(f"Saved {profile} profile to {profile_path}")
+    if timings:
+        print(metrics.format_table())
+    if metrics_out:
+        import json
+        
+        with open(metrics_out, 'w', encoding='utf-8') as f:
+            json.dump(metrics.to_dict(), f, indent=2)
+        logger.info(f"Wrote metrics to {metrics_out}")
+    
+    elapsed = time.perf_counter() - start_time
+    logger.info(
+        f"Conversion completed: {len(files)} files, {num_sections} sections, {num_cases} test cases, "
+        f"{len(written)} outputs written, {len(skipped)} unchanged or skipped, {len(failed)} failed in {elapsed:.2f}s ({num_cases / elapsed if elapsed else 0:.0f} test cases/s)"
+    )
+
+
+def _convert_batch(files: List[str], converter: TestCaseConverter, formats: List[str], force: bool, jobs: int,
+                   verbose: bool, yaml_backend: str, section_workers: int, on_conflict: str,
+                   cache: Optional[SectionCache], cache_size: int, metrics: Metrics,
+                   skip_sections: Dict[str, FrozenSet[str]], id_index: IdIndex):
+    """Parse all input files, merge their sections and write the outputs; return them with the counts."""
+    try:
+        results = parse_inputs(
+            files, jobs=jobs, verbose=verbose, yaml_backend=yaml_backend, section_workers=section_workers,
+            cache_dir=cache.cache_dir if cache is not None else None, cache_size=cache_size * 1024 * 1024,
+            metrics=metrics, compact=True, skip_sections=skip_sections, id_index=id_index,
+        )
+        test_cases = merge_results(results, on_conflict=on_conflict)
+    except ValueError as e:
+        logger.error(str(e))
         raise typer.Exit(code=1)
     
     if not test_cases:
         logger.error("No valid test cases found")
         raise typer.Exit(code=1)
     
-    # Convert to CSV files
-    csv_files = converter.convert_to_csv(test_cases, force=force)
-    if not csv_files:
-        logger.warning("No CSV files created")
+    outputs = converter.convert(test_cases, formats=formats, force=force)
+    num_cases = sum(len(cases or []) for cases in test_cases.values())
+    return outputs, len(test_cases), num_cases
+
+
+@app.command()
+def watch(
+    input_files: List[str] = typer.Option(
+        ..., "--input", "-i",
+        help="Input markdown or YAML file, directory or glob pattern (can be repeated)"
+    ),
+    output_dir: str = typer.Option(
+        "output", "--output-dir", "-o", help="Directory to store output files"
+    ),
+    debug: bool = typer.Option(
+        False, "--debug", "-d", help="Enable debug mode"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", help="Show verbose error messages and suggestions"
+    ),
+    yaml_backend: str = typer.Option(
+        "auto", "--yaml-backend", help=f"YAML loader to use: {', '.join(YAML_BACKENDS)}"
+    ),
+    on_conflict: str = typer.Option(
+        "error", "--on-conflict",
+        help=f"How to handle a section defined in several input files: {', '.join(CONFLICT_POLICIES)}"
+    ),
+    interval: float = typer.Option(
+        DEFAULT_WATCH_INTERVAL, "--interval", help="Seconds between two checks of the input files"
+    ),
+    no_cache: bool = typer.Option(
+        False, "--no-cache", help="Do not read or write the parsed section cache"
+    ),
+):
+    """Watch input files and regenerate the outputs of changed sections. Outputs are always overwritten."""
+    configure_logger(debug)
+    
+    try:
+        collect_inputs(input_files)
+        parser = TestCaseParser(verbose=verbose, yaml_backend=yaml_backend)
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    
+    if on_conflict not in CONFLICT_POLICIES:
+        logger.error(f"Unknown conflict policy: {on_conflict}. Use one of: {', '.join(CONFLICT_POLICIES)}")
+        raise typer.Exit(code=1)
+    
+    cache = None
+    if not no_cache:
+        cache = SectionCache(os.path.join(output_dir, SectionCache.DIRECTORY_NAME))
+    parser.cache = cache
+    converter = TestCaseConverter(output_dir=output_dir)
+    
+    from watch import Watcher
+    
+    watcher = Watcher(input_files, parser, converter, on_conflict=on_conflict, interval=interval)
+    logger.info("Watching for changes. Press Ctrl+C to stop.")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        logger.info("Stopped watching")
+
+
+@app.command()
+def serve(
+    socket_path: Optional[str] = typer.Option(
+        None, "--socket", help="Unix socket to listen on (default: $MDTC_SERVER_SOCKET or a per-user path)"
+    ),
+    stdio: bool = typer.Option(
+        False, "--stdio", help="Read jobs from stdin and write responses to stdout instead of listening on a socket"
+    ),
+    workers: int = typer.Option(
+        DEFAULT_SERVER_WORKERS, "--workers", "-w", help="Number of jobs converted at the same time"
+    ),
+    debug: bool = typer.Option(
+        False, "--debug", "-d", help="Enable debug mode"
+    ),
+    verbose: bool = typer.Option(
+        False, "--verbose", help="Show verbose error messages and suggestions"
+    ),
+):
+    """Convert jobs sent as JSON lines, keeping the interpreter and libraries loaded. Outputs are always overwritten."""
+    configure_logger(debug)
+    from server import ConversionServer, default_socket_path, warm_up
+    
+    warm_up()
+    server = ConversionServer(workers=workers, verbose=verbose)
+    
+    if stdio:
+        def write(line: str):
+            sys.stdout.write(line)
+            sys.stdout.flush()
+        
+        try:
+            server.serve_stream(sys.stdin, write)
+        finally:
+            server.shutdown()
+        return
+    
+    try:
+        server.serve_socket(socket_path or default_socket_path())
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
+    except KeyboardInterrupt:
+        logger.info("Stopped serving")
+    finally:
+        server.shutdown()
+
+
+@app.command()
+def bench(
+    scenarios: Optional[List[str]] = typer.Option(
+        None, "--scenario", "-s", help="Scenario to run (can be repeated): parse, parse-yaml, normalize, csv, xlsx"
+    ),
+    sections: int = typer.Option(10, "--sections", help="Number of generated test case sections"),
+    cases: int = typer.Option(100, "--cases", help="Number of generated test cases per section"),
+    field_size: int = typer.Option(40, "--field-size", help="Approximate length of generated text fields"),
+    ascii_only: bool = typer.Option(False, "--ascii-only", help="Generate ASCII text only"),
+    no_multiline: bool = typer.Option(False, "--no-multiline", help="Do not generate multiline block scalars"),
+    seed: int = typer.Option(0, "--seed", help="Seed of the synthetic spec generator"),
+    repeat: int = typer.Option(5, "--repeat", "-r", help="Number of timed iterations per scenario"),
+    warmup: int = typer.Option(1, "--warmup", help="Number of untimed iterations per scenario"),
+    output: Optional[str] = typer.Option(None, "--output", "-o", help="Write the results to this JSON file"),
+    baseline: Optional[str] = typer.Option(
+        None, "--baseline", help="Fail when results regress against this JSON file of earlier results"
+    ),
+    tolerance: float = typer.Option(0.2, "--tolerance", help="Allowed relative regression against the baseline"),
+    spec_out: Optional[str] = typer.Option(
+        None, "--spec-out", help="Also write the generated markdown specification to this file"
+    ),
+    debug: bool = typer.Option(
+        False, "--debug", "-d", help="Enable debug mode"
+    ),
+):
+    """Benchmark parsing and conversion on a generated test specification."""
+    import json
+    import bench as benchmarks
+    
+    configure_logger(debug)
+    config = benchmarks.SpecConfig(
+        sections=sections, cases=cases, field_size=field_size, multiline=not no_multiline,
+        non_ascii=not ascii_only, seed=seed,
+    )
+    
+    baseline_results = None
+    if baseline:
+        try:
+            with open(baseline, 'r', encoding='utf-8') as f:
+                baseline_results = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.error(f"Could not read baseline {baseline}: {str(e)}")
+            raise typer.Exit(code=1)
+        if baseline_results.get("config") != config._asdict():
+            logger.warning(f"Baseline {baseline} was measured with a different spec configuration")
+    
+    if spec_out:
+        with open(spec_out, 'w', encoding='utf-8') as f:
+            f.write(benchmarks.generate_markdown(config))
+        logger.info(f"Wrote generated specification to {spec_out}")
+    
+    try:
+        results = benchmarks.run_benchmarks(
+            scenarios or benchmarks.SCENARIOS, config=config, repeat=repeat, warmup=warmup
+        )
+    except ValueError as e:
+        logger.error(str(e))
+        raise typer.Exit(code=1)
     
-    # Convert to Excel file
-    excel_file = converter.convert_to_excel(test_cases, force=force)
+    print(benchmarks.format_results(results, baseline_results))
+    if output:
+        with open(output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        logger.info(f"Wrote benchmark results to {output}")
     
-    logger.info("Conversion completed")
+    if baseline_results is not None:
+        regressions = benchmarks.compare_results(results, baseline_results, tolerance=tolerance)
+        for regression in regressions:
+            logger.error(f"Regression: {regression}")
+        if regressions:
+            raise typer.Exit(code=1)
+        logger.info(f"No regressions against {baseline}")
 
 
 @app.command()
 def version():
     """Display the version information."""
-    print("markdown_to_testcase v0.1.0")
+    print(f"markdown_to_testcase v{__version__}")
+    _, backend = select_yaml_loader()
+    print(f"YAML backend: {backend}")
 
 
 if __name__ == "__main__":
@@ -7,121 +7,920 @@ Converter module for transforming test cases to CSV and Excel formats.
 
 import os
 import csv
-from typing import Dict, List, Any, Optional
+import json
+import hashlib
+import unicodedata
+from collections import deque
+from functools import lru_cache
+from itertools import groupby
+from operator import itemgetter
+from typing import Dict, List, Any, Optional, Generator, Iterable, Iterator, NamedTuple, Sequence, Tuple
 from pathlib import Path
-import openpyxl
-from openpyxl.styles import Font, Alignment, PatternFill
 from loguru import logger
 
+from manifest import OutputManifest, remove_temporary, temporary_path
+from metrics import DISABLED, Metrics
+from overwrite import OVERWRITE_POLICIES, OverwritePlan, overwrite_question
+from records import TEST_CASE_FIELDS, TestCaseRecord, field_plan
+
+
+def normalize_case(case: Dict[str, Any], fields: Sequence[str] = TEST_CASE_FIELDS) -> Tuple[Any, ...]:
+    """
+    Turn a test case dictionary into a row tuple in field order.
+
+    Args:
+        case: Test case dictionary with arbitrary key casing.
+        fields: Output fields in column order.
+
+    Returns:
+        Tuple of values in field order, with "" for missing fields.
+    """
+    fields = tuple(fields)
+    if type(case) is TestCaseRecord and fields == TEST_CASE_FIELDS:
+        return case.row
+    plan = field_plan(fields, tuple(case))
+    return tuple(map(case.get, plan, ("",) * len(plan)))
+
+
+def normalize_cases(cases: Iterable[Dict[str, Any]], fields: Sequence[str] = TEST_CASE_FIELDS) -> Iterator[Tuple[Any, ...]]:
+    """
+    Normalize test cases into row tuples, see :func:`normalize_case`.
+
+    Args:
+        cases: Test case dictionaries.
+        fields: Output fields in column order.
+
+    Yields:
+        One row tuple per test case.
+    """
+    fields = tuple(fields)
+    defaults = ("",) * len(fields)
+    canonical = fields == TEST_CASE_FIELDS
+    for case in cases:
+        if canonical and type(case) is TestCaseRecord:
+            # Compact records already hold their row in column order
+            yield case.row
+            continue
+        plan = field_plan(fields, tuple(case))
+        yield tuple(map(case.get, plan, defaults))
+
+
+class OutputWriter(NamedTuple):
+    """Methods and output file of a registered output format."""
+
+    # Name of the TestCaseConverter method writing all sections at once
+    method: str
+    # Name of the section writer method used by convert_sections, taking the output path
+    stream: Optional[str]
+    # Name of the TestCaseConverter attribute holding the output file name, or None for one file per section
+    file_name: Optional[str]
+    # Whether an existing output is updated in place rather than replaced
+    in_place: bool = False
+
+
+# Output format name -> methods and output file of the format
+OUTPUT_WRITERS: Dict[str, OutputWriter] = {}
+
+# Formats written when none are requested explicitly
+DEFAULT_FORMATS = ("csv", "xlsx")
+
+
+def output_writer(format_name: str, stream: Optional[str] = None, file_name: Optional[str] = None,
+                  in_place: bool = False):
+    """
+    Register a TestCaseConverter method as the writer of an output format.
+
+    Writer methods take the test case dictionary and a ``force`` flag, and read
+    their rows from :func:`normalize_cases` so that field resolution is shared.
+    :meth:`TestCaseConverter.convert_sections` and
+    :meth:`TestCaseConverter.output_path` find the other parts of a format
+    here, so registering a writer is all it takes to add a format.
+
+    Args:
+        format_name: Name of the format, as accepted by ``--format``.
+        stream: Name of the section writer method of the format, see
+            :func:`_run_writer`. It is called with the output path, or for
+            outputs of one file per section with the force flag and the
+            number of writer threads.
+        file_name: Name of the converter attribute holding the output file
+            name, or None for outputs written to one file per section.
+        in_place: Whether an existing output is updated in place rather than
+            replaced, so that the user is asked whether to update it.
+    """
+    def decorator(method):
+        OUTPUT_WRITERS[format_name] = OutputWriter(method.__name__, stream, file_name, in_place)
+        return method
+    return decorator
+
+
+def rows_digest(fields: Sequence[str], rows: Iterable[Tuple[Any, ...]]) -> str:
+    """
+    Compute a digest of normalized rows.
+
+    Args:
+        fields: Output fields in column order.
+        rows: Row tuples as produced by :func:`normalize_cases`.
+
+    Returns:
+        Hexadecimal SHA-256 digest.
+    """
+    digest = hashlib.sha256(repr(tuple(fields)).encode('utf-8'))
+    for row in rows:
+        digest.update(b'\n')
+        digest.update(repr(row).encode('utf-8'))
+    return digest.hexdigest()
+
+
+class OutputDigest:
+    """Digest of the sections of a single-file output, computed section by section."""
+
+    def __init__(self, format_name: str, fields: Sequence[str] = TEST_CASE_FIELDS):
+        """
+        Initialize the digest.
+
+        Args:
+            format_name: Name of the output format.
+            fields: Output fields in column order.
+        """
+        self.fields = tuple(fields)
+        self._digest = hashlib.sha256(format_name.encode('utf-8'))
+
+    def add(self, file_name: str, rows: Iterable[Tuple[Any, ...]]):
+        """Add the normalized rows of a section, see :func:`rows_digest`."""
+        self._digest.update(b'\0')
+        self._digest.update(file_name.encode('utf-8'))
+        self._digest.update(b'\0')
+        self._digest.update(rows_digest(self.fields, rows).encode('utf-8'))
+
+    def hexdigest(self) -> str:
+        """Return the hexadecimal SHA-256 digest of the sections added so far."""
+        return self._digest.hexdigest()
+
+
+def output_digest(format_name: str, test_cases: Dict[str, List[Dict[str, Any]]],
+                  fields: Sequence[str] = TEST_CASE_FIELDS) -> str:
+    """
+    Compute the digest of a single-file output without writing it.
+
+    Args:
+        format_name: Name of the output format.
+        test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
+        fields: Output fields in column order.
+
+    Returns:
+        Hexadecimal SHA-256 digest; sections without test cases are left out.
+    """
+    digest = OutputDigest(format_name, fields)
+    for file_name, cases in test_cases.items():
+        if cases:
+            digest.add(file_name, normalize_cases(cases, fields))
+    return digest.hexdigest()
+
+
+
+class SqliteStatements(NamedTuple):
+    """SQL statements of the SQLite output."""
+
+    schema: Tuple[str, ...]
+    select: str
+    upsert: str
+    delete: str
+
+
+@lru_cache(maxsize=None)
+def sqlite_statements(fields: Tuple[str, ...], indexed: Tuple[str, ...]) -> SqliteStatements:
+    """
+    Build the SQL statements of the test case table of the SQLite output.
+
+    The table has a "section" column, one text column per field, an "extra"
+    column holding the other keys of a case as a JSON object, and a
+    "row_hash" column. Its primary key is the section and the "ID" field.
+
+    Args:
+        fields: Output fields in column order; must include "ID".
+        indexed: Fields to create an index on.
+
+    Returns:
+        Statements creating the table and its indexes, selecting the row hashes
+        of a section, upserting a row and deleting a row.
+    """
+    def quote(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    columns = ["section", *fields, "extra", "row_hash"]
+    definitions = ", ".join(
+        ["section TEXT NOT NULL", *(f"{quote(field)} TEXT" for field in fields),
+         "extra TEXT", "row_hash TEXT NOT NULL", 'PRIMARY KEY (section, "ID")']
+    )
+    schema = (f"CREATE TABLE IF NOT EXISTS test_cases ({definitions})",) + tuple(
+        f"CREATE INDEX IF NOT EXISTS {quote('test_cases_' + field.lower())} ON test_cases ({quote(field)})"
+        for field in indexed
+    )
+    updates = ", ".join(
+        f"{quote(column)} = excluded.{quote(column)}" for column in columns if column not in ("section", "ID")
+    )
+    return SqliteStatements(
+        schema=schema,
+        select='SELECT "ID", row_hash FROM test_cases WHERE section = ?',
+        upsert=(
+            f"INSERT INTO test_cases ({', '.join(map(quote, columns))}) VALUES ({', '.join('?' * len(columns))}) "
+            f'ON CONFLICT (section, "ID") DO UPDATE SET {updates}'
+        ),
+        delete='DELETE FROM test_cases WHERE section = ? AND "ID" = ?',
+    )
+
+
+def extra_fields(case: Dict[str, Any], fields: Sequence[str] = TEST_CASE_FIELDS) -> Dict[Any, Any]:
+    """
+    Return the keys of a test case that no output field reads, with their values.
+
+    Args:
+        case: Test case dictionary or record.
+        fields: Output fields in column order.
+
+    Returns:
+        Dictionary of the other keys, in case order; empty if there are none.
+    """
+    fields = tuple(fields)
+    if type(case) is TestCaseRecord and fields == TEST_CASE_FIELDS:
+        return case.extra or {}
+    return {key: case[key] for key in _extra_keys(fields, tuple(case))}
+
+
+@lru_cache(maxsize=4096)
+def _extra_keys(fields: Tuple[str, ...], keys: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Return the keys that no field reads, for each distinct tuple of keys."""
+    used = set(field_plan(fields, keys))
+    return tuple(key for key in keys if key not in used)
+
+
+def display_width(value: str) -> int:
+    """
+    Return the width of the longest line of a value, in monospace character cells.
+
+    East Asian wide and fullwidth characters, such as kanji and kana, take two
+    cells; every other character takes one.
+
+    Args:
+        value: Cell value as a string.
+
+    Returns:
+        Width of the widest line.
+    """
+    if value.isascii():
+        if '\n' not in value:
+            return len(value)
+        return max(map(len, value.split('\n')))
+    return max(
+        len(line) + sum(1 for char in line if unicodedata.east_asian_width(char) in 'WF')
+        for line in value.split('\n')
+    )
+
+
+class ExcelStyles(NamedTuple):
+    """openpyxl style objects shared by every worksheet cell they are applied to."""
+
+    header_font: Any
+    header_fill: Any
+    header_alignment: Any
+    data_alignment: Any
+
+
+@lru_cache(maxsize=1)
+def excel_styles() -> ExcelStyles:
+    """
+    Create the styles of the Excel output once.
+
+    Returns:
+        Styles of the header and data cells.
+    """
+    from openpyxl.styles import Font, Alignment, PatternFill
+    
+    return ExcelStyles(
+        header_font=Font(bold=True),
+        header_fill=PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid"),
+        header_alignment=Alignment(horizontal='center', vertical='center', wrap_text=True),
+        data_alignment=Alignment(wrap_text=True),
+    )
+
+
+def _run_writer(writer: Generator, sections: Iterable[Tuple[str, List[Dict[str, Any]]]]) -> Any:
+    """
+    Send the non-empty sections of an iterable to a section writer and return its result.
+
+    Section writers are generators that receive (file name, test cases) tuples
+    through ``send`` and finish when they receive None.
+
+    Args:
+        writer: Section writer generator that has not been started.
+        sections: Iterable of (test case file name, list of test case dictionaries) tuples.
+
+    Returns:
+        Value returned by the writer.
+    """
+    next(writer)
+    for file_name, cases in sections:
+        if cases:
+            writer.send((file_name, cases))
+    return _finish_writer(writer)
+
+
+def _finish_writer(writer: Generator) -> Any:
+    """Tell a section writer that no sections are left and return its result."""
+    try:
+        writer.send(None)
+    except StopIteration as stop:
+        return stop.value
+    raise RuntimeError("Section writer did not finish")
+
+
+def _discard_sections(section: Any) -> Generator[None, Any, None]:
+    """Accept and ignore the remaining sections sent to a writer that has failed."""
+    while section is not None:
+        section = yield
+
+
+# How the Excel output is split into workbooks
+EXCEL_SHARD_MODES = ("none", "section", "sections", "rows")
+
+# Rows of an Excel worksheet, including the header row
+EXCEL_MAX_ROWS = 1048576
+
+
+def _build_workbook(converter_class: type, path: str, sheets: List[Tuple[str, List[Tuple[str, ...]]]],
+                    measure: bool) -> List[Dict[str, Any]]:
+    """
+    Write a workbook in a worker process and return the stage timings.
+
+    This is a module-level function so that it can be sent to worker processes.
+
+    Args:
+        converter_class: Converter class whose fields and column widths are used.
+        path: Path of the workbook to create.
+        sheets: (worksheet name, normalized rows) tuples.
+        measure: Whether to time the stages.
+
+    Returns:
+        Stage timing records, see :class:`metrics.Metrics`.
+    """
+    metrics = Metrics(enabled=measure)
+    converter = converter_class(output_dir=os.path.dirname(path) or ".", metrics=metrics, skip_unchanged=False)
+    converter.write_workbook(path, sheets)
+    return metrics.records
+
 
 class TestCaseConverter:
     """Converter for transforming test cases to CSV and Excel formats."""
 
-    # Common test case fields with order preservation
-    TEST_CASE_FIELDS = [
-        "ID", "Name", "Desc", "Pre-conditions", "Test Steps", "Expected Result", 
-        "Actual Result", "Test Data", "Priority", "Severity", "Status",
-        "Environment", "Tested By", "Date", "Comments/Notes"
-    ]
+    TEST_CASE_FIELDS = list(TEST_CASE_FIELDS)
+
+    # Names of the files holding all sections
+    EXCEL_FILE_NAME = "test_cases.xlsx"
+    JSONL_FILE_NAME = "test_cases.jsonl"
+    PARQUET_FILE_NAME = "test_cases.parquet"
+    SQLITE_FILE_NAME = "test_cases.sqlite"
+
+    # Index of the worksheets of a sharded Excel output
+    EXCEL_INDEX_FILE_NAME = "test_cases_index.json"
+
+    # Data rows per worksheet; larger sections continue on "<name>_part2", "<name>_part3"... sheets
+    MAX_SHEET_ROWS = EXCEL_MAX_ROWS - 1
+
+    # Fields of the SQLite output with an index
+    SQLITE_INDEXED_FIELDS = ("Priority", "Status", "Severity")
+
+    # Workbooks with more data rows than this are written in streaming mode
+    DEFAULT_STREAMING_THRESHOLD = 10000
+
+    # Upper bound for auto-adjusted column widths
+    MAX_COLUMN_WIDTH = 50
+
+    # Bytes of CSV text gathered in memory before each write to the file
+    CSV_BUFFER_SIZE = 1 << 20
 
-    def __init__(self, output_dir: str = "output"):
+    def __init__(self, output_dir: str = "output", streaming_threshold: int = DEFAULT_STREAMING_THRESHOLD,
+                 metrics: Optional[Metrics] = None, skip_unchanged: bool = True, overwrite: str = "ask",
+                 excel_shard: str = "none", excel_shard_size: int = 0, excel_workers: int = 1,
+                 csv_workers: int = 1):
         """
         Initialize the converter.
 
         Args:
             output_dir: Directory where output files will be saved.
+            streaming_threshold: Total number of test cases above which the Excel
+                workbook is written row by row in write-only mode.
+            metrics: Collector of the time spent normalizing, writing and saving each output.
+            skip_unchanged: Whether to record the digest of each output in the
+                output directory and leave outputs whose rows have not changed
+                untouched, without asking to overwrite them.
+            overwrite: Policy for existing outputs that are not decided by an
+                overwrite plan, see ``OVERWRITE_POLICIES``. "ask" prompts for
+                each file, "never" keeps it, and the other policies overwrite
+                it, unless force is set for the call.
+            excel_shard: How the Excel output is split into workbooks, see
+                ``EXCEL_SHARD_MODES``: "none" writes a single workbook,
+                "section" one workbook per section, "sections" one per
+                ``excel_shard_size`` sections and "rows" one per
+                ``excel_shard_size`` rows. Sharded workbooks are listed in an
+                index file, which stands for the Excel output.
+            excel_shard_size: Number of sections or rows per workbook.
+            excel_workers: Number of worker processes building sharded workbooks.
+            csv_workers: Number of threads writing CSV files, see :meth:`_csv_stream`.
+
+        Raises:
+            ValueError: If the overwrite policy or the Excel shard mode is unknown,
+                or the shard size is missing.
         """
+        if overwrite not in OVERWRITE_POLICIES:
+            raise ValueError(f"Unknown overwrite policy: {overwrite}. Use one of: {', '.join(OVERWRITE_POLICIES)}")
+        if excel_shard not in EXCEL_SHARD_MODES:
+            raise ValueError(f"Unknown Excel shard mode: {excel_shard}. Use one of: {', '.join(EXCEL_SHARD_MODES)}")
+        if excel_shard in ("sections", "rows") and excel_shard_size < 1:
+            raise ValueError(f"Excel shard mode '{excel_shard}' needs a shard size of at least 1")
         self.output_dir = output_dir
+        self.streaming_threshold = streaming_threshold
+        self.metrics = metrics if metrics is not None else DISABLED
         os.makedirs(output_dir, exist_ok=True)
+        self.manifest = OutputManifest(output_dir) if skip_unchanged else None
+        self.overwrite = overwrite
+        self.overwrite_plan = None
+        self.excel_shard = excel_shard
+        self.excel_shard_size = excel_shard_size
+        self.excel_workers = excel_workers
+        self.csv_workers = csv_workers
+        # Paths of the outputs written, of those left as they were, and of those that could not be written
+        self.written = []
+        self.skipped = []
+        self.failed = []
+
+    def convert(self, test_cases: Dict[str, List[Dict[str, Any]]], formats: Sequence[str] = DEFAULT_FORMATS,
+                force: bool = False) -> Dict[str, Any]:
+        """
+        Convert test cases to each of the requested output formats.
+
+        Args:
+            test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
+            formats: Names of the output formats, see ``OUTPUT_WRITERS``.
+            force: Whether to overwrite existing files without asking.
+
+        Returns:
+            Dictionary mapping each format to the result of its writer.
+
+        Raises:
+            ValueError: If a format is unknown.
+        """
+        results = {}
+        for name in self._check_formats(formats):
+            results[name] = getattr(self, OUTPUT_WRITERS[name].method)(test_cases, force=force)
+        self.save_manifest()
+        return results
+
+    def convert_sections(self, sections: Iterable[Tuple[str, List[Dict[str, Any]]]],
+                         formats: Sequence[str] = DEFAULT_FORMATS, force: bool = False,
+                         csv_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Convert test case sections to the requested output formats as they arrive.
+
+        Each section is written to every output before the next one is read, so
+        sections produced by :meth:`TestCaseParser.iter_sections` never have to
+        be held in memory together. The Excel workbook is always written in
+        streaming mode. Single-file outputs are checked for overwriting before
+        the first section is read; since their digest is only known once all
+        sections are written, an unchanged output is written to a temporary
+        file that is then discarded.
 
+        Args:
+            sections: Iterable of (test case file name, list of test case dictionaries) tuples.
+            formats: Names of the output formats, see ``OUTPUT_WRITERS``.
+            force: Whether to overwrite existing files without asking.
+            csv_workers: Number of threads writing CSV files while the other
+                outputs are written, see :meth:`_csv_stream` (default: ``csv_workers``
+                of the converter).
+
+        Returns:
+            Dictionary mapping each format to the result of its writer.
+
+        Raises:
+            ValueError: If a format is unknown.
+        """
+        formats = self._check_formats(formats)
+        
+        results = {name: None for name in formats}
+        writers = {}
+        for name in formats:
+            if OUTPUT_WRITERS[name].file_name is None:
+                # Files of single sections are checked for overwriting one by one
+                writers[name] = getattr(self, OUTPUT_WRITERS[name].stream)(force, csv_workers)
+                next(writers[name])
+                continue
+            output_path = self.output_path(name)
+            if self._confirm_overwrite(output_path, force, OUTPUT_WRITERS[name].in_place):
+                writers[name] = getattr(self, OUTPUT_WRITERS[name].stream)(output_path)
+                next(writers[name])
+        
+        try:
+            for file_name, cases in sections:
+                if not cases:
+                    logger.warning(f"No test cases to convert for {file_name}")
+                    continue
+                for writer in writers.values():
+                    writer.send((file_name, cases))
+        except BaseException:
+            # Close open files without completing the single-file outputs
+            for writer in writers.values():
+                writer.close()
+            raise
+        
+        for name, writer in writers.items():
+            results[name] = _finish_writer(writer)
+        self.save_manifest()
+        
+        return results
+
+    def _collect_csv(self, pending: Tuple[str, Any], output_files: Dict[str, str]):
+        """Wait for a CSV file written by a worker thread and record its path."""
+        file_name, future = pending
+        try:
+            output_path = future.result()
+        except Exception as e:
+            # The other files are still written
+            output_path = self.output_path("csv", file_name)
+            logger.error(f"Error creating CSV file {output_path}: {str(e)}")
+            self.failed.append(output_path)
+            return
+        if output_path is not None:
+            output_files[file_name] = output_path
+
+    def convert_cases(self, cases: Iterable[Tuple[str, Dict[str, Any]]], formats: Sequence[str] = DEFAULT_FORMATS,
+                      force: bool = False) -> Dict[str, Any]:
+        """
+        Convert a stream of test cases, such as :meth:`TestCaseParser.iter_cases`, to the requested formats.
+
+        Consecutive test cases of the same section are grouped and written with
+        :meth:`convert_sections`.
+
+        Args:
+            cases: Iterable of (test case file name, test case dictionary) tuples.
+            formats: Names of the output formats, see ``OUTPUT_WRITERS``.
+            force: Whether to overwrite existing files without asking.
+
+        Returns:
+            Dictionary mapping each format to the result of its writer.
+
+        Raises:
+            ValueError: If a format is unknown.
+        """
+        sections = (
+            (file_name, [case for _, case in group])
+            for file_name, group in groupby(cases, key=itemgetter(0))
+        )
+        return self.convert_sections(sections, formats=formats, force=force)
+
+    @staticmethod
+    def _check_formats(formats: Sequence[str]) -> List[str]:
+        """
+        Check that output formats are known.
+
+        Args:
+            formats: Names of the output formats.
+
+        Returns:
+            Format names without duplicates, in the order given.
+
+        Raises:
+            ValueError: If a format is unknown.
+        """
+        unknown = [name for name in formats if name not in OUTPUT_WRITERS]
+        if unknown:
+            raise ValueError(f"Unknown output format: {', '.join(unknown)}. Use one of: {', '.join(OUTPUT_WRITERS)}")
+        return list(dict.fromkeys(formats))
+
+    def output_path(self, format_name: str, file_name: str = "") -> str:
+        """
+        Return the path of an output file.
+
+        Args:
+            format_name: Name of the output format, see ``OUTPUT_WRITERS``.
+            file_name: Test case file name of the section, for CSV files.
+
+        Returns:
+            Path of the CSV file of the section, or of the file holding all
+            sections; for a sharded Excel output, the path of its index file.
+        """
+        writer = OUTPUT_WRITERS[format_name]
+        if writer.file_name is None:
+            return os.path.join(self.output_dir, f"{Path(file_name).stem}.{format_name}")
+        if format_name == "xlsx" and self.excel_shard != "none":
+            return os.path.join(self.output_dir, self.EXCEL_INDEX_FILE_NAME)
+        return os.path.join(self.output_dir, getattr(self, writer.file_name))
+
+    def apply_overwrite_plan(self, plan: OverwritePlan):
+        """
+        Use the decisions of an overwrite plan instead of asking while writing.
+
+        Outputs the plan keeps are reported as skipped right away, since the
+        sections only they need are not parsed.
+
+        Args:
+            plan: Plan returned by :func:`overwrite.plan_overwrites`.
+        """
+        self.overwrite_plan = plan
+        self.skipped.extend(path for path, write in plan.decisions.items() if not write)
+
+    def _confirm_overwrite(self, output_path: str, force: bool, in_place: bool = False) -> bool:
+        """
+        Check whether an output file may be written.
+
+        Args:
+            output_path: Path of the output file.
+            force: Whether to overwrite existing files without asking.
+            in_place: Whether the output is updated in place rather than replaced.
+
+        Returns:
+            True if the file does not exist, force is set, the overwrite plan or
+            policy allows it or the user agreed to overwrite it.
+        """
+        if force or not os.path.exists(output_path):
+            return True
+        if self.overwrite_plan is not None and output_path in self.overwrite_plan.decisions:
+            # Kept outputs were already reported when the plan was applied
+            return self.overwrite_plan.decisions[output_path]
+            
+        if self.overwrite == "ask":
+            response = input(f"File {output_path} already exists. {overwrite_question(in_place)} (y/n): ")
+            allowed = response.lower() == 'y'
+        else:
+            allowed = self.overwrite != "never"
+        if not allowed:
+            logger.info(f"Skipping {output_path}")
+            self.skipped.append(output_path)
+        return allowed
+
+    def _is_kept(self, output_path: str) -> bool:
+        """Return whether the overwrite plan keeps an existing output, so that no work is spent on it."""
+        return (self.overwrite_plan is not None and not self.overwrite_plan.decisions.get(output_path, True)
+                and os.path.exists(output_path))
+
+    def _source_digest(self, output_path: str) -> Optional[str]:
+        """Return the digest of the input sections of an output, if an overwrite plan computed it."""
+        if self.overwrite_plan is None:
+            return None
+        return self.overwrite_plan.sources.get(output_path)
+
+    def _is_unchanged(self, output_path: str, digest: Optional[str]) -> bool:
+        """
+        Check whether an output already holds the rows with the given digest, and log it if so.
+
+        Under the "always" overwrite policy, outputs are rewritten even if the
+        manifest records the same rows, e.g. to restore a file edited by hand.
+
+        Args:
+            output_path: Path of the output file.
+            digest: Digest of the rows that would be written, or None if unknown.
+
+        Returns:
+            True if the output does not need to be written.
+        """
+        if self.overwrite == "always" or digest is None or self.manifest is None:
+            return False
+        if not self.manifest.is_unchanged(output_path, digest):
+            return False
+        logger.info(f"Output is unchanged: {output_path}")
+        self.skipped.append(output_path)
+        source = self._source_digest(output_path)
+        if source is not None and self.manifest.source_digest(output_path) != source:
+            self.manifest.record(output_path, digest, source)
+        return True
+
+    def publish(self, temp_path: str, output_path: str, digest: Optional[str]):
+        """
+        Move a completely written temporary file over its output file, unless the output is unchanged.
+
+        Args:
+            temp_path: Path of the temporary file, see :func:`manifest.temporary_path`.
+            output_path: Path of the output file.
+            digest: Digest of the rows written, recorded in the manifest.
+        """
+        if self._is_unchanged(output_path, digest):
+            remove_temporary(temp_path)
+            return
+        os.replace(temp_path, output_path)
+        self.written.append(output_path)
+        self._record_digest(output_path, digest)
+
+    def _record_digest(self, output_path: str, digest: Optional[str]):
+        """Record the digest of an output that now holds the rows with this digest."""
+        if self.manifest is not None:
+            if digest is not None:
+                self.manifest.record(output_path, digest, self._source_digest(output_path))
+            else:
+                self.manifest.forget(output_path)
+
+    def save_manifest(self):
+        """Persist the digests of the outputs written so far."""
+        if self.manifest is not None:
+            self.manifest.save()
+
+    @output_writer("csv", stream="_csv_stream")
     def convert_to_csv(self, test_cases: Dict[str, List[Dict[str, Any]]], force: bool = False) -> Dict[str, str]:
         """
         Convert test cases to CSV files.
 
+        The files are written by ``csv_workers`` threads, see :meth:`_csv_stream`.
+
         Args:
             test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
             force: Whether to overwrite existing files without asking.
 
         Returns:
-            Dictionary mapping file names to output paths.
+            Dictionary mapping file names to output paths. Files that could not
+            be written are left out and listed in ``failed``.
         """
-        output_files = {}
-        
+        writer = self._csv_stream(force)
+        next(writer)
         for file_name, cases in test_cases.items():
             if not cases:
                 logger.warning(f"No test cases to convert for {file_name}")
                 continue
-                
-            # Create output file path
-            base_name = Path(file_name).stem
-            output_path = os.path.join(self.output_dir, f"{base_name}.csv")
+            writer.send((file_name, cases))
+        output_files = _finish_writer(writer)
+        
+        self.save_manifest()
+        return output_files
+
+    def _csv_stream(self, force: bool, workers: Optional[int] = None
+                    ) -> Generator[None, Optional[Tuple[str, List[Dict[str, Any]]]], Dict[str, str]]:
+        """
+        Section writer writing the CSV file of each section, in a pool of threads when there are several workers.
+
+        The pool is only used when no overwrite prompt can be shown, that is
+        with force or a policy other than "ask", since the prompt cannot be
+        shown by several threads at once. Each thread has one file open at a
+        time, so at most ``workers`` files are open, and at most twice that
+        many sections wait to be written. Sections sharing a CSV file, such as
+        ``login.md`` and ``login.yaml``, are written one after the other, so
+        the later one wins as when writing serially. A file that cannot be
+        written is logged and listed in ``failed`` while the other files are
+        written.
+
+        Args:
+            force: Whether to overwrite existing files without asking.
+            workers: Number of threads writing CSV files (default: ``csv_workers``).
+
+        Returns:
+            Dictionary mapping file names to output paths, in section order.
+        """
+        workers = self.csv_workers if workers is None else workers
+        pool = None
+        if workers > 1 and (force or self.overwrite != "ask"):
+            from concurrent.futures import ThreadPoolExecutor, wait
+            
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="csv-writer")
+        output_files = {}
+        pending = deque()
+        # Output path -> last future writing it
+        writing = {}
+        try:
+            section = yield
+            while section is not None:
+                file_name, cases = section
+                if pool is None:
+                    output_path = self._write_csv_section(file_name, cases, force)
+                    if output_path is not None:
+                        output_files[file_name] = output_path
+                else:
+                    # Wait for the oldest file first so that pending rows stay bounded
+                    if len(pending) >= 2 * workers:
+                        self._collect_csv(pending.popleft(), output_files)
+                    output_path = self.output_path("csv", file_name)
+                    if output_path in writing:
+                        wait([writing[output_path]])
+                    future = pool.submit(self._write_csv_section, file_name, cases, force)
+                    writing[output_path] = future
+                    pending.append((file_name, future))
+                section = yield
+            while pending:
+                self._collect_csv(pending.popleft(), output_files)
+            return output_files
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+    def _write_csv_section(self, file_name: str, cases: List[Dict[str, Any]], force: bool) -> Optional[str]:
+        """
+        Write the test cases of one section to its CSV file.
+
+        Args:
+            file_name: Test case file name of the section.
+            cases: Non-empty list of test case dictionaries.
+            force: Whether to overwrite existing files without asking.
+
+        Returns:
+            Path of the CSV file, or None if the user declined to overwrite it
+            or it could not be written. The path is also returned when the file
+            was left untouched because its rows have not changed or the
+            overwrite plan keeps it.
+        """
+        # Create output file path
+        output_path = self.output_path("csv", file_name)
+        if self._is_kept(output_path):
+            return output_path
+        
+        temp_path = temporary_path(output_path)
+        try:
+            with self.metrics.stage("normalize", file_name) as record:
+                rows = list(normalize_cases(cases, self.TEST_CASE_FIELDS))
+                record["cases"] = len(rows)
+            
+            # Skip files that already hold the same rows
+            digest = None
+            if self.manifest is not None:
+                digest = rows_digest(self.TEST_CASE_FIELDS, rows)
+                if self._is_unchanged(output_path, digest):
+                    return output_path
             
             # Check if file exists
-            if os.path.exists(output_path) and not force:
-                response = input(f"File {output_path} already exists. Overwrite? (y/n): ")
-                if response.lower() != 'y':
-                    logger.info(f"Skipping {output_path}")
-                    continue
+            if not self._confirm_overwrite(output_path, force):
+                return None
             
-            try:
-                with open(output_path, 'w', newline='', encoding='utf-8') as csvfile:
-                    fieldnames = self.TEST_CASE_FIELDS
-                    writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-                    
-                    writer.writeheader()
-                    for case in cases:
-                        # Normalize keys (handle case sensitivity)
-                        normalized_case = {}
-                        for field in fieldnames:
-                            # Try exact match first
-                            if field in case:
-                                normalized_case[field] = case[field]
-                            else:
-                                # Try case-insensitive match
-                                field_lower = field.lower()
-                                found = False
-                                for key in case:
-                                    if key.lower() == field_lower:
-                                        normalized_case[field] = case[key]
-                                        found = True
-                                        break
-                                if not found:
-                                    normalized_case[field] = ""
-                        
-                        writer.writerow(normalized_case)
-                
-                logger.info(f"Created CSV file: {output_path}")
-                output_files[file_name] = output_path
-                
-            except Exception as e:
-                logger.error(f"Error creating CSV file {output_path}: {str(e)}")
-        
-        return output_files
+            with self.metrics.stage("write", output_path) as record:
+                # Rows are formatted into a large buffer that is written to the file in a few calls
+                with open(temp_path, 'w', newline='', encoding='utf-8', buffering=self.CSV_BUFFER_SIZE) as csvfile:
+                    writer = csv.writer(csvfile)
+                    writer.writerow(self.TEST_CASE_FIELDS)
+                    writer.writerows(rows)
+                record["cases"] = len(rows)
+                record["bytes"] = os.path.getsize(temp_path)
+            self.publish(temp_path, output_path, digest)
+            
+            logger.info(f"Created CSV file: {output_path}")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"Error creating CSV file {output_path}: {str(e)}")
+            self.failed.append(output_path)
+            return None
+        finally:
+            remove_temporary(temp_path)
 
-    def convert_to_excel(self, test_cases: Dict[str, List[Dict[str, Any]]], force: bool = False) -> Optional[str]:
+    @output_writer("xlsx", stream="_excel_stream", file_name="EXCEL_FILE_NAME")
+    def convert_to_excel(self, test_cases: Dict[str, List[Dict[str, Any]]], force: bool = False,
+                         streaming: Optional[bool] = None) -> Optional[str]:
         """
         Convert all test cases to a single Excel file with multiple sheets.
 
+        Sections with more rows than fit in a worksheet continue on
+        "<name>_part2", "<name>_part3"... sheets. With ``excel_shard`` set, the
+        sections are split into several workbooks instead, see
+        :meth:`_excel_shard_stream`.
+
         Args:
             test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
             force: Whether to overwrite existing files without asking.
+            streaming: Whether to write the workbook in streaming (write-only) mode.
+                If None, streaming is used when the total number of test cases
+                exceeds ``streaming_threshold``. Sharded workbooks are always streamed.
 
         Returns:
-            Path to the created Excel file, or None if creation failed.
+            Path to the created Excel file, or of the index of the sharded
+            workbooks, or None if creation failed.
         """
         if not test_cases:
             logger.warning("No test cases to convert to Excel")
             return None
             
-        excel_path = os.path.join(self.output_dir, "test_cases.xlsx")
+        excel_path = self.output_path("xlsx")
+        if self._is_kept(excel_path):
+            return excel_path
         
-        # Check if file exists
-        if os.path.exists(excel_path) and not force:
-            response = input(f"File {excel_path} already exists. Overwrite? (y/n): ")
-            if response.lower() != 'y':
-                logger.info(f"Skipping Excel file creation")
+        if self.excel_shard != "none":
+            # Workbooks are checked for changes one by one while they are built
+            if not self._confirm_overwrite(excel_path, force):
                 return None
+            path = _run_writer(self._excel_stream(excel_path), test_cases.items())
+            self.save_manifest()
+            return path
+        
+        # Skip the workbook entirely if it already holds the same rows
+        digest = self._single_file_digest("xlsx", excel_path, test_cases)
+        if digest is not None and self._is_unchanged(excel_path, digest):
+            return excel_path
+        
+        # Check if file exists
+        if not self._confirm_overwrite(excel_path, force):
+            return None
+        
+        if streaming is None:
+            total_rows = sum(len(cases) for cases in test_cases.values() if cases)
+            streaming = total_rows > self.streaming_threshold
+        
+        if streaming:
+            return self._convert_to_excel_streaming(test_cases, excel_path, digest)
         
+        # openpyxl is slow to import, so it is only loaded when Excel output is needed
+        import openpyxl
+        
+        temp_path = temporary_path(excel_path)
         try:
             workbook = openpyxl.Workbook()
             # Remove the default sheet
@@ -132,54 +931,772 @@ class TestCaseConverter:
                 if not cases:
                     continue
                     
-                # Create a sheet for each file
-                sheet_name = Path(file_name).stem[:31]  # Excel sheet names are limited to 31 chars
-                sheet = workbook.create_sheet(sheet_name)
-                
-                # Add header row
-                for col_idx, field in enumerate(self.TEST_CASE_FIELDS, start=1):
-                    cell = sheet.cell(row=1, column=col_idx, value=field)
-                    # Style header
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color="DDDDDD", end_color="DDDDDD", fill_type="solid")
-                    cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
-                
-                # Add test case data
-                for row_idx, case in enumerate(cases, start=2):
-                    for col_idx, field in enumerate(self.TEST_CASE_FIELDS, start=1):
-                        # Try exact match first
-                        value = ""
-                        if field in case:
-                            value = case[field]
-                        else:
-                            # Try case-insensitive match
-                            field_lower = field.lower()
-                            for key in case:
-                                if key.lower() == field_lower:
-                                    value = case[key]
-                                    break
-                        
-                        cell = sheet.cell(row=row_idx, column=col_idx, value=str(value))
-                        cell.alignment = Alignment(wrap_text=True)
-                
-                # Auto-adjust column widths
-                for col in sheet.columns:
-                    max_length = 0
-                    column = col[0].column_letter
-                    for cell in col:
-                        if cell.value:
-                            cell_length = len(str(cell.value))
-                            if cell_length > max_length:
-                                max_length = cell_length
-                    
-                    # Limit column width to a reasonable size
-                    adjusted_width = min(max_length + 2, 50)
-                    sheet.column_dimensions[column].width = adjusted_width
+                # Create a sheet for each file, or several for a section too large for one
+                for sheet_name, part in self.sheet_parts(file_name, cases):
+                    with self.metrics.stage("write", sheet_name) as record:
+                        sheet = workbook.create_sheet(sheet_name)
+                        self.fill_sheet(sheet, part)
+                        record["cases"] = len(part)
             
-            workbook.save(excel_path)
+            with self.metrics.stage("save", excel_path) as record:
+                workbook.save(temp_path)
+                record["bytes"] = os.path.getsize(temp_path)
+            self.publish(temp_path, excel_path, digest)
+            self.save_manifest()
             logger.info(f"Created Excel file: {excel_path}")
             return excel_path
             
         except Exception as e:
             logger.error(f"Error creating Excel file {excel_path}: {str(e)}")
+            self.failed.append(excel_path)
+            return None
+        finally:
+            remove_temporary(temp_path)
+
+    @staticmethod
+    def sheet_name(file_name: str, part: int = 1) -> str:
+        """
+        Return the worksheet name used for a test case file.
+
+        Args:
+            file_name: Test case file name of a section.
+            part: Number of the worksheet, for sections split over several worksheets.
+
+        Returns:
+            File name stem, with a "_part<n>" suffix from the second part on,
+            truncated to the 31 characters allowed by Excel.
+        """
+        suffix = f"_part{part}" if part > 1 else ""
+        return Path(file_name).stem[:31 - len(suffix)] + suffix
+
+    def sheet_parts(self, file_name: str, rows: Sequence[Any],
+                    limit: Optional[int] = None) -> List[Tuple[str, Sequence[Any]]]:
+        """
+        Split the rows of a section into worksheets of at most ``MAX_SHEET_ROWS`` rows.
+
+        Args:
+            file_name: Test case file name of the section.
+            rows: Test cases or normalized rows of the section.
+            limit: Lower maximum number of rows per worksheet, if any.
+
+        Returns:
+            List of (worksheet name, rows) tuples. A section that fits in one
+            worksheet keeps its sequence of rows.
+        """
+        size = min(limit or self.MAX_SHEET_ROWS, self.MAX_SHEET_ROWS)
+        if len(rows) <= size:
+            return [(self.sheet_name(file_name), rows)]
+        return [
+            (self.sheet_name(file_name, part), rows[start:start + size])
+            for part, start in enumerate(range(0, len(rows), size), start=1)
+        ]
+
+    def fill_sheet(self, sheet, cases: List[Dict[str, Any]]):
+        """
+        Write the header and test case rows to an empty worksheet.
+
+        Args:
+            sheet: openpyxl worksheet to fill.
+            cases: List of test case dictionaries.
+        """
+        styles = excel_styles()
+        widths = [display_width(field) for field in self.TEST_CASE_FIELDS]
+        
+        # Add header row
+        for col_idx, field in enumerate(self.TEST_CASE_FIELDS, start=1):
+            cell = sheet.cell(row=1, column=col_idx, value=field)
+            # Style header
+            cell.font = styles.header_font
+            cell.fill = styles.header_fill
+            cell.alignment = styles.header_alignment
+        
+        # Add test case data, tracking the widest line of each column on the way
+        data_alignment = styles.data_alignment
+        for row_idx, row in enumerate(normalize_cases(cases, self.TEST_CASE_FIELDS), start=2):
+            for col_idx, value in enumerate(row):
+                value = str(value)
+                cell = sheet.cell(row=row_idx, column=col_idx + 1, value=value)
+                cell.alignment = data_alignment
+                width = display_width(value)
+                if width > widths[col_idx]:
+                    widths[col_idx] = width
+        
+        self.set_column_widths(sheet, widths)
+
+    def set_column_widths(self, sheet, widths: Sequence[int]):
+        """
+        Set the width of each column from the width of its widest line.
+
+        Args:
+            sheet: openpyxl worksheet.
+            widths: Display width of the widest line of each column, in field order.
+        """
+        from openpyxl.utils import get_column_letter
+        
+        for col_idx, width in enumerate(widths, start=1):
+            # Limit column width to a reasonable size
+            sheet.column_dimensions[get_column_letter(col_idx)].width = min(width + 2, self.MAX_COLUMN_WIDTH)
+
+    def _write_only_sheet(self, workbook, styles: ExcelStyles, sheet_name: str, rows: List[Tuple[str, ...]]):
+        """
+        Add a worksheet with the header and rows to a write-only workbook.
+
+        Rows are sent to the worksheet one at a time instead of being kept as
+        styled cells in memory, and each row is released from the list once
+        written. openpyxl writes column definitions before the sheet data, so
+        column widths are measured in a first pass over the rows, which all
+        have to be in memory until the first one is written.
+
+        Args:
+            workbook: openpyxl workbook in write-only mode.
+            styles: Styles of the header and data cells.
+            sheet_name: Name of the worksheet.
+            rows: Normalized rows of string values; the list is emptied.
+        """
+        from openpyxl.cell import WriteOnlyCell
+        
+        sheet = workbook.create_sheet(sheet_name)
+        with self.metrics.stage("write", sheet_name) as record:
+            record["cases"] = len(rows)
+            widths = [display_width(field) for field in self.TEST_CASE_FIELDS]
+            for row in rows:
+                for col_idx, value in enumerate(row):
+                    width = display_width(value)
+                    if width > widths[col_idx]:
+                        widths[col_idx] = width
+            self.set_column_widths(sheet, widths)
+            
+            header = []
+            for field in self.TEST_CASE_FIELDS:
+                cell = WriteOnlyCell(sheet, value=field)
+                cell.font = styles.header_font
+                cell.fill = styles.header_fill
+                cell.alignment = styles.header_alignment
+                header.append(cell)
+            sheet.append(header)
+            
+            # Release each row as soon as it has been written
+            rows.reverse()
+            while rows:
+                row = rows.pop()
+                cells = []
+                for value in row:
+                    cell = WriteOnlyCell(sheet, value=value)
+                    cell.alignment = styles.data_alignment
+                    cells.append(cell)
+                sheet.append(cells)
+
+    def write_workbook(self, path: str, sheets: Iterable[Tuple[str, List[Tuple[str, ...]]]]):
+        """
+        Write worksheets of normalized rows to a new workbook in write-only mode.
+
+        Args:
+            path: Path of the workbook to create.
+            sheets: (worksheet name, rows of string values) tuples; each list of rows is emptied.
+        """
+        import openpyxl
+        
+        workbook = openpyxl.Workbook(write_only=True)
+        styles = excel_styles()
+        for sheet_name, rows in sheets:
+            self._write_only_sheet(workbook, styles, sheet_name, rows)
+        with self.metrics.stage("save", path) as record:
+            workbook.save(path)
+            record["bytes"] = os.path.getsize(path)
+
+    def _convert_to_excel_streaming(self, test_cases: Dict[str, List[Dict[str, Any]]], excel_path: str,
+                                    digest: Optional[str] = None) -> Optional[str]:
+        """
+        Write all test cases to an Excel file using openpyxl's write-only mode.
+
+        Args:
+            test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
+            excel_path: Path of the Excel file to create.
+            digest: Digest of the rows, if already computed.
+
+        Returns:
+            Path to the created Excel file, or None if creation failed.
+        """
+        path = _run_writer(self._excel_stream(excel_path, digest), test_cases.items())
+        self.save_manifest()
+        return path
+
+    def _excel_stream(self, excel_path: str, digest: Optional[str] = None
+                      ) -> Generator[None, Optional[Tuple[str, List[Dict[str, Any]]]], Optional[str]]:
+        """
+        Section writer adding one write-only worksheet per section to an Excel file.
+
+        See :meth:`_write_only_sheet`. Memory is bounded per section rather
+        than constant: the normalized rows of one section are held while its
+        column widths are measured, and released once its worksheets are
+        written. The workbook is saved to a temporary
+        file that replaces the Excel file once complete. With ``excel_shard``
+        set, the sections are written by :meth:`_excel_shard_stream` instead.
+
+        Args:
+            excel_path: Path of the Excel file to create.
+            digest: Digest of all rows, if already computed; otherwise it is
+                computed while the sections are written.
+
+        Returns:
+            Path to the created Excel file, or None if creation failed.
+        """
+        if self.excel_shard != "none":
+            return (yield from self._excel_shard_stream(excel_path, digest))
+        
+        import openpyxl
+        
+        section = yield
+        if section is None:
+            logger.warning("No test cases to convert to Excel")
+            return None
+        
+        sections_digest = self._sections_digest("xlsx", digest)
+        temp_path = temporary_path(excel_path)
+        try:
+            workbook = openpyxl.Workbook(write_only=True)
+            styles = excel_styles()
+            
+            while section is not None:
+                file_name, cases = section
+                with self.metrics.stage("normalize", file_name) as record:
+                    rows = [tuple(map(str, values)) for values in self._digested_rows(sections_digest, file_name, cases)]
+                    record["cases"] = len(rows)
+                for sheet_name, part in self.sheet_parts(file_name, rows):
+                    self._write_only_sheet(workbook, styles, sheet_name, part)
+                rows = None
+                
+                section = yield
+            
+            with self.metrics.stage("save", excel_path) as record:
+                workbook.save(temp_path)
+                record["bytes"] = os.path.getsize(temp_path)
+            self.publish(temp_path, excel_path, digest if sections_digest is None else sections_digest.hexdigest())
+            logger.info(f"Created Excel file: {excel_path} (streaming mode)")
+            return excel_path
+            
+        except Exception as e:
+            logger.error(f"Error creating Excel file {excel_path}: {str(e)}")
+            self.failed.append(excel_path)
+            yield from _discard_sections(section)
+            return None
+        finally:
+            remove_temporary(temp_path)
+
+    def _excel_shard_stream(self, index_path: str, digest: Optional[str] = None
+                            ) -> Generator[None, Optional[Tuple[str, List[Dict[str, Any]]]], Optional[str]]:
+        """
+        Section writer splitting the Excel output into several workbooks.
+
+        Sections are gathered into workbooks as ``excel_shard`` says, and each
+        workbook is built as soon as it is complete, in a worker process when
+        ``excel_workers`` > 1; at most twice that many complete workbooks wait
+        for a worker. Workbooks whose rows have not changed are not built.
+        Once all workbooks are written, the index file lists the workbook and
+        worksheet of each section, and the workbooks of the previous index
+        that are no longer part of the output are removed.
+
+        Args:
+            index_path: Path of the index file.
+            digest: Not used; each workbook has its own digest.
+
+        Returns:
+            Path of the index file, or None if a workbook could not be created.
+        """
+        section = yield
+        if section is None:
+            logger.warning("No test cases to convert to Excel")
+            return None
+        
+        pool = None
+        if self.excel_workers > 1:
+            from concurrent.futures import ProcessPoolExecutor
+            
+            pool = ProcessPoolExecutor(max_workers=self.excel_workers)
+        pending = deque()
+        entries = []
+        shard = []
+        shard_rows = 0
+        row_limit = self.excel_shard_size if self.excel_shard == "rows" else None
+        try:
+            while section is not None:
+                file_name, cases = section
+                with self.metrics.stage("normalize", file_name) as record:
+                    rows = [tuple(map(str, values)) for values in normalize_cases(cases, self.TEST_CASE_FIELDS)]
+                    record["cases"] = len(rows)
+                for sheet_name, part in self.sheet_parts(file_name, rows, row_limit):
+                    if row_limit is not None and shard and shard_rows + len(part) > row_limit:
+                        self._start_shard(shard, entries, pool, pending)
+                        shard, shard_rows = [], 0
+                    shard.append((file_name, sheet_name, part))
+                    shard_rows += len(part)
+                rows = None
+                
+                sections = len(dict.fromkeys(name for name, _, _ in shard))
+                if self.excel_shard == "section" or (self.excel_shard == "sections" and sections >= self.excel_shard_size):
+                    self._start_shard(shard, entries, pool, pending)
+                    shard, shard_rows = [], 0
+                section = yield
+            
+            if shard:
+                self._start_shard(shard, entries, pool, pending)
+            while pending:
+                self._finish_shard(pending.popleft())
+            self._write_excel_index(index_path, entries)
+            return index_path
+            
+        except Exception as e:
+            logger.error(f"Error creating Excel workbooks listed in {index_path}: {str(e)}")
+            self.failed.append(index_path)
+            yield from _discard_sections(section)
+            return None
+        finally:
+            if pool is not None:
+                pool.shutdown(wait=True, cancel_futures=True)
+            for _, temp_path, _, _ in pending:
+                remove_temporary(temp_path)
+
+    def _shard_path(self, shard: List[Tuple[str, str, List[Tuple[str, ...]]]], used: Iterable[str]) -> str:
+        """Return the path of a sharded workbook: named after its section, or numbered."""
+        used = set(used)
+        number = len(used) + 1
+        name = f"{Path(self.EXCEL_FILE_NAME).stem}_{number:03d}.xlsx"
+        if self.excel_shard == "section":
+            # Sections such as "login.md" and "login.yaml" would share a workbook name, and a
+            # numbered name such as "login_3.xlsx" may already be the workbook of another section
+            stem = Path(shard[0][0]).stem
+            name = f"{stem}.xlsx"
+            while name in used:
+                name = f"{stem}_{number}.xlsx"
+                number += 1
+        return os.path.join(self.output_dir, name)
+
+    def _start_shard(self, shard: List[Tuple[str, str, List[Tuple[str, ...]]]], entries: List[Dict[str, Any]],
+                     pool: Optional[Any], pending: deque):
+        """
+        Build a sharded workbook, or hand it to a worker process, unless its rows have not changed.
+
+        Args:
+            shard: (file name, worksheet name, rows) tuples of the workbook.
+            entries: Index entries, extended with the worksheets of the workbook.
+            pool: Process pool building the workbooks, or None to build it in this process.
+            pending: Workbooks being built by the pool, extended with this one.
+        """
+        path = self._shard_path(shard, (entry["workbook"] for entry in entries))
+        entries.extend(
+            {"section": file_name, "workbook": os.path.basename(path), "sheet": sheet_name, "rows": len(rows)}
+            for file_name, sheet_name, rows in shard
+        )
+        digest = None
+        if self.manifest is not None:
+            shard_digest = OutputDigest("xlsx", self.TEST_CASE_FIELDS)
+            for _, sheet_name, rows in shard:
+                shard_digest.add(sheet_name, rows)
+            digest = shard_digest.hexdigest()
+            if self._is_unchanged(path, digest):
+                return
+            
+        sheets = [(sheet_name, rows) for _, sheet_name, rows in shard]
+        temp_path = temporary_path(path)
+        if pool is None:
+            try:
+                self.write_workbook(temp_path, sheets)
+                self.publish(temp_path, path, digest)
+                logger.info(f"Created Excel file: {path}")
+            finally:
+                remove_temporary(temp_path)
+            return
+            
+        # Wait for the oldest workbook first so that pending rows stay bounded
+        while len(pending) >= 2 * self.excel_workers:
+            self._finish_shard(pending.popleft())
+        future = pool.submit(_build_workbook, type(self), temp_path, sheets, self.metrics.enabled)
+        pending.append((path, temp_path, digest, future))
+
+    def _finish_shard(self, pending: Tuple[str, str, Optional[str], Any]):
+        """Wait for a workbook built by a worker process and move it over its output file."""
+        path, temp_path, digest, future = pending
+        try:
+            self.metrics.extend(future.result())
+            self.publish(temp_path, path, digest)
+            logger.info(f"Created Excel file: {path}")
+        finally:
+            remove_temporary(temp_path)
+
+    def _write_excel_index(self, index_path: str, entries: List[Dict[str, Any]]):
+        """
+        Write the index of a sharded Excel output and remove the workbooks it no longer lists.
+
+        Args:
+            index_path: Path of the index file.
+            entries: Section, workbook, worksheet and row count of each worksheet.
+        """
+        previous = []
+        try:
+            with open(index_path, 'r', encoding='utf-8') as f:
+                previous = json.load(f)["sheets"]
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+            
+        text = json.dumps({"sheets": entries}, ensure_ascii=False, indent=2)
+        temp_path = temporary_path(index_path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(text)
+            self.publish(temp_path, index_path, hashlib.sha256(text.encode('utf-8')).hexdigest())
+        finally:
+            remove_temporary(temp_path)
+            
+        current = {entry["workbook"] for entry in entries}
+        for workbook in {os.path.basename(str(entry.get("workbook", ""))) for entry in previous} - current:
+            path = os.path.join(self.output_dir, workbook)
+            if workbook.endswith(".xlsx") and os.path.exists(path):
+                os.remove(path)
+                if self.manifest is not None:
+                    self.manifest.forget(path)
+                logger.info(f"Removed Excel file no longer in the output: {path}")
+
+    def _sections_digest(self, format_name: str, digest: Optional[str]) -> Optional[OutputDigest]:
+        """Return a digest to compute while a single-file output is written, or None if not needed."""
+        if digest is not None or self.manifest is None:
+            return None
+        return OutputDigest(format_name, self.TEST_CASE_FIELDS)
+
+    def _digested_rows(self, sections_digest: Optional[OutputDigest], file_name: str,
+                       cases: List[Dict[str, Any]]) -> Iterable[Tuple[Any, ...]]:
+        """Normalize the test cases of a section, adding them to the digest of the output if there is one."""
+        rows = normalize_cases(cases, self.TEST_CASE_FIELDS)
+        if sections_digest is None:
+            return rows
+        rows = list(rows)
+        sections_digest.add(file_name, rows)
+        return rows
+
+    @output_writer("jsonl", stream="_jsonl_stream", file_name="JSONL_FILE_NAME")
+    def convert_to_jsonl(self, test_cases: Dict[str, List[Dict[str, Any]]], force: bool = False) -> Optional[str]:
+        """
+        Convert all test cases to a single JSON Lines file.
+
+        Each line is an object with a "section" key holding the test case file
+        name, followed by the test case fields in column order.
+
+        Args:
+            test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
+            force: Whether to overwrite existing files without asking.
+
+        Returns:
+            Path to the created JSON Lines file, or None if creation failed.
+        """
+        if not test_cases:
+            logger.warning("No test cases to convert to JSON Lines")
+            return None
+        
+        jsonl_path = self.output_path("jsonl")
+        if self._is_kept(jsonl_path):
+            return jsonl_path
+        digest = self._single_file_digest("jsonl", jsonl_path, test_cases)
+        if digest is not None and self._is_unchanged(jsonl_path, digest):
+            return jsonl_path
+        if not self._confirm_overwrite(jsonl_path, force):
+            return None
+        
+        path = _run_writer(self._jsonl_stream(jsonl_path, digest), test_cases.items())
+        self.save_manifest()
+        return path
+
+    def _single_file_digest(self, format_name: str, output_path: str,
+                            test_cases: Dict[str, List[Dict[str, Any]]]) -> Optional[str]:
+        """Compute the digest of a single-file output before writing it, or return None if not needed."""
+        if self.manifest is None:
+            return None
+        with self.metrics.stage("normalize", output_path):
+            return output_digest(format_name, test_cases, self.TEST_CASE_FIELDS)
+
+    def _jsonl_stream(self, jsonl_path: str, digest: Optional[str] = None
+                      ) -> Generator[None, Optional[Tuple[str, List[Dict[str, Any]]]], Optional[str]]:
+        """
+        Section writer appending the test cases of each section to a JSON Lines file.
+
+        Args:
+            jsonl_path: Path of the JSON Lines file to create.
+            digest: Digest of all rows, if already computed; otherwise it is
+                computed while the sections are written.
+
+        Returns:
+            Path to the created JSON Lines file, or None if creation failed.
+        """
+        section = yield
+        if section is None:
+            logger.warning("No test cases to convert to JSON Lines")
+            return None
+        
+        sections_digest = self._sections_digest("jsonl", digest)
+        temp_path = temporary_path(jsonl_path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as jsonl_file:
+                while section is not None:
+                    file_name, cases = section
+                    with self.metrics.stage("write", file_name) as stage:
+                        for row in self._digested_rows(sections_digest, file_name, cases):
+                            record = {"section": file_name}
+                            record.update(zip(self.TEST_CASE_FIELDS, row))
+                            jsonl_file.write(json.dumps(record, ensure_ascii=False, default=str))
+                            jsonl_file.write("\n")
+                        stage["cases"] = len(cases)
+                    section = yield
+            self.publish(temp_path, jsonl_path, digest if sections_digest is None else sections_digest.hexdigest())
+            
+            logger.info(f"Created JSON Lines file: {jsonl_path}")
+            return jsonl_path
+            
+        except Exception as e:
+            logger.error(f"Error creating JSON Lines file {jsonl_path}: {str(e)}")
+            self.failed.append(jsonl_path)
+            yield from _discard_sections(section)
+            return None
+        finally:
+            remove_temporary(temp_path)
+
+    @output_writer("parquet", stream="_parquet_stream", file_name="PARQUET_FILE_NAME")
+    def convert_to_parquet(self, test_cases: Dict[str, List[Dict[str, Any]]], force: bool = False) -> Optional[str]:
+        """
+        Convert all test cases to a single Parquet file.
+
+        Requires the optional pyarrow package. The file has a "section" column
+        followed by one string column per test case field.
+
+        Args:
+            test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
+            force: Whether to overwrite existing files without asking.
+
+        Returns:
+            Path to the created Parquet file, or None if creation failed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            logger.error("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+            self.failed.append(self.output_path("parquet"))
+            return None
+        
+        if not test_cases:
+            logger.warning("No test cases to convert to Parquet")
+            return None
+        
+        parquet_path = self.output_path("parquet")
+        if self._is_kept(parquet_path):
+            return parquet_path
+        digest = self._single_file_digest("parquet", parquet_path, test_cases)
+        if digest is not None and self._is_unchanged(parquet_path, digest):
+            return parquet_path
+        if not self._confirm_overwrite(parquet_path, force):
+            return None
+        
+        path = _run_writer(self._parquet_stream(parquet_path, digest), test_cases.items())
+        self.save_manifest()
+        return path
+
+    def _parquet_stream(self, parquet_path: str, digest: Optional[str] = None
+                        ) -> Generator[None, Optional[Tuple[str, List[Dict[str, Any]]]], Optional[str]]:
+        """
+        Section writer adding one row group per section to a Parquet file.
+
+        Args:
+            parquet_path: Path of the Parquet file to create.
+            digest: Digest of all rows, if already computed; otherwise it is
+                computed while the sections are written.
+
+        Returns:
+            Path to the created Parquet file, or None if creation failed.
+        """
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            logger.error("Parquet output requires pyarrow. Install it with: pip install pyarrow")
+            self.failed.append(parquet_path)
+            yield from _discard_sections((yield))
+            return None
+        
+        section = yield
+        if section is None:
+            logger.warning("No test cases to convert to Parquet")
+            return None
+        
+        names = ["section"] + list(self.TEST_CASE_FIELDS)
+        schema = pyarrow.schema([(name, pyarrow.string()) for name in names])
+        sections_digest = self._sections_digest("parquet", digest)
+        temp_path = temporary_path(parquet_path)
+        try:
+            with pyarrow.parquet.ParquetWriter(temp_path, schema) as parquet_writer:
+                while section is not None:
+                    file_name, cases = section
+                    with self.metrics.stage("write", file_name) as record:
+                        columns = [[] for _ in names]
+                        for row in self._digested_rows(sections_digest, file_name, cases):
+                            columns[0].append(file_name)
+                            for column, value in zip(columns[1:], row):
+                                column.append("" if value is None else str(value))
+                        parquet_writer.write_table(pyarrow.Table.from_arrays(
+                            [pyarrow.array(values, type=pyarrow.string()) for values in columns], schema=schema
+                        ))
+                        record["cases"] = len(cases)
+                    section = yield
+            self.publish(temp_path, parquet_path, digest if sections_digest is None else sections_digest.hexdigest())
+            
+            logger.info(f"Created Parquet file: {parquet_path}")
+            return parquet_path
+            
+        except Exception as e:
+            logger.error(f"Error creating Parquet file {parquet_path}: {str(e)}")
+            self.failed.append(parquet_path)
+            yield from _discard_sections(section)
+            return None
+        finally:
+            remove_temporary(temp_path)
+
+    @output_writer("sqlite", stream="_sqlite_stream", file_name="SQLITE_FILE_NAME", in_place=True)
+    def convert_to_sqlite(self, test_cases: Dict[str, List[Dict[str, Any]]], force: bool = False) -> Optional[str]:
+        """
+        Update a SQLite database with all test cases.
+
+        The database is updated in place, so it can collect the sections of
+        several runs: each section replaces its own rows only. Rows are keyed by
+        section and ID, and rows whose content has not changed are not written.
+
+        Args:
+            test_cases: Dictionary with test case file names as keys and lists of test case dictionaries as values.
+            force: Whether to update an existing database without asking.
+
+        Returns:
+            Path to the SQLite database, or None if it could not be updated.
+        """
+        if not test_cases:
+            logger.warning("No test cases to convert to SQLite")
+            return None
+        
+        sqlite_path = self.output_path("sqlite")
+        if self._is_kept(sqlite_path):
+            return sqlite_path
+        digest = self._single_file_digest("sqlite", sqlite_path, test_cases)
+        if digest is not None and self._is_unchanged(sqlite_path, digest):
+            return sqlite_path
+        if not self._confirm_overwrite(sqlite_path, force, in_place=True):
             return None
+        
+        path = _run_writer(self._sqlite_stream(sqlite_path, digest), test_cases.items())
+        self.save_manifest()
+        return path
+
+    def _sqlite_stream(self, sqlite_path: str, digest: Optional[str] = None
+                       ) -> Generator[None, Optional[Tuple[str, List[Dict[str, Any]]]], Optional[str]]:
+        """
+        Section writer upserting the test cases of each section into a SQLite database.
+
+        All sections are written in one transaction, which is rolled back if
+        any section fails.
+
+        Args:
+            sqlite_path: Path of the SQLite database to create or update.
+            digest: Digest of all rows, if already computed; otherwise it is
+                computed while the sections are written.
+
+        Returns:
+            Path to the SQLite database, or None if it could not be updated.
+        """
+        import sqlite3
+        
+        section = yield
+        if section is None:
+            logger.warning("No test cases to convert to SQLite")
+            return None
+        
+        statements = sqlite_statements(tuple(self.TEST_CASE_FIELDS), self.SQLITE_INDEXED_FIELDS)
+        sections_digest = self._sections_digest("sqlite", digest)
+        connection = None
+        try:
+            connection = sqlite3.connect(sqlite_path, isolation_level=None)
+            connection.execute("BEGIN")
+            for statement in statements.schema:
+                connection.execute(statement)
+            
+            changed = 0
+            while section is not None:
+                file_name, cases = section
+                changed += self._upsert_sqlite_section(connection, statements, sections_digest, file_name, cases)
+                section = yield
+            
+            with self.metrics.stage("save", sqlite_path) as record:
+                connection.execute("COMMIT")
+                record["bytes"] = os.path.getsize(sqlite_path)
+            
+        except Exception as e:
+            if connection is not None and connection.in_transaction:
+                connection.execute("ROLLBACK")
+            logger.error(f"Error updating SQLite database {sqlite_path}: {str(e)}")
+            self.failed.append(sqlite_path)
+            yield from _discard_sections(section)
+            return None
+        finally:
+            if connection is not None:
+                connection.close()
+        
+        if changed:
+            self.written.append(sqlite_path)
+            logger.info(f"Updated SQLite database: {sqlite_path} ({changed} rows changed)")
+        else:
+            self.skipped.append(sqlite_path)
+            logger.info(f"SQLite database is up to date: {sqlite_path}")
+        self._record_digest(sqlite_path, digest if sections_digest is None else sections_digest.hexdigest())
+        return sqlite_path
+
+    def _upsert_sqlite_section(self, connection, statements: SqliteStatements,
+                               sections_digest: Optional[OutputDigest], file_name: str,
+                               cases: List[Dict[str, Any]]) -> int:
+        """
+        Write the changed test cases of a section to the database and delete the ones that are gone.
+
+        Args:
+            connection: sqlite3 connection with an open transaction.
+            statements: Statements returned by :func:`sqlite_statements`.
+            sections_digest: Digest of the output to add the rows to, or None.
+            file_name: Test case file name of the section.
+            cases: Test case dictionaries of the section.
+
+        Returns:
+            Number of rows inserted, updated or deleted.
+        """
+        id_index = self.TEST_CASE_FIELDS.index("ID")
+        with self.metrics.stage("normalize", file_name) as record:
+            rows = {}
+            missing = duplicates = 0
+            for case, row in zip(cases, self._digested_rows(sections_digest, file_name, cases)):
+                if None in row:
+                    row = tuple("" if value is None else value for value in row)
+                values = tuple(map(str, row))
+                case_id = values[id_index]
+                if not case_id:
+                    missing += 1
+                    continue
+                if case_id in rows:
+                    duplicates += 1
+                extra = extra_fields(case, self.TEST_CASE_FIELDS)
+                extra = json.dumps({str(key): value for key, value in extra.items()}, ensure_ascii=False,
+                                   default=str) if extra else None
+                row_hash = hashlib.sha256("\0".join((*values, extra or "")).encode('utf-8')).hexdigest()
+                rows[case_id] = (file_name, *values, extra, row_hash)
+            record["cases"] = len(rows)
+        if missing:
+            logger.warning(f"Skipping {missing} test cases without an ID in {file_name}")
+        if duplicates:
+            logger.warning(f"{duplicates} test cases in {file_name} repeat an earlier ID; the last one is kept")
+        
+        with self.metrics.stage("write", file_name) as record:
+            stored = dict(connection.execute(statements.select, (file_name,)))
+            changed = [row for case_id, row in rows.items() if stored.get(case_id) != row[-1]]
+            stale = [(file_name, case_id) for case_id in stored if case_id not in rows]
+            connection.executemany(statements.upsert, changed)
+            connection.executemany(statements.delete, stale)
+            record["cases"] = len(changed)
+        return len(changed) + len(stale)
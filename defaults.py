@@ -0,0 +1,22 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Default settings of the commands, kept apart from the modules that use them.
+
+The CLI shows these defaults in its options, so they are defined in a module
+without dependencies that the CLI can import without loading the server,
+pipeline and watch modules.
+"""
+
+# Maximum number of parsed sections waiting to be written in pipeline mode
+DEFAULT_QUEUE_SIZE = 8
+
+# Number of threads writing CSV files
+DEFAULT_CSV_WORKERS = 4
+
+# Number of jobs converted at the same time by a server
+DEFAULT_SERVER_WORKERS = 4
+
+# Seconds between two checks of the input files in watch mode
+DEFAULT_WATCH_INTERVAL = 0.05
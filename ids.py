@@ -0,0 +1,317 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+IDs module indexing test case IDs to find duplicates, missing IDs and gaps in numbering.
+"""
+
+import os
+import re
+import json
+from collections import defaultdict
+from typing import Dict, List, Any, Collection, Iterable, NamedTuple, Optional, Tuple
+from loguru import logger
+
+from manifest import remove_temporary, temporary_path
+from records import MISSING, TEST_CASE_FIELDS, TestCaseRecord, field_plan
+
+
+# Position of the ID in the row of a compact record
+_ID_INDEX = TEST_CASE_FIELDS.index("ID")
+
+# ID made of a prefix and a trailing number, such as "TC001" or "LOGIN-12"
+_NUMBERED_ID = re.compile(r'(.*?)(\d+)$')
+
+# Numbering is only checked for gaps when at least this share of the numbers in its range is used
+_MIN_GAP_DENSITY = 0.1
+
+
+class IdError(ValueError):
+    """Raised by a strict index when a test case ID is missing or repeated."""
+
+
+class IdLocation(NamedTuple):
+    """Where a test case is defined."""
+
+    source: str
+    section: str
+    line: int
+    position: int
+
+    def __str__(self) -> str:
+        line = f":{self.line}" if self.line else ""
+        return f"{self.source}{line} ({self.section}, test case {self.position})"
+
+
+class IdGap(NamedTuple):
+    """Run of missing numbers in the IDs sharing a prefix."""
+
+    prefix: str
+    first: int
+    last: int
+    width: int
+
+    def __str__(self) -> str:
+        first = f"{self.prefix}{self.first:0{self.width}d}"
+        if self.first == self.last:
+            return first
+        return f"{first}..{self.prefix}{self.last:0{self.width}d}"
+
+
+def case_id(case: Any) -> Optional[str]:
+    """
+    Return the ID of a test case.
+
+    Args:
+        case: Test case dictionary or record; the "ID" key may have any casing.
+
+    Returns:
+        ID as a string, or None if the case has no non-empty ID.
+    """
+    if type(case) is TestCaseRecord:
+        value = case.row[_ID_INDEX]
+    elif isinstance(case, dict):
+        value = case.get("ID")
+        if value is None:
+            key = field_plan(("ID",), tuple(case))[0]
+            value = None if key is MISSING else case[key]
+    else:
+        return None
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+class IdIndex:
+    """
+    Index of the test case IDs of all parsed sections.
+
+    Sections are added as they are parsed. The first location of each ID is
+    kept in a dictionary, so each test case is checked against all earlier ones
+    in constant time, and repeated and missing IDs are collected on the way.
+    """
+
+    def __init__(self, strict: bool = False):
+        """
+        Initialize an empty index.
+
+        Args:
+            strict: Whether to raise :class:`IdError` on the first repeated or missing ID.
+        """
+        self.strict = strict
+        self.locations: Dict[str, IdLocation] = {}
+        self.duplicates: List[Tuple[str, IdLocation, IdLocation]] = []
+        self.missing: List[IdLocation] = []
+        # (source, section, line, IDs) of each section, in the order they were added
+        self._sections: List[Tuple[str, str, int, Tuple[Optional[str], ...]]] = []
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+    def add_section(self, source: str, section: str, cases: Iterable[Any], line: int = 0):
+        """
+        Add the test cases of a section.
+
+        Args:
+            source: Path of the input file.
+            section: Test case file name of the section.
+            cases: Test case dictionaries or records of the section.
+            line: Line of the section heading in the input file, or 0 if unknown.
+
+        Raises:
+            IdError: If the index is strict and a test case has no ID or repeats an earlier one.
+        """
+        self.add_ids(source, section, line, tuple(case_id(case) for case in cases))
+
+    def add_ids(self, source: str, section: str, line: int, ids: Tuple[Optional[str], ...]):
+        """
+        Add the IDs of the test cases of a section, None standing for a missing ID.
+
+        Args:
+            source: Path of the input file.
+            section: Test case file name of the section.
+            line: Line of the section heading in the input file, or 0 if unknown.
+            ids: ID of each test case of the section, in order.
+
+        Raises:
+            IdError: If the index is strict and an ID is missing or repeats an earlier one.
+        """
+        self._sections.append((source, section, line, ids))
+        for position, test_case_id in enumerate(ids, start=1):
+            location = IdLocation(source, section, line, position)
+            if test_case_id is None:
+                self.missing.append(location)
+                if self.strict:
+                    raise IdError(f"Test case without ID in {location}")
+                continue
+            first = self.locations.setdefault(test_case_id, location)
+            if first is not location:
+                self.duplicates.append((test_case_id, first, location))
+                if self.strict:
+                    raise IdError(f"Duplicate ID {test_case_id} in {location}, first defined in {first}")
+
+    def check(self):
+        """
+        Raise on the first repeated or missing ID found so far, e.g. among the sections of a loaded index.
+
+        Raises:
+            IdError: If a test case ID is missing or repeated.
+        """
+        if self.duplicates or self.missing:
+            # Adding the sections again to a strict index raises on the first problem in order
+            strict = IdIndex(strict=True)
+            for entry in self._sections:
+                strict.add_ids(*entry)
+
+    def merge(self, other: "IdIndex"):
+        """Add the sections of another index, e.g. one built in a worker process, in their order."""
+        for source, section, line, ids in other._sections:
+            self.add_ids(source, section, line, ids)
+
+    def forget_sources(self, sources: Dict[str, Collection[str]]):
+        """
+        Remove the sections of input files that are about to be parsed again.
+
+        Args:
+            sources: Input file paths, each with the names of its sections to
+                keep because they are not parsed again.
+
+        Raises:
+            IdError: If the index is strict and the remaining sections have a missing or repeated ID.
+        """
+        sections = [
+            entry for entry in self._sections
+            if entry[0] not in sources or entry[1] in sources[entry[0]]
+        ]
+        self.locations = {}
+        self.duplicates = []
+        self.missing = []
+        self._sections = []
+        strict, self.strict = self.strict, False
+        for entry in sections:
+            self.add_ids(*entry)
+        self.strict = strict
+        if strict:
+            self.check()
+
+    def gaps(self) -> List[IdGap]:
+        """
+        Find the numbers missing from the numbering of the IDs sharing a prefix.
+
+        IDs are grouped by the text before their trailing number. Each group is
+        checked in time linear in its number of IDs plus the size of its
+        range; groups that use less than a tenth of the numbers in their range
+        are numbered sparsely on purpose and are not checked.
+
+        Returns:
+            Runs of missing numbers, by prefix in order of first appearance.
+        """
+        groups = defaultdict(list)
+        widths = {}
+        for test_case_id in self.locations:
+            match = _NUMBERED_ID.match(test_case_id)
+            if match:
+                prefix, digits = match.groups()
+                groups[prefix].append(int(digits))
+                widths.setdefault(prefix, len(digits))
+                
+        gaps = []
+        for prefix, numbers in groups.items():
+            low, high = min(numbers), max(numbers)
+            if len(numbers) < (high - low + 1) * _MIN_GAP_DENSITY:
+                logger.debug(f"IDs starting with {prefix!r} are numbered sparsely; not checking for gaps")
+                continue
+            present = bytearray(high - low + 1)
+            for number in numbers:
+                present[number - low] = 1
+            start = None
+            for offset, used in enumerate(present):
+                if not used and start is None:
+                    start = offset
+                elif used and start is not None:
+                    gaps.append(IdGap(prefix, low + start, low + offset - 1, widths[prefix]))
+                    start = None
+        return gaps
+
+    def report(self, limit: int = 10) -> Tuple[int, int, int]:
+        """
+        Log the repeated and missing IDs and the gaps in numbering.
+
+        Args:
+            limit: Maximum number of messages logged per kind of problem.
+
+        Returns:
+            Number of repeated IDs, missing IDs and gaps.
+        """
+        gaps = self.gaps()
+        for test_case_id, first, location in self.duplicates[:limit]:
+            logger.warning(f"Duplicate ID {test_case_id} in {location}, first defined in {first}")
+        for location in self.missing[:limit]:
+            logger.warning(f"Test case without ID in {location}")
+        for gap in gaps[:limit]:
+            logger.info(f"Gap in ID numbering: {gap} not defined")
+        for kind, items in (("duplicate IDs", self.duplicates), ("test cases without ID", self.missing),
+                            ("gaps in ID numbering", gaps)):
+            if len(items) > limit:
+                logger.warning(f"... {len(items) - limit} more {kind}")
+        return len(self.duplicates), len(self.missing), len(gaps)
+
+    def save(self, path: str):
+        """
+        Write the index to a JSON file, so that a later run can check new files against it.
+
+        Args:
+            path: Path of the index file.
+        """
+        data = json.dumps({"sections": self._sections}, ensure_ascii=False)
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = temporary_path(path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except OSError as e:
+            logger.warning(f"Could not write ID index {path}: {str(e)}")
+        finally:
+            remove_temporary(temp_path)
+
+    @classmethod
+    def load(cls, path: str, strict: bool = False,
+             forget: Optional[Dict[str, Collection[str]]] = None) -> "IdIndex":
+        """
+        Read an index written by :meth:`save`.
+
+        Args:
+            path: Path of the index file. A missing or unreadable file gives an empty index.
+            strict: Whether the index raises on problems in the loaded sections
+                and in sections added later.
+            forget: Sections of input files that are about to be parsed again,
+                removed before the loaded sections are checked, see
+                :meth:`forget_sources`.
+
+        Returns:
+            Loaded index.
+
+        Raises:
+            IdError: If the index is strict and the loaded sections have a missing or repeated ID.
+        """
+        index = cls()
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                sections = json.load(f)["sections"]
+            for source, section, line, ids in sections:
+                index.add_ids(source, section, line, tuple(ids))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable ID index {path}: {str(e)}")
+            index = cls()
+        index.strict = strict
+        if forget is not None:
+            index.forget_sources(forget)
+        elif strict:
+            index.check()
+        return index
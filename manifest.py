@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Manifest module recording the digests of written output files.
+"""
+
+import os
+import json
+import uuid
+import threading
+from typing import Optional
+from loguru import logger
+
+from version import __version__
+
+
+def temporary_path(output_path: str) -> str:
+    """
+    Return an unused path for a temporary file next to an output file.
+
+    Writing to this path and renaming it over the output file with
+    :func:`os.replace` replaces the output atomically, since both are on the
+    same file system.
+
+    Args:
+        output_path: Path of the output file.
+
+    Returns:
+        Path of a hidden temporary file in the same directory.
+    """
+    directory, name = os.path.split(output_path)
+    return os.path.join(directory, f".{name}.{uuid.uuid4().hex[:12]}.tmp")
+
+
+def remove_temporary(temp_path: str):
+    """Remove a temporary file if it was not moved into place."""
+    try:
+        os.unlink(temp_path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.debug(f"Could not remove temporary file {temp_path}: {str(e)}")
+
+
+class OutputManifest:
+    """Digests of the normalized rows of each output file in an output directory."""
+
+    # Name of the manifest file inside the output directory
+    FILE_NAME = ".mdtc-manifest.json"
+
+    def __init__(self, output_dir: str):
+        """
+        Initialize the manifest and load the digests recorded by earlier runs.
+
+        Digests recorded by another version of the tool are ignored, since the
+        same rows may be written differently.
+
+        Args:
+            output_dir: Directory holding the output files and the manifest.
+        """
+        self.output_dir = output_dir
+        self.path = os.path.join(output_dir, self.FILE_NAME)
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._outputs = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get("version") == __version__:
+                self._outputs = data.get("outputs") or {}
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable manifest {self.path}: {str(e)}")
+
+    def _key(self, output_path: str) -> str:
+        """Return the manifest key of an output file: its path relative to the output directory."""
+        return os.path.relpath(output_path, self.output_dir).replace(os.sep, "/")
+
+    def is_unchanged(self, output_path: str, digest: str) -> bool:
+        """
+        Check whether an output file already holds content with the given digest.
+
+        Args:
+            output_path: Path of the output file.
+            digest: Digest of the content that would be written.
+
+        Returns:
+            True if the file exists, was last written with this digest and has
+            not changed size since.
+        """
+        record = self._outputs.get(self._key(output_path))
+        if record is None or record.get("digest") != digest:
+            return False
+        try:
+            return os.path.getsize(output_path) == record.get("size")
+        except OSError:
+            return False
+
+    def source_digest(self, output_path: str) -> Optional[str]:
+        """
+        Return the digest of the input sections an output file was last written from.
+
+        Args:
+            output_path: Path of the output file.
+
+        Returns:
+            Digest recorded with the output, or None if there is none or the
+            file has changed size since.
+        """
+        record = self._outputs.get(self._key(output_path))
+        if record is None or record.get("source") is None:
+            return None
+        try:
+            if os.path.getsize(output_path) != record.get("size"):
+                return None
+        except OSError:
+            return None
+        return record["source"]
+
+    def record(self, output_path: str, digest: str, source: Optional[str] = None):
+        """
+        Record the digest of an output file that has just been written.
+
+        Call :meth:`save` to persist the recorded digests.
+
+        Args:
+            output_path: Path of the output file.
+            digest: Digest of the written content.
+            source: Digest of the input sections the content was converted
+                from, see :func:`overwrite.plan_overwrites`.
+        """
+        record = {"digest": digest, "size": os.path.getsize(output_path)}
+        if source is not None:
+            record["source"] = source
+        with self._lock:
+            self._outputs[self._key(output_path)] = record
+            self._dirty = True
+
+    def forget(self, output_path: str):
+        """Drop the digest of an output file that was written without one."""
+        with self._lock:
+            if self._outputs.pop(self._key(output_path), None) is not None:
+                self._dirty = True
+
+    def save(self):
+        """Persist the recorded digests if they changed."""
+        with self._lock:
+            if not self._dirty:
+                return
+            data = json.dumps({"version": __version__, "outputs": self._outputs}, indent=1, sort_keys=True)
+            self._dirty = False
+            
+        temp_path = temporary_path(self.path)
+        try:
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                f.write(data)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write manifest {self.path}: {str(e)}")
+        finally:
+            remove_temporary(temp_path)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Metrics module for timing the stages of a conversion run and profiling it.
+"""
+
+import os
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Any, Iterable, Iterator, Optional
+
+
+# Stages of a run, in pipeline order
+STAGES = ("read", "scan", "yaml", "normalize", "write", "save")
+
+# Accepted values for the --profile option
+PROFILERS = ("cpu", "memory")
+
+
+class Metrics:
+    """Collector of per-stage timings, test case counts and byte counts."""
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the collector.
+
+        Args:
+            enabled: Whether to record anything. A disabled collector can be
+                passed around instead of None and costs almost nothing.
+        """
+        self.enabled = enabled
+        self.records = []
+
+    @contextmanager
+    def stage(self, stage: str, target: str = "", size: int = 0) -> Iterator[Dict[str, Any]]:
+        """
+        Time a stage of the run.
+
+        Args:
+            stage: Name of the stage, see ``STAGES``.
+            target: Section name or output file the stage worked on.
+            size: Number of bytes or characters processed.
+
+        Yields:
+            Record of the stage. Set its "cases" key to the number of test
+            cases processed, or update "bytes" once the size is known.
+        """
+        record = {"stage": stage, "target": target, "seconds": 0.0, "cases": 0, "bytes": size}
+        if not self.enabled:
+            yield record
+            return
+            
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            self.records.append(record)
+
+    def timed_iter(self, stage: str, target: str, iterable: Iterable[Any], size: int = 0) -> Iterator[Any]:
+        """
+        Yield the items of an iterable, adding the time spent producing them to one record.
+
+        Args:
+            stage: Name of the stage, see ``STAGES``.
+            target: Section name or file the iterable works on.
+            iterable: Lazy iterable, such as a section scanner.
+            size: Number of bytes or characters the iterable processes.
+
+        Yields:
+            The items of the iterable.
+        """
+        if not self.enabled:
+            yield from iterable
+            return
+            
+        record = {"stage": stage, "target": target, "seconds": 0.0, "cases": 0, "bytes": size}
+        self.records.append(record)
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                record["seconds"] += time.perf_counter() - start
+                return
+            record["seconds"] += time.perf_counter() - start
+            yield item
+
+    def extend(self, records: List[Dict[str, Any]]):
+        """Add records collected by another collector, e.g. in a worker process."""
+        if self.enabled:
+            self.records.extend(records)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Sum the records of each stage.
+
+        Returns:
+            Dictionary mapping each recorded stage, in pipeline order, to its
+            total seconds, number of records, test cases, bytes and rates.
+        """
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record["stage"], {"seconds": 0.0, "count": 0, "cases": 0, "bytes": 0})
+            total["seconds"] += record["seconds"]
+            total["count"] += 1
+            total["cases"] += record["cases"]
+            total["bytes"] += record["bytes"]
+            
+        order = {stage: index for index, stage in enumerate(STAGES)}
+        summary = {}
+        for stage in sorted(totals, key=lambda name: order.get(name, len(order))):
+            total = totals[stage]
+            seconds = total["seconds"]
+            total["cases_per_sec"] = total["cases"] / seconds if seconds else 0.0
+            total["bytes_per_sec"] = total["bytes"] / seconds if seconds else 0.0
+            summary[stage] = total
+        return summary
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the stage summary and the individual records, ready to be written as JSON."""
+        return {"stages": self.summary(), "records": self.records}
+
+    def format_table(self) -> str:
+        """
+        Format the stage summary as a table.
+
+        Returns:
+            Table with one line per stage and a total line.
+        """
+        summary = self.summary()
+        lines = [f"{'stage':<10} {'seconds':>9} {'count':>7} {'cases':>9} {'cases/s':>11} {'MB':>9} {'MB/s':>9}"]
+        for stage, total in summary.items():
+            lines.append(
+                f"{stage:<10} {total['seconds']:>9.3f} {total['count']:>7} {total['cases']:>9} "
+                f"{total['cases_per_sec']:>11.0f} {total['bytes'] / 1e6:>9.2f} {total['bytes_per_sec'] / 1e6:>9.2f}"
+            )
+        lines.append(f"{'total':<10} {sum(total['seconds'] for total in summary.values()):>9.3f}")
+        return "\n".join(lines)
+
+
+# Shared collector used when no metrics are requested
+DISABLED = Metrics(enabled=False)
+
+
+@contextmanager
+def profiled(profiler: Optional[str], output_dir: str) -> Iterator[Optional[str]]:
+    """
+    Profile the enclosed block with cProfile or tracemalloc and save the statistics.
+
+    Args:
+        profiler: "cpu" for cProfile, "memory" for tracemalloc, or None to not profile.
+        output_dir: Directory where the statistics are written.
+
+    Yields:
+        Path of the file the statistics will be written to, or None if not profiling.
+
+    Raises:
+        ValueError: If the profiler is unknown.
+    """
+    if profiler is None:
+        yield None
+        return
+    if profiler not in PROFILERS:
+        raise ValueError(f"Unknown profiler: {profiler}. Use one of: {', '.join(PROFILERS)}")
+        
+    os.makedirs(output_dir, exist_ok=True)
+    if profiler == "cpu":
+        import cProfile
+        
+        stats_path = os.path.join(output_dir, "profile.pstats")
+        profile = cProfile.Profile()
+        profile.enable()
+        try:
+            yield stats_path
+        finally:
+            profile.disable()
+            profile.dump_stats(stats_path)
+        return
+        
+    import tracemalloc
+    
+    stats_path = os.path.join(output_dir, "profile_memory.txt")
+    tracemalloc.start()
+    try:
+        yield stats_path
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        with open(stats_path, 'w', encoding='utf-8') as f:
+            f.write(f"Current: {current / 2**20:.1f} MiB, peak: {peak / 2**20:.1f} MiB\n\n")
+            for statistic in snapshot.statistics("lineno")[:50]:
+                f.write(f"{statistic}\n")
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Overwrite module deciding which existing output files are written before a conversion starts.
+"""
+
+import os
+import re
+import hashlib
+from collections import Counter
+from pathlib import Path
+from typing import Dict, List, Callable, Collection, FrozenSet, Iterable, NamedTuple, Optional, Sequence, Tuple
+from loguru import logger
+
+from batch import YAML_EXTENSIONS, suffixed_name
+from manifest import OutputManifest
+from parser import scan_sections
+
+
+# How existing output files are handled
+OVERWRITE_POLICIES = ("ask", "always", "never", "if-newer", "if-changed")
+
+# Top-level key of a YAML mapping: a quoted or plain scalar at the start of a line, followed by a colon
+_YAML_TOP_LEVEL_KEY = re.compile(r'''(?:"([^"]*)"|'([^']*)'|([^\s#\-'"{}\[\]&*!|>%@`][^#]*?))\s*:(?:\s|$)''')
+
+
+class OverwritePlan(NamedTuple):
+    """
+    Decisions taken for the outputs of a conversion before it starts.
+
+    ``decisions`` maps each output path to whether it is written, ``sources``
+    maps it to the digest of the input sections it is converted from, and
+    ``skip_sections`` maps each input file to the names of the sections that
+    no written output needs, so they do not have to be parsed.
+    """
+
+    decisions: Dict[str, bool]
+    sources: Dict[str, str]
+    skip_sections: Dict[str, FrozenSet[str]]
+
+    @property
+    def kept(self) -> List[str]:
+        """Paths of the existing outputs that are left as they are."""
+        return [path for path, write in self.decisions.items() if not write]
+
+
+def overwrite_question(in_place: bool = False) -> str:
+    """Return the question asked about an existing output, which is updated in place or replaced."""
+    return "Update it in place?" if in_place else "Overwrite?"
+
+
+def _digest(parts: Iterable[str]) -> str:
+    """Return the SHA-256 hex digest of a sequence of strings."""
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(part.encode("utf-8"))
+        hasher.update(b"\0")
+    return hasher.hexdigest()
+
+
+def scan_input_sections(file_path: str) -> List[Tuple[str, str]]:
+    """
+    Find the section names of an input file and a digest of each section body, without loading any YAML.
+
+    The sections of a markdown file are found with :func:`parser.scan_sections`.
+    The sections of a YAML file are its top-level keys; since the file is not
+    split, each of them gets the digest of the whole file.
+
+    Args:
+        file_path: Path of a markdown or YAML input file.
+
+    Returns:
+        List of (section name, body digest) tuples in file order.
+
+    Raises:
+        OSError: If the file cannot be read.
+        UnicodeDecodeError: If the file is not valid UTF-8.
+    """
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if Path(file_path).suffix.lower() not in YAML_EXTENSIONS:
+            return [(section.name, _digest([section.content])) for section in scan_sections(f)]
+        content = f.read()
+        
+    digest = _digest([content])
+    sections = []
+    for line in content.splitlines():
+        match = _YAML_TOP_LEVEL_KEY.match(line)
+        if match:
+            name = next(group for group in match.groups() if group is not None)
+            sections.append((name.strip(), digest))
+    return sections
+
+
+def plan_overwrites(file_paths: Sequence[str], output_path: Callable[..., str], formats: Sequence[str],
+                    policy: str = "ask", manifest: Optional[OutputManifest] = None, on_conflict: str = "error",
+                    prompt: Callable[[str], str] = input, in_place: Collection[str] = ()) -> OverwritePlan:
+    """
+    Decide for every output of a conversion whether it is written, before any input is parsed.
+
+    The input files are only scanned for their section names and bodies, so
+    the outputs can be named as the converter will name them. Missing outputs
+    are always written. Except under "always", existing outputs that the
+    manifest records as written from input sections with the same names and
+    bodies would be written with the same rows, so they are kept without
+    asking. For the other existing outputs, the policy decides:
+
+    - "ask": Ask for each file, all questions coming before any work starts.
+    - "always": Overwrite the file, even if its input sections are unchanged.
+    - "if-changed": Overwrite the file.
+    - "never": Keep the file.
+    - "if-newer": Overwrite the file if one of its input files was modified after it.
+
+    Args:
+        file_paths: Paths of the input files.
+        output_path: Function returning the path of an output file from a
+            format name and, for CSV files, a section name, such as
+            :meth:`TestCaseConverter.output_path`.
+        formats: Names of the output formats.
+        policy: How existing outputs are handled, see ``OVERWRITE_POLICIES``.
+        manifest: Manifest of the output directory, holding the source digests
+            of earlier runs. Without it, "if-changed" overwrites every output.
+        on_conflict: Conflict policy for section names defined in several
+            files, see :func:`batch.merge_results`.
+        prompt: Function asking a question and returning the answer.
+        in_place: Names of the formats whose outputs are updated in place
+            rather than replaced, such as SQLite databases.
+
+    Returns:
+        Decision and source digest of each output, and the sections that do not need to be parsed.
+
+    Raises:
+        ValueError: If the policy is unknown.
+    """
+    if policy not in OVERWRITE_POLICIES:
+        raise ValueError(f"Unknown overwrite policy: {policy}. Use one of: {', '.join(OVERWRITE_POLICIES)}")
+        
+    # Group the sections of all files by output section name, as batch.merge_results does
+    merged = {}
+    for file_path in file_paths:
+        try:
+            # A later section with the same name replaces an earlier one, as in TestCaseParser.parse_file
+            sections = dict(scan_input_sections(file_path))
+        except (OSError, UnicodeDecodeError) as e:
+            logger.debug(f"Could not scan {file_path}: {str(e)}")
+            continue
+        for name, digest in sections.items():
+            merged_name = name
+            if name in merged and on_conflict == "suffix":
+                merged_name = suffixed_name(name, merged)
+            merged.setdefault(merged_name, []).append((file_path, name, digest))
+            
+    outputs = {}
+    if "csv" in formats:
+        for merged_name, parts in merged.items():
+            outputs.setdefault(output_path("csv", merged_name), []).extend(
+                (merged_name, file_path, name, digest) for file_path, name, digest in parts
+            )
+    all_parts = [(merged_name, *part) for merged_name, parts in merged.items() for part in parts]
+    updated = set()
+    for format_name in dict.fromkeys(formats):
+        if format_name != "csv":
+            outputs[output_path(format_name)] = all_parts
+            if format_name in in_place:
+                updated.add(output_path(format_name))
+            
+    sources = {
+        path: _digest(text for merged_name, _, _, digest in parts for text in (merged_name, digest))
+        for path, parts in outputs.items()
+    }
+    
+    decisions = {}
+    answer_all = None
+    for path, parts in outputs.items():
+        if not os.path.exists(path):
+            decisions[path] = True
+            continue
+        if policy != "always" and manifest is not None and manifest.source_digest(path) == sources[path]:
+            logger.info(f"Output is unchanged: {path}")
+            decisions[path] = False
+            continue
+            
+        if policy in ("always", "if-changed"):
+            write = True
+        elif policy == "never":
+            write = False
+        elif policy == "if-newer":
+            output_mtime = os.path.getmtime(path)
+            write = any(os.path.getmtime(file_path) > output_mtime for file_path in {part[1] for part in parts})
+        elif answer_all is not None:
+            write = answer_all
+        else:
+            question = overwrite_question(path in updated)
+            response = prompt(f"File {path} already exists. {question} (y/n/all/none): ").strip().lower()
+            if response in ("all", "none"):
+                answer_all = response == "all"
+            write = response in ("y", "all")
+        decisions[path] = write
+        if not write:
+            logger.info(f"Keeping existing file: {path}")
+            
+    # A section is not parsed when all its outputs are kept, unless its name
+    # is repeated, since that would change how the other sections are named
+    needed = {(part[1], part[2]) for path, parts in outputs.items() if decisions[path] for part in parts}
+    repeated = Counter(name for _, _, name, _ in all_parts)
+    skip_sections = {}
+    for _, file_path, name, _ in all_parts:
+        if (file_path, name) not in needed and repeated[name] == 1:
+            skip_sections.setdefault(file_path, set()).add(name)
+            
+    return OverwritePlan(
+        decisions=decisions,
+        sources=sources,
+        skip_sections={file_path: frozenset(names) for file_path, names in skip_sections.items()},
+    )
@@ -5,27 +5,554 @@
 Parser module for extracting test cases from markdown files.
 """
 
+import io
 import re
 import os
+import mmap
+from functools import lru_cache
+from itertools import repeat
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional, Any
-import yaml
+from typing import Dict, List, Tuple, Optional, Any, Collection, FrozenSet, Iterable, Iterator, NamedTuple
 from loguru import logger
-from markdown_it import MarkdownIt
+
+from cache import SectionCache
+from ids import IdError, IdIndex
+from metrics import DISABLED, Metrics
+from records import MISSING, compact_cases
+
+
+# Accepted values for the YAML backend option
+YAML_BACKENDS = ("auto", "c", "python")
+
+# "### TestCases (file_name)" heading that starts a section
+_SECTION_HEADER = re.compile(r' {0,3}### TestCases\s+\(([^)]+)\)(.*)')
+
+# ATX heading of level 1 to 3, which ends the current section
+_SECTION_END = re.compile(r' {0,3}#{1,3}(?:[ \t]|$)')
+
+# Opening or closing line of a fenced code block
+_CODE_FENCE = re.compile(r' {0,3}(`{3,}|~{3,})(.*)')
+
+# First characters of lines that may be a heading or a code fence
+_MARKER_CHARS = frozenset('#`~')
+
+# Lines that may be a heading or a code fence, found in the raw bytes of a file
+_MARKER_LINE = re.compile(rb'^ {0,3}[#`~][^\n]*', re.MULTILINE)
+
+# Bytes scanned at a time when counting line breaks in a mapped file
+_COUNT_CHUNK = 1024 * 1024
+
+# "Key: value" line of a flat test case mapping, with a plain key
+_FLAT_KEY = re.compile(r'([^\s\-?:,\[\]{}#&*!|>\'"%@`][^:#]*?) *:(?: +(.*))?$')
+
+# Header of a literal or folded block scalar without an indentation indicator
+_BLOCK_HEADER = re.compile(r'([|>])([+-]?)')
+
+# Quoted scalars without escape sequences
+_DOUBLE_QUOTED = re.compile(r'"([^"\\]*)"')
+_SINGLE_QUOTED = re.compile(r"'((?:[^']|'')*)'")
+
+# Characters that cannot start a plain scalar
+_FLAT_INDICATORS = frozenset('-?:,[]{}#&*!%@`')
+
+# Tabs, carriage returns, non-printable characters and line breaks other than
+# "\n", all of which are left to the YAML loader
+_FLAT_UNSAFE = re.compile('[\t\r\x00-\x08\x0b\x0c\x0e-\x1f\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff]')
+
+# Tags of the plain scalars constructed by the flat parser
+_STR_TAG = 'tag:yaml.org,2002:str'
+_FLAT_TAGS = frozenset(f'tag:yaml.org,2002:{name}' for name in ('null', 'bool', 'int', 'float', 'timestamp'))
+
+
+def select_yaml_loader(backend: str = "auto") -> Tuple[type, str]:
+    """
+    Select the PyYAML safe loader class for a backend.
+
+    Args:
+        backend: "c" for the libyaml based loader, "python" for the pure Python
+            loader, or "auto" to use libyaml when PyYAML was built with it.
+
+    Returns:
+        Tuple of the loader class and the name of the selected backend ("c" or "python").
+
+    Raises:
+        ValueError: If the backend is unknown, or "c" is requested but libyaml is not available.
+    """
+    # PyYAML is imported on first use so that commands without YAML input start faster
+    import yaml
+    
+    if backend not in YAML_BACKENDS:
+        raise ValueError(f"Unknown YAML backend: {backend}. Use one of: {', '.join(YAML_BACKENDS)}")
+    
+    c_loader = getattr(yaml, "CSafeLoader", None)
+    if backend in ("auto", "c") and c_loader is not None:
+        return c_loader, "c"
+    if backend == "c":
+        raise ValueError("YAML backend 'c' is not available: PyYAML was built without libyaml")
+    return yaml.SafeLoader, "python"
+
+
+class TestCaseSection(NamedTuple):
+    """A "### TestCases (file_name)" section found in a markdown document."""
+
+    name: str
+    content: str
+    start_line: int
+    end_line: int
+
+
+def _scan_marker(text: str, fence: Optional[str]) -> Tuple[Optional[str], bool]:
+    """
+    Interpret a line that may be a heading or a code fence.
+
+    Args:
+        text: Line without its line ending.
+        fence: Opening fence of the code block the line is in, or None.
+
+    Returns:
+        Tuple of the opening fence of the code block after the line, or None,
+        and whether the line is a heading that ends the current section.
+    """
+    fence_match = _CODE_FENCE.match(text)
+    if fence is not None:
+        # Inside a code block only the matching closing fence is special
+        if (fence_match and fence_match.group(1)[0] == fence[0]
+                and len(fence_match.group(1)) >= len(fence) and not fence_match.group(2).strip()):
+            return None, False
+        return fence, False
+    if fence_match and not (fence_match.group(1)[0] == '`' and '`' in fence_match.group(2)):
+        return fence_match.group(1), False
+    return None, bool(_SECTION_END.match(text))
+
+
+def scan_sections(lines: Iterable[str]) -> Iterator[TestCaseSection]:
+    """
+    Find test case sections in markdown lines in a single pass.
+
+    A section starts at a "### TestCases (file_name)" heading and ends before
+    the next ATX heading of level 3 or lower. Headings inside fenced code
+    blocks, or indented by four or more spaces (such as lines of a YAML block
+    scalar), do not start or end a section.
+
+    Args:
+        lines: Lines of the markdown document, with or without line endings.
+
+    Yields:
+        Sections in document order, with 1-based start and end line numbers.
+    """
+    name = None
+    body = []
+    start_line = 0
+    fence = None
+    line_no = 0
+    
+    for line_no, line in enumerate(lines, start=1):
+        first = line[:1]
+        if first == ' ':
+            first = line[:4].lstrip(' ')[:1]
+        if first not in _MARKER_CHARS:
+            if name is not None:
+                body.append(line)
+            continue
+        
+        text = line.rstrip('\r\n')
+        fence, heading = _scan_marker(text, fence)
+        if heading:
+            if name is not None:
+                yield TestCaseSection(name, ''.join(body).strip(), start_line, line_no - 1)
+                name = None
+            
+            header_match = _SECTION_HEADER.match(text)
+            if header_match:
+                name = header_match.group(1).strip()
+                body = [header_match.group(2) + '\n']
+                start_line = line_no
+            continue
+        
+        if name is not None:
+            body.append(line)
+    
+    if name is not None:
+        yield TestCaseSection(name, ''.join(body).strip(), start_line, line_no)
+
+
+def _count_newlines(buffer, start: int, end: int) -> int:
+    """Count the line breaks in a slice of a mapped file without copying all of it at once."""
+    count = 0
+    for offset in range(start, end, _COUNT_CHUNK):
+        count += buffer[offset:min(offset + _COUNT_CHUNK, end)].count(b'\n')
+    return count
+
+
+def scan_mapped_sections(buffer) -> Iterator[TestCaseSection]:
+    """
+    Find test case sections in the raw bytes of a UTF-8 markdown document.
+
+    Behaves like :func:`scan_sections`, but lines that may be headings or code
+    fences are found with a regular expression search over the bytes, and
+    only those lines and the section bodies are decoded. This lets a
+    memory-mapped file be scanned without reading it into a string.
+
+    Args:
+        buffer: Bytes-like object, such as an ``mmap.mmap`` of the file.
+
+    Yields:
+        Sections in document order, with 1-based start and end line numbers.
+    """
+    name = None
+    remainder = ''
+    body_start = 0
+    start_line = 0
+    fence = None
+    line_no = 1
+    counted = 0
+    
+    for match in _MARKER_LINE.finditer(buffer):
+        line_no += _count_newlines(buffer, counted, match.start())
+        counted = match.start()
+        
+        text = match.group().decode('utf-8', errors='replace').rstrip('\r')
+        fence, heading = _scan_marker(text, fence)
+        if not heading:
+            continue
+        
+        if name is not None:
+            yield _mapped_section(buffer, name, remainder, body_start, match.start(), start_line, line_no - 1)
+            name = None
+        
+        header_match = _SECTION_HEADER.match(text)
+        if header_match:
+            name = header_match.group(1).strip()
+            remainder = header_match.group(2)
+            body_start = match.end() + 1
+            start_line = line_no
+    
+    if name is not None:
+        end_line = line_no + _count_newlines(buffer, counted, len(buffer))
+        if buffer[-1:] == b'\n':
+            end_line -= 1
+        yield _mapped_section(buffer, name, remainder, body_start, len(buffer), start_line, end_line)
+
+
+def _mapped_section(buffer, name: str, remainder: str, body_start: int, body_end: int,
+                    start_line: int, end_line: int) -> TestCaseSection:
+    """Decode the body of a section found by :func:`scan_mapped_sections`."""
+    body = buffer[body_start:body_end].decode('utf-8')
+    if '\r' in body:
+        # Match the universal newline translation of text mode files
+        body = body.replace('\r\n', '\n').replace('\r', '\n')
+    return TestCaseSection(name, (remainder + '\n' + body).strip(), start_line, end_line)
+
+
+@lru_cache(maxsize=None)
+def _scalar_resolver() -> Tuple[Any, Any, FrozenSet[str]]:
+    """
+    Return the PyYAML resolver and constructor of plain scalars, created on first use.
+
+    Returns:
+        Tuple of the resolver, the safe constructor and the first characters
+        of the plain scalars that may resolve to something other than a string.
+    """
+    import yaml
+    
+    resolver = yaml.resolver.Resolver()
+    first_chars = frozenset(key for key in resolver.yaml_implicit_resolvers if key is not None)
+    return resolver, yaml.constructor.SafeConstructor(), first_chars
+
+
+def _plain_scalar(text: str) -> Any:
+    """
+    Resolve a plain scalar as ``yaml.safe_load`` does.
+
+    Args:
+        text: Scalar without surrounding whitespace.
+
+    Returns:
+        String, number, boolean, None, date or datetime, or ``MISSING`` if the
+        scalar resolves to a tag the flat parser does not construct.
+    """
+    resolver, constructor, first_chars = _scalar_resolver()
+    if text[0] not in first_chars:
+        return text
+    import yaml
+    
+    tag = resolver.resolve(yaml.ScalarNode, text, (True, False))
+    if tag == _STR_TAG:
+        return text
+    if tag not in _FLAT_TAGS:
+        return MISSING
+    return constructor.yaml_constructors[tag](constructor, yaml.ScalarNode(tag, text))
+
+
+def _flat_value(text: str) -> Any:
+    """
+    Read the value of a ``Key: value`` line that is not a block scalar.
+
+    Args:
+        text: Value without surrounding whitespace, not empty.
+
+    Returns:
+        Value, or ``MISSING`` if the flat parser does not handle it.
+    """
+    first = text[0]
+    if first == '"':
+        match = _DOUBLE_QUOTED.fullmatch(text)
+        return match.group(1) if match else MISSING
+    if first == "'":
+        match = _SINGLE_QUOTED.fullmatch(text)
+        return match.group(1).replace("''", "'") if match else MISSING
+    if first in _FLAT_INDICATORS and (first not in '-?:' or len(text) == 1 or text[1] == ' '):
+        return MISSING
+    if ' #' in text or ': ' in text or text[-1] == ':':
+        return MISSING
+    return _plain_scalar(text)
+
+
+def _block_scalar(style: str, chomping: str, lines: List[str], indent: int, line_break: bool) -> Any:
+    """
+    Build the value of a literal or folded block scalar.
+
+    Args:
+        style: "|" for a literal or ">" for a folded scalar.
+        chomping: "", "-" or "+".
+        lines: Lines of the scalar, including the empty lines that follow its last content line.
+        indent: Indentation of the content lines.
+        line_break: Whether the last content line ends with a line break.
+
+    Returns:
+        Value, or ``MISSING`` if the flat parser does not handle it.
+    """
+    body = [line[indent:] for line in lines]
+    last = len(body)
+    while not body[last - 1]:
+        last -= 1
+    trailing = len(body) - last
+    body = body[:last]
+    
+    if style == '|':
+        text = '\n'.join(body)
+    else:
+        # More-indented lines of a folded scalar are not folded
+        if any(line[:1] == ' ' for line in body):
+            return MISSING
+        parts = [body[0]]
+        breaks = 0
+        for line in body[1:]:
+            if not line:
+                breaks += 1
+                continue
+            parts.append('\n' * breaks if breaks else ' ')
+            parts.append(line)
+            breaks = 0
+        text = ''.join(parts)
+    
+    if not line_break or chomping == '-':
+        return text
+    if chomping == '+':
+        return text + '\n' * (trailing + 1)
+    return text + '\n'
+
+
+def parse_flat_yaml(content: str) -> Optional[List[Dict[Any, Any]]]:
+    """
+    Parse the YAML of a section written as a flat list of test case mappings.
+
+    Handles the shape of almost every section: ``- Key: value`` items
+    followed by ``Key: value`` lines, whose values are plain or single-line
+    quoted scalars, or literal and folded block scalars. Scalars are resolved
+    as ``yaml.safe_load`` resolves them, so the result is the same as its
+    result. Anything else, such as anchors, tags, flow collections, nested
+    mappings, tabs or uneven indentation, is left to the YAML loader.
+
+    Args:
+        content: YAML content of the section.
+
+    Returns:
+        List of test case dictionaries, or None if the content is not a flat
+        list of test cases that this parser understands.
+    """
+    if not content or _FLAT_UNSAFE.search(content):
+        return None
+    lines = content.split('\n')
+    count = len(lines)
+    cases = []
+    case = None
+    keys = {}
+    item_indent = key_indent = -1
+    index = 0
+    
+    while index < count:
+        line = lines[index]
+        index += 1
+        stripped = line.lstrip(' ')
+        if not stripped or stripped[0] == '#':
+            continue
+        indent = len(line) - len(stripped)
+        if stripped[:2] == '- ':
+            if item_indent < 0:
+                item_indent = indent
+            elif indent != item_indent:
+                return None
+            text = stripped[2:].lstrip(' ')
+            key_indent = len(line) - len(text)
+            case = {}
+            cases.append(case)
+        elif indent == key_indent:
+            text = stripped
+        else:
+            return None
+        
+        match = _FLAT_KEY.match(text)
+        if not match:
+            return None
+        key = match.group(1)
+        if key not in keys:
+            keys[key] = _plain_scalar(key)
+        key = keys[key]
+        value = match.group(2)
+        value = value.rstrip(' ') if value else ''
+        
+        if not value:
+            # An empty value is null, unless a nested node follows
+            while index < count and (not lines[index].strip(' ') or lines[index].lstrip(' ')[0] == '#'):
+                index += 1
+            if index < count:
+                following = lines[index]
+                following_indent = len(following) - len(following.lstrip(' '))
+                if following_indent > key_indent or (following_indent == key_indent and following.lstrip(' ')[0] == '-'):
+                    return None
+            value = None
+        elif value[0] in '|>':
+            header = _BLOCK_HEADER.fullmatch(value)
+            if not header:
+                return None
+            start = index
+            block_indent = -1
+            while index < count:
+                block_line = lines[index]
+                block_stripped = block_line.lstrip(' ')
+                if not block_stripped:
+                    # Leading empty lines and lines of extra spaces are left to the YAML loader
+                    if block_indent < 0 or len(block_line) > block_indent:
+                        return None
+                    index += 1
+                    continue
+                line_indent = len(block_line) - len(block_stripped)
+                if block_indent < 0:
+                    if line_indent <= key_indent:
+                        return None
+                    block_indent = line_indent
+                elif line_indent < block_indent:
+                    break
+                index += 1
+            if block_indent < 0:
+                return None
+            block = lines[start:index]
+            last_line = start + len(block) - 1
+            while not block[last_line - start].strip(' '):
+                last_line -= 1
+            value = _block_scalar(header.group(1), header.group(2), block, block_indent, last_line < count - 1)
+        else:
+            value = _flat_value(value)
+        
+        if key is MISSING or value is MISSING:
+            return None
+        case[key] = value
+    
+    return cases or None
+
+
+def _load_section_yaml(content: str, loader: type, fast_path: bool = True) -> Tuple[Any, Optional[str]]:
+    """
+    Load the YAML content of a section.
+
+    This is a module-level function so that it can be sent to worker processes.
+
+    Args:
+        content: YAML content of the section.
+        loader: PyYAML loader class.
+        fast_path: Whether to try :func:`parse_flat_yaml` before the YAML loader.
+
+    Returns:
+        Tuple of the parsed YAML and None, or None and the YAML error message.
+    """
+    if fast_path:
+        parsed = parse_flat_yaml(content)
+        if parsed is not None:
+            return parsed, None
+    
+    import yaml
+    
+    try:
+        return yaml.load(content, Loader=loader), None
+    except yaml.YAMLError as e:
+        return None, str(e)
 
 
 class TestCaseParser:
     """Parser for extracting test cases from markdown files."""
 
-    def __init__(self, verbose: bool = False):
+    # Documents smaller than this many characters are always parsed serially
+    DEFAULT_PARALLEL_THRESHOLD = 1024 * 1024
+
+    # Files of at least this many bytes are memory-mapped instead of read into a string
+    DEFAULT_MMAP_THRESHOLD = 64 * 1024 * 1024
+
+    def __init__(self, verbose: bool = False, yaml_backend: str = "auto", section_workers: int = 1,
+                 parallel_threshold: int = DEFAULT_PARALLEL_THRESHOLD, cache: Optional[SectionCache] = None,
+                 mmap_threshold: int = DEFAULT_MMAP_THRESHOLD, metrics: Optional[Metrics] = None,
+                 compact: bool = False, skip_sections: Optional[Dict[str, Collection[str]]] = None,
+                 id_index: Optional[IdIndex] = None, fast_path: bool = True):
         """
         Initialize the parser.
 
         Args:
             verbose: Whether to output detailed error messages and suggestions.
+            yaml_backend: YAML loader to use: "auto", "c" (libyaml) or "python".
+            section_workers: Number of worker processes used to load the YAML of
+                the sections of a single document. 1 parses serially.
+            parallel_threshold: Minimum document size, in characters, for the
+                sections to be parsed in worker processes.
+            cache: Cache of parsed sections. Sections found in the cache are not parsed again.
+            mmap_threshold: Minimum file size, in bytes, for :meth:`parse_file`
+                to memory-map the file and decode only its test case sections.
+            metrics: Collector of the time spent reading, scanning and loading the YAML of each section.
+            compact: Whether to return the test cases as read-only
+                :class:`records.TestCaseRecord` mappings instead of dictionaries,
+                which take less memory and are written without normalizing.
+            skip_sections: Names of the sections to leave out of each input
+                file, by file path. Their YAML is not loaded.
+            id_index: Index to which the test case IDs of each parsed section
+                are added. If it is strict, parsing stops with
+                :class:`ids.IdError` at the first missing or repeated ID.
+            fast_path: Whether to read sections in the flat test case shape
+                with :func:`parse_flat_yaml` instead of the YAML loader. Other
+                sections are always loaded with the YAML loader.
+
+        Raises:
+            ValueError: If the requested YAML backend is unknown or not available.
         """
-        self.md_parser = MarkdownIt()
+        self._md_parser = None
         self.verbose = verbose
+        self.section_workers = section_workers
+        self.parallel_threshold = parallel_threshold
+        self.cache = cache
+        self.mmap_threshold = mmap_threshold
+        self.metrics = metrics if metrics is not None else DISABLED
+        self.compact = compact
+        self.skip_sections = skip_sections or {}
+        self.id_index = id_index
+        self.fast_path = fast_path
+        self.yaml_loader, self.yaml_backend = select_yaml_loader(yaml_backend)
+        logger.debug(f"Using {self.yaml_backend} YAML backend ({self.yaml_loader.__name__})")
+
+    @property
+    def md_parser(self):
+        """Markdown parser, created on first use to keep start-up fast."""
+        if self._md_parser is None:
+            from markdown_it import MarkdownIt
+            self._md_parser = MarkdownIt()
+        return self._md_parser
 
     def parse_file(self, file_path: str) -> Dict[str, List[Dict[str, Any]]]:
         """
@@ -41,11 +568,36 @@ class TestCaseParser:
             logger.error(f"File not found: {file_path}")
             return {}
 
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        size = os.path.getsize(file_path)
+        if size and size >= self.mmap_threshold:
+            return self.parse_mapped_file(file_path)
+
+        with self.metrics.stage("read", file_path, size=size):
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
 
         return self.parse_content(content, file_path)
 
+    def parse_mapped_file(self, file_path: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Parse a markdown file through a read-only memory map.
+
+        Section headers are searched in the mapped bytes and only the section
+        bodies are decoded, so the file is never copied into a string as a
+        whole. When sections are loaded serially, each body is released as
+        soon as its YAML has been parsed.
+
+        Args:
+            file_path: Path to a non-empty markdown file.
+
+        Returns:
+            Dictionary with test case file names as keys and lists of test case dictionaries as values.
+        """
+        logger.debug(f"Memory-mapping {file_path}")
+        with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            sections = self.metrics.timed_iter("scan", file_path, scan_mapped_sections(buffer), size=len(buffer))
+            return self._parse_sections(sections, len(buffer), file_path)
+
     def parse_content(self, content: str, source_path: str = "") -> Dict[str, List[Dict[str, Any]]]:
         """
         Parse markdown content and extract test cases.
@@ -54,55 +606,248 @@ class TestCaseParser:
             content: Markdown content as string.
             source_path: Source file path (for logging purposes).
 
+        Returns:
+            Dictionary with test case file names as keys and lists of test case dictionaries as values.
+        """
+        # Find all "### TestCases ($file_name)" sections
+        sections = self.metrics.timed_iter("scan", source_path, scan_sections(io.StringIO(content)), size=len(content))
+        return self._parse_sections(sections, len(content), source_path)
+
+    def _parse_sections(self, sections: Iterable[TestCaseSection], content_size: int,
+                        source_path: str) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Load and validate the YAML of the sections of a document.
+
+        Args:
+            sections: Sections found in the document.
+            content_size: Size of the document.
+            source_path: Source file path (for logging purposes).
+
         Returns:
             Dictionary with test case file names as keys and lists of test case dictionaries as values.
         """
         test_cases = {}
+        skipped = self.skip_sections.get(source_path)
+        if skipped:
+            sections = (section for section in sections if section.name not in skipped)
         
-        # Find all "### TestCases ($file_name)" sections
-        test_case_sections = re.finditer(
-            r'### TestCases\s+\(([^)]+)\)(.*?)(?=###|\Z)', 
-            content, 
-            re.DOTALL
-        )
-        
-        for match in test_case_sections:
-            file_name = match.group(1).strip()
-            yaml_content = match.group(2).strip()
-            
-            try:
-                # Try to parse the YAML content
-                parsed_test_cases = yaml.safe_load(yaml_content)
-                
-                if not parsed_test_cases:
-                    logger.warning(f"No test cases found in section for {file_name} in {source_path}")
-                    continue
-                
-                # Ensure the result is a list
-                if not isinstance(parsed_test_cases, list):
-                    if self.verbose:
-                        logger.error(f"YAML content in section for {file_name} is not a list. Found type: {type(parsed_test_cases)}")
-                        logger.error(f"Content should start with '- ' for each test case item")
-                    else:
-                        logger.error(f"YAML parse error: Expected list format in section for {file_name}")
-                    continue
-                
-                test_cases[file_name] = parsed_test_cases
-                logger.info(f"Successfully parsed {len(parsed_test_cases)} test cases from section for {file_name}")
-                
-            except yaml.YAMLError as e:
-                if self.verbose:
-                    logger.error(f"YAML parse error in section for {file_name} in {source_path}: {str(e)}")
-                    logger.debug(f"Problematic YAML content:\n{yaml_content}")
-                    logger.info("Suggestion: Check for proper indentation and YAML syntax.")
-                else:
-                    logger.error(f"YAML parse error in section for {file_name}. Use --verbose for details.")
-        
-        if not test_cases:
+        if self.section_workers > 1 and content_size >= self.parallel_threshold:
+            sections = list(sections)
+            with self.metrics.stage("yaml", source_path, size=content_size) as record:
+                loaded = self._load_sections(sections, content_size)
+            for section, (parsed_test_cases, error) in zip(sections, loaded):
+                checked = self._check_section(section, parsed_test_cases, error, source_path)
+                if checked is not None:
+                    test_cases[section.name] = checked
+                    record["cases"] += len(checked)
+        else:
+            for section in sections:
+                checked = self._load_and_check(section, source_path)
+                if checked is not None:
+                    test_cases[section.name] = checked
+        
+        if not test_cases and not skipped:
             logger.warning(f"No test case sections found in {source_path}")
             
         return test_cases
 
+    def iter_sections(self, file_path: str) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Parse a markdown file incrementally and yield its test case sections.
+
+        The file is read line by line and the YAML of each section is loaded as
+        soon as the section ends, so only one section is held in memory at a
+        time. Sections are always loaded serially. A section name that occurs
+        twice is yielded twice, whereas :meth:`parse_file` keeps the last one.
+
+        Args:
+            file_path: Path to the markdown file.
+
+        Yields:
+            Tuples of the test case file name and its list of test case dictionaries.
+        """
+        if not os.path.exists(file_path):
+            logger.error(f"File not found: {file_path}")
+            return
+
+        found = False
+        skipped = self.skip_sections.get(file_path, ())
+        with open(file_path, 'r', encoding='utf-8') as f:
+            for section in self.metrics.timed_iter("scan", file_path, scan_sections(f)):
+                if section.name in skipped:
+                    continue
+                checked = self._load_and_check(section, file_path)
+                if checked is not None:
+                    found = True
+                    yield section.name, checked
+
+        if not found and not skipped:
+            logger.warning(f"No test case sections found in {file_path}")
+
+    def iter_cases(self, file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        Parse a markdown file incrementally and yield its test cases one at a time.
+
+        Args:
+            file_path: Path to the markdown file.
+
+        Yields:
+            Tuples of the test case file name and a test case dictionary, in document order.
+        """
+        for file_name, test_cases in self.iter_sections(file_path):
+            for test_case in test_cases:
+                yield file_name, test_case
+
+    def _load_and_check(self, section: TestCaseSection, source_path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Load and validate the YAML of a single section, timing the YAML load.
+
+        Args:
+            section: Section found in the document.
+            source_path: Source file path (for logging purposes).
+
+        Returns:
+            List of test case dictionaries, or None if the section has no valid test cases.
+        """
+        with self.metrics.stage("yaml", section.name, size=len(section.content)) as record:
+            parsed_test_cases, error = self._load_section(section)
+        checked = self._check_section(section, parsed_test_cases, error, source_path)
+        if checked is not None:
+            record["cases"] = len(checked)
+        return checked
+
+    def _check_section(self, section: TestCaseSection, parsed_test_cases: Any, error: Optional[str],
+                       source_path: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Validate the loaded YAML of a section and log the outcome.
+
+        Args:
+            section: Section found in the document.
+            parsed_test_cases: Parsed YAML of the section.
+            error: YAML error message, or None if the section was loaded.
+            source_path: Source file path (for logging purposes).
+
+        Returns:
+            List of test case dictionaries, or None if the section has no valid test cases.
+
+        Raises:
+            IdError: If the ID index is strict and a test case ID is missing or repeated.
+        """
+        file_name = section.name
+        logger.debug(f"Found section for {file_name} at lines {section.start_line}-{section.end_line} in {source_path}")
+
+        if error is not None:
+            if self.verbose:
+                logger.error(f"YAML parse error in section for {file_name} in {source_path}: {error}")
+                logger.debug(f"Problematic YAML content:\n{section.content}")
+                logger.info("Suggestion: Check for proper indentation and YAML syntax.")
+            else:
+                logger.error(f"YAML parse error in section for {file_name}. Use --verbose for details.")
+            return None
+
+        if not parsed_test_cases:
+            logger.warning(f"No test cases found in section for {file_name} in {source_path}")
+            return None
+
+        # Ensure the result is a list
+        if not isinstance(parsed_test_cases, list):
+            if self.verbose:
+                logger.error(f"YAML content in section for {file_name} is not a list. Found type: {type(parsed_test_cases)}")
+                logger.error(f"Content should start with '- ' for each test case item")
+            else:
+                logger.error(f"YAML parse error: Expected list format in section for {file_name}")
+            return None
+
+        logger.info(f"Successfully parsed {len(parsed_test_cases)} test cases from section for {file_name}")
+        if self.id_index is not None:
+            self.id_index.add_section(source_path, file_name, parsed_test_cases, section.start_line)
+        if self.compact:
+            return compact_cases(parsed_test_cases)
+        return parsed_test_cases
+
+    def _load_section(self, section: TestCaseSection) -> Tuple[Any, Optional[str]]:
+        """
+        Load the YAML of a single section, reusing a cached result if there is one.
+
+        Args:
+            section: Section found in the document.
+
+        Returns:
+            Tuple of the parsed YAML and None, or None and the YAML error message.
+        """
+        cached = self.cache.get(section.content) if self.cache is not None else None
+        if cached is not None:
+            logger.debug(f"Using cached test cases for section {section.name}")
+            return cached, None
+
+        parsed_test_cases, error = _load_section_yaml(section.content, self.yaml_loader, self.fast_path)
+        self._remember(section, parsed_test_cases, error)
+        return parsed_test_cases, error
+
+    def _remember(self, section: TestCaseSection, parsed_test_cases: Any, error: Optional[str]):
+        """Store the test cases of a successfully loaded section in the cache."""
+        if self.cache is not None and error is None and parsed_test_cases and isinstance(parsed_test_cases, list):
+            self.cache.put(section.content, parsed_test_cases)
+
+    def _load_sections(self, sections: List[TestCaseSection], content_size: int) -> List[Tuple[Any, Optional[str]]]:
+        """
+        Load the YAML of each section, reusing cached results where possible.
+
+        Args:
+            sections: Sections found in the document.
+            content_size: Size of the document in characters.
+
+        Returns:
+            List of (parsed YAML, error message) tuples in section order.
+        """
+        loaded = [None] * len(sections)
+        pending = []
+        for index, section in enumerate(sections):
+            cached = self.cache.get(section.content) if self.cache is not None else None
+            if cached is not None:
+                logger.debug(f"Using cached test cases for section {section.name}")
+                loaded[index] = (cached, None)
+            else:
+                pending.append(index)
+        
+        if self.section_workers > 1 and len(pending) > 1 and content_size >= self.parallel_threshold:
+            results = self._load_sections_parallel([sections[index] for index in pending])
+        else:
+            results = [
+                _load_section_yaml(sections[index].content, self.yaml_loader, self.fast_path) for index in pending
+            ]
+        
+        for index, (parsed_test_cases, error) in zip(pending, results):
+            loaded[index] = (parsed_test_cases, error)
+            self._remember(sections[index], parsed_test_cases, error)
+        
+        return loaded
+
+    def _load_sections_parallel(self, sections: List[TestCaseSection]) -> List[Tuple[Any, Optional[str]]]:
+        """
+        Load the YAML of each section in a pool of worker processes.
+
+        Args:
+            sections: Sections found in the document.
+
+        Returns:
+            List of (parsed YAML, error message) tuples in section order.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        workers = min(self.section_workers, len(sections))
+        chunksize = max(1, len(sections) // (workers * 4))
+        logger.debug(f"Parsing {len(sections)} sections with {workers} worker processes")
+        
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(
+                _load_section_yaml,
+                [section.content for section in sections],
+                repeat(self.yaml_loader),
+                repeat(self.fast_path),
+                chunksize=chunksize,
+            ))
+
     def parse_yaml_file(self, file_path: str) -> Dict[str, List[Dict[str, Any]]]:
         """
         Parse a YAML file containing test cases directly.
@@ -112,24 +857,39 @@ class TestCaseParser:
 
         Returns:
             Dictionary with test case file names as keys and lists of test case dictionaries as values.
+
+        Raises:
+            IdError: If the ID index is strict and a test case ID is missing or repeated.
         """
+        import yaml
+        
         if not os.path.exists(file_path):
             logger.error(f"File not found: {file_path}")
             return {}
 
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = yaml.safe_load(f)
+            with self.metrics.stage("yaml", file_path, size=os.path.getsize(file_path)) as record:
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    content = yaml.load(f, Loader=self.yaml_loader)
+                if isinstance(content, dict):
+                    record["cases"] = sum(len(cases) for cases in content.values() if isinstance(cases, list))
                 
             if not isinstance(content, dict):
                 logger.error(f"YAML file {file_path} should contain a dictionary mapping file names to test cases")
                 return {}
                 
+            for file_name in self.skip_sections.get(file_path, ()):
+                content.pop(file_name, None)
+                
             # Validate the structure
             for file_name, test_cases in content.items():
                 if not isinstance(test_cases, list):
                     logger.error(f"Test cases for {file_name} should be a list")
                     continue
+                if self.id_index is not None:
+                    self.id_index.add_section(file_path, file_name, test_cases)
+                if self.compact:
+                    content[file_name] = compact_cases(test_cases)
                     
             logger.info(f"Successfully parsed YAML file {file_path} with {len(content)} test case sections")
             return content
@@ -141,6 +901,8 @@ class TestCaseParser:
             else:
                 logger.error(f"YAML parse error in file {file_path}. Use --verbose for details.")
             return {}
+        except IdError:
+            raise
         except Exception as e:
             logger.error(f"Error parsing YAML file {file_path}: {str(e)}")
             return {}
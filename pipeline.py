@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Pipeline module for parsing input files while the outputs of earlier sections are written.
+"""
+
+import queue
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Iterator, NamedTuple, Sequence, Tuple
+from loguru import logger
+
+from batch import YAML_EXTENSIONS, CONFLICT_POLICIES, suffixed_name
+from converter import DEFAULT_FORMATS, TestCaseConverter
+from defaults import DEFAULT_CSV_WORKERS, DEFAULT_QUEUE_SIZE
+from parser import TestCaseParser
+
+
+# Seconds between two checks of whether the writers have stopped, while the queue is full
+_PUT_TIMEOUT = 0.1
+
+# Marks the end of the parsed sections
+_DONE = object()
+
+
+class PipelineResult(NamedTuple):
+    """Outcome of a pipelined conversion."""
+
+    outputs: Dict[str, Any]
+    sections: int
+    cases: int
+
+
+class _ProducerError(NamedTuple):
+    """Exception raised while parsing, passed on to the writing thread."""
+
+    error: BaseException
+
+
+def _put(sections: queue.Queue, item: Any, stop: threading.Event) -> bool:
+    """Put an item on the queue, waiting while it is full; return False if the writers stopped."""
+    while not stop.is_set():
+        try:
+            sections.put(item, timeout=_PUT_TIMEOUT)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+
+def _produce(file_paths: Sequence[str], parser: TestCaseParser, on_conflict: str, sections: queue.Queue,
+             stop: threading.Event):
+    """
+    Parse input files section by section and put the sections on the queue.
+
+    Args:
+        file_paths: Paths of the input files.
+        parser: Parser used for the input files.
+        on_conflict: "error" or "suffix", applied to every repeated section name.
+        sections: Bounded queue receiving (file name, test cases) tuples.
+        stop: Set by the writing thread when it no longer reads the queue.
+    """
+    sources = {}
+    try:
+        for file_path in file_paths:
+            logger.info(f"Processing file: {file_path}")
+            if Path(file_path).suffix.lower() in YAML_EXTENSIONS:
+                parsed = parser.parse_yaml_file(file_path).items()
+            else:
+                parsed = parser.iter_sections(file_path)
+                
+            for file_name, cases in parsed:
+                if file_name in sources:
+                    if on_conflict == "error":
+                        raise ValueError(f"Section {file_name} is defined in both {sources[file_name]} and {file_path}")
+                    new_name = suffixed_name(file_name, sources)
+                    logger.warning(f"Section {file_name} from {file_path} renamed to {new_name}")
+                    file_name = new_name
+                sources[file_name] = file_path
+                if not _put(sections, (file_name, cases), stop):
+                    return
+    except BaseException as e:
+        _put(sections, _ProducerError(e), stop)
+    finally:
+        _put(sections, _DONE, stop)
+
+
+def _consume(sections: queue.Queue, counts: List[int]) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """Yield the sections put on the queue until the parser is done, re-raising its errors."""
+    while True:
+        item = sections.get()
+        if item is _DONE:
+            return
+        if isinstance(item, _ProducerError):
+            raise item.error
+        counts[0] += 1
+        counts[1] += len(item[1] or [])
+        yield item
+
+
+def run_pipeline(file_paths: Sequence[str], parser: TestCaseParser, converter: TestCaseConverter,
+                 formats: Sequence[str] = DEFAULT_FORMATS, force: bool = False, on_conflict: str = "error",
+                 queue_size: int = DEFAULT_QUEUE_SIZE, csv_workers: int = DEFAULT_CSV_WORKERS) -> PipelineResult:
+    """
+    Convert input files with parsing and writing overlapped.
+
+    A parser thread reads the input files section by section and puts each
+    section on a bounded queue, while the calling thread writes the outputs
+    of the sections taken from the queue with
+    :meth:`TestCaseConverter.convert_sections`. When the writers fall behind,
+    the parser blocks on the full queue, so at most queue_size parsed
+    sections wait in memory. CSV files are written by a pool of threads when
+    force is set.
+
+    Unlike :func:`batch.merge_results`, the conflict policy also applies to a
+    section name repeated within one file, since a section that was already
+    written cannot be replaced.
+
+    Args:
+        file_paths: Paths of the input files.
+        parser: Parser used for the input files.
+        converter: Converter writing the outputs.
+        formats: Names of the output formats.
+        force: Whether to overwrite existing files without asking.
+        on_conflict: "error" to fail on a repeated section name, or "suffix" to
+            rename the later section to "name_2", "name_3", ...
+        queue_size: Maximum number of parsed sections waiting to be written.
+        csv_workers: Number of threads writing CSV files.
+
+    Returns:
+        Outputs of each format and the number of sections and test cases converted.
+
+    Raises:
+        ValueError: If the conflict policy is unknown or "merge", a section name
+            is repeated with the "error" policy, or a format is unknown.
+    """
+    if on_conflict not in CONFLICT_POLICIES:
+        raise ValueError(f"Unknown conflict policy: {on_conflict}. Use one of: {', '.join(CONFLICT_POLICIES)}")
+    if on_conflict == "merge":
+        raise ValueError("The merge conflict policy cannot be used in pipelined mode")
+        
+    sections = queue.Queue(maxsize=max(1, queue_size))
+    stop = threading.Event()
+    producer = threading.Thread(
+        target=_produce, args=(file_paths, parser, on_conflict, sections, stop), name="mdtc-parser", daemon=True
+    )
+    counts = [0, 0]
+    producer.start()
+    try:
+        outputs = converter.convert_sections(
+            _consume(sections, counts), formats=formats, force=force, csv_workers=csv_workers
+        )
+    finally:
+        stop.set()
+        producer.join()
+        
+    return PipelineResult(outputs, counts[0], counts[1])
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Records module with a compact representation of parsed test cases.
+"""
+
+import sys
+from collections.abc import Mapping
+from functools import lru_cache
+from typing import Dict, List, Any, Iterator, NamedTuple, Optional, Tuple
+
+
+# Common test case fields with order preservation
+TEST_CASE_FIELDS = (
+    "ID", "Name", "Desc", "Pre-conditions", "Test Steps", "Expected Result",
+    "Actual Result", "Test Data", "Priority", "Severity", "Status",
+    "Environment", "Tested By", "Date", "Comments/Notes"
+)
+
+# Placeholder key for fields a case does not have; never present in a case
+MISSING = object()
+
+# Fields with few distinct values, whose string values are interned
+_INTERNED_FIELDS = frozenset(("Priority", "Severity", "Status", "Environment", "Tested By"))
+
+_DEFAULTS = ("",) * len(TEST_CASE_FIELDS)
+
+
+@lru_cache(maxsize=4096)
+def field_plan(fields: Tuple[str, ...], keys: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """
+    Resolve which key of a case holds the value of each field.
+
+    An exact match wins; otherwise the first key that matches case-insensitively
+    is used. The plan only depends on the key set, so it is computed once per
+    distinct tuple of keys and cached.
+
+    Args:
+        fields: Output fields in column order.
+        keys: Keys of a test case dictionary, in iteration order.
+
+    Returns:
+        Tuple with, for each field, the key to read or ``MISSING``.
+    """
+    exact = set(keys)
+    lowered = {}
+    for key in keys:
+        lowered.setdefault(str(key).lower(), key)
+    return tuple(
+        field if field in exact else lowered.get(field.lower(), MISSING)
+        for field in fields
+    )
+
+
+class RecordShape(NamedTuple):
+    """Key layout shared by all records built from dictionaries with the same keys."""
+
+    keys: Tuple[Any, ...]
+    plan: Tuple[Any, ...]
+    slots: Dict[Any, int]
+    extra: Tuple[Any, ...]
+    interned: Tuple[int, ...]
+
+
+@lru_cache(maxsize=4096)
+def record_shape(keys: Tuple[Any, ...]) -> RecordShape:
+    """
+    Compute the shape of records built from dictionaries with the given keys.
+
+    String keys are interned, so the records of a shape share one copy of
+    each key.
+
+    Args:
+        keys: Keys of a test case dictionary, in iteration order.
+
+    Returns:
+        Shape with the keys, the key read by each column, the column of each
+        such key, the keys kept in the overflow map and the columns whose
+        values are interned.
+    """
+    keys = tuple(sys.intern(key) if type(key) is str else key for key in keys)
+    plan = field_plan(TEST_CASE_FIELDS, keys)
+    slots = {key: index for index, key in enumerate(plan) if key is not MISSING}
+    return RecordShape(
+        keys=keys,
+        plan=plan,
+        slots=slots,
+        extra=tuple(key for key in keys if key not in slots),
+        interned=tuple(slots[key] for key in slots if TEST_CASE_FIELDS[slots[key]] in _INTERNED_FIELDS),
+    )
+
+
+class TestCaseRecord(Mapping):
+    """
+    Read-only test case stored as a row in ``TEST_CASE_FIELDS`` order.
+
+    The row holds "" for the fields the case does not have, so writers can use
+    it as is. Keys that are not read by any column are kept in an overflow
+    dictionary. The record behaves like the dictionary it was built from:
+    it has the same keys in the same order and compares equal to it.
+    """
+
+    __slots__ = ("shape", "row", "extra")
+
+    def __init__(self, shape: RecordShape, row: Tuple[Any, ...], extra: Optional[Dict[Any, Any]] = None):
+        """
+        Initialize the record.
+
+        Args:
+            shape: Shape returned by :func:`record_shape`.
+            row: Values in ``TEST_CASE_FIELDS`` order.
+            extra: Values of the keys in ``shape.extra``, or None if there are none.
+        """
+        self.shape = shape
+        self.row = row
+        self.extra = extra
+
+    def __getitem__(self, key: Any) -> Any:
+        index = self.shape.slots.get(key)
+        if index is not None:
+            return self.row[index]
+        if self.extra is None:
+            raise KeyError(key)
+        return self.extra[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.shape.slots or (self.extra is not None and key in self.extra)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.shape.keys)
+
+    def __len__(self) -> int:
+        return len(self.shape.keys)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({dict(self)!r})"
+
+    def __reduce__(self):
+        return (_restore_record, (self.shape.keys, self.row, self.extra))
+
+
+def _restore_record(keys: Tuple[Any, ...], row: Tuple[Any, ...], extra: Optional[Dict[Any, Any]]) -> TestCaseRecord:
+    """Rebuild a pickled record, sharing the shape of the current process."""
+    return TestCaseRecord(record_shape(keys), row, extra)
+
+
+def compact_case(case: Dict[str, Any]) -> TestCaseRecord:
+    """
+    Build a compact record from a test case dictionary.
+
+    Args:
+        case: Test case dictionary with arbitrary key casing.
+
+    Returns:
+        Record equal to the dictionary.
+    """
+    shape = record_shape(tuple(case))
+    row = tuple(map(case.get, shape.plan, _DEFAULTS))
+    if shape.interned:
+        row = list(row)
+        for index in shape.interned:
+            if type(row[index]) is str:
+                row[index] = sys.intern(row[index])
+        row = tuple(row)
+    extra = {key: case[key] for key in shape.extra} if shape.extra else None
+    return TestCaseRecord(shape, row, extra)
+
+
+def compact_cases(cases: List[Any]) -> List[Any]:
+    """
+    Replace the test case dictionaries of a section with compact records.
+
+    Args:
+        cases: Parsed test cases. Items that are not dictionaries are kept as they are.
+
+    Returns:
+        New list of records.
+    """
+    return [compact_case(case) if type(case) is dict else case for case in cases]
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Server module for running conversion jobs in a long-lived, warm interpreter.
+"""
+
+import os
+import json
+import time
+import stat
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from contextlib import contextmanager
+from typing import Dict, Any, Callable, Iterable, Iterator, Optional
+from loguru import logger
+
+from batch import collect_inputs, parse_inputs, merge_results
+from cache import SectionCache
+from converter import DEFAULT_FORMATS, TestCaseConverter
+from defaults import DEFAULT_CSV_WORKERS, DEFAULT_SERVER_WORKERS
+from metrics import Metrics
+from parser import select_yaml_loader
+
+
+# Environment variable overriding the default socket path
+SOCKET_ENV = "MDTC_SERVER_SOCKET"
+
+# File name of the default socket
+SOCKET_NAME = "mdtc.sock"
+
+
+def unix_sockets_supported() -> bool:
+    """Return whether the platform has Unix sockets and user IDs to check their owner, which Windows lacks."""
+    return hasattr(socket, "AF_UNIX") and hasattr(os, "getuid")
+
+
+def default_socket_path() -> str:
+    """
+    Return the socket path used by ``serve`` and ``convert --server`` when none is given.
+
+    The socket is placed in ``$XDG_RUNTIME_DIR``, which only the user can
+    access, or else in a per-user directory of the temporary directory that
+    :meth:`ConversionServer.serve_socket` creates with mode 0700.
+
+    Raises:
+        ValueError: If Unix sockets are not supported on this platform.
+    """
+    if not unix_sockets_supported():
+        raise ValueError("Unix sockets are not supported on this platform; use --stdio")
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    runtime_dir = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(runtime_dir):
+        return os.path.join(runtime_dir, SOCKET_NAME)
+    return os.path.join(tempfile.gettempdir(), f"mdtc-{os.getuid()}", SOCKET_NAME)
+
+
+def is_own_socket(socket_path: str) -> bool:
+    """
+    Return whether a path is a socket created by the current user.
+
+    A socket in a shared directory may have been created by another user to
+    receive the jobs, so clients only connect to sockets they own.
+    """
+    if not unix_sockets_supported():
+        return False
+    try:
+        status = os.lstat(socket_path)
+    except OSError:
+        return False
+    return stat.S_ISSOCK(status.st_mode) and status.st_uid == os.getuid()
+
+
+def warm_up():
+    """Import the modules that are otherwise loaded on first use, so that the first job is not slower."""
+    select_yaml_loader()
+    for module in ("openpyxl", "markdown_it"):
+        try:
+            __import__(module)
+        except ImportError:
+            logger.debug(f"Could not import {module}")
+
+
+class ConversionServer:
+    """Runs conversion jobs received as JSON lines on a bounded pool of threads."""
+
+    def __init__(self, workers: int = DEFAULT_SERVER_WORKERS, verbose: bool = False):
+        """
+        Initialize the server.
+
+        Args:
+            workers: Number of jobs converted at the same time. At most twice
+                this many jobs are accepted before reading further requests.
+            verbose: Whether to output detailed error messages and suggestions.
+        """
+        self.workers = max(1, workers)
+        self.verbose = verbose
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="mdtc-job")
+        self._slots = threading.BoundedSemaphore(2 * self.workers)
+        self._locks = {}
+        self._locks_lock = threading.Lock()
+        self._unix_server = None
+
+    @contextmanager
+    def _output_lock(self, output_dir: str) -> Iterator[None]:
+        """Hold the lock of an output directory, so that jobs writing the same files run one after the other."""
+        key = os.path.realpath(output_dir)
+        with self._locks_lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            yield
+
+    def run_job(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Convert the inputs of a job. Outputs are always overwritten.
+
+        A job is a dictionary with these keys; only "inputs" is required:
+
+        - "id": Any value, returned with the response.
+        - "inputs": Input files, directories or glob patterns.
+        - "output_dir": Directory to store output files (default: "output").
+        - "formats": Output formats (default: csv and xlsx).
+        - "on_conflict": Conflict policy for repeated section names (default: "error").
+        - "yaml_backend": YAML loader to use (default: "auto").
+        - "stream_threshold": Test case count above which Excel is written in streaming mode.
+        - "cache": Whether to use the parsed section cache (default: true).
+        - "cache_size": Maximum size of the parsed section cache in bytes.
+        - "excel_shard": How the Excel output is split into workbooks (default: "none").
+        - "excel_shard_size": Number of sections or rows per workbook.
+        - "excel_workers": Number of worker processes building sharded workbooks (default: 1).
+        - "csv_workers": Number of threads writing CSV files (default: 4).
+
+        Args:
+            job: Job dictionary.
+
+        Returns:
+            Response with the job id and "status" "ok", the outputs, counts,
+            elapsed seconds and stage metrics, or "status" "error" and the error message.
+        """
+        job_id = job.get("id")
+        start_time = time.perf_counter()
+        try:
+            inputs = job.get("inputs")
+            if not inputs or not isinstance(inputs, list):
+                raise ValueError("Job must have a non-empty list of inputs")
+            output_dir = job.get("output_dir", "output")
+            files = collect_inputs(inputs)
+            
+            metrics = Metrics()
+            with self._output_lock(output_dir):
+                cache = None
+                cache_size = job.get("cache_size", SectionCache.DEFAULT_MAX_BYTES)
+                if job.get("cache", True):
+                    cache = SectionCache(os.path.join(output_dir, SectionCache.DIRECTORY_NAME), max_bytes=cache_size)
+                converter = TestCaseConverter(
+                    output_dir=output_dir, metrics=metrics,
+                    streaming_threshold=job.get("stream_threshold", TestCaseConverter.DEFAULT_STREAMING_THRESHOLD),
+                    excel_shard=job.get("excel_shard", "none"), excel_shard_size=job.get("excel_shard_size", 0),
+                    excel_workers=job.get("excel_workers", 1),
+                    csv_workers=job.get("csv_workers", DEFAULT_CSV_WORKERS),
+                )
+                results = parse_inputs(
+                    files, verbose=self.verbose, yaml_backend=job.get("yaml_backend", "auto"),
+                    cache_dir=cache.cache_dir if cache is not None else None, cache_size=cache_size,
+                    metrics=metrics, compact=True,
+                )
+                test_cases = merge_results(results, on_conflict=job.get("on_conflict", "error"))
+                if not test_cases:
+                    raise ValueError("No valid test cases found")
+                outputs = converter.convert(test_cases, formats=job.get("formats", DEFAULT_FORMATS), force=True)
+        except (OSError, ValueError) as e:
+            logger.error(f"Job {job_id} failed: {str(e)}")
+            return {"id": job_id, "status": "error", "error": str(e)}
+        except Exception as e:
+            logger.exception(f"Job {job_id} failed")
+            return {"id": job_id, "status": "error", "error": f"{type(e).__name__}: {str(e)}"}
+            
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Job {job_id} completed in {elapsed:.2f}s")
+        return {
+            "id": job_id,
+            "status": "ok",
+            "outputs": outputs,
+            "written": converter.written,
+            "skipped": converter.skipped,
+            "failed": converter.failed,
+            "files": len(files),
+            "sections": len(test_cases),
+            "cases": sum(len(cases or []) for cases in test_cases.values()),
+            "seconds": elapsed,
+            "metrics": metrics.to_dict(),
+        }
+
+    def submit(self, job: Dict[str, Any], respond: Callable[[Dict[str, Any]], None]):
+        """
+        Queue a job, waiting while the pool already holds its maximum of pending jobs.
+
+        Args:
+            job: Job dictionary, see :meth:`run_job`.
+            respond: Called with the response once the job is done.
+
+        Returns:
+            Future of the job.
+        """
+        self._slots.acquire()
+        try:
+            return self._pool.submit(self._run_and_respond, job, respond)
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def _run_and_respond(self, job: Dict[str, Any], respond: Callable[[Dict[str, Any]], None]):
+        """Run a job in a pool thread and pass its response on; the job's future completes after the response."""
+        try:
+            respond(self.run_job(job))
+        finally:
+            self._slots.release()
+
+    def serve_stream(self, lines: Iterable[str], write: Callable[[str], None]):
+        """
+        Run the jobs read from a stream of JSON lines and write one response line per job.
+
+        Responses are written as soon as each job is done, so they may come in
+        another order than the jobs; the "id" of a job identifies its response.
+        Returns when the stream ends and all its jobs are done.
+
+        Args:
+            lines: Lines with one JSON job each.
+            write: Called with each response line.
+        """
+        write_lock = threading.Lock()
+        
+        def respond(response: Dict[str, Any]):
+            line = json.dumps(response, ensure_ascii=False, default=str) + "\n"
+            with write_lock:
+                write(line)
+
+        futures = []
+        for line in lines:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                job = json.loads(line)
+            except ValueError as e:
+                respond({"id": None, "status": "error", "error": f"Invalid job: {str(e)}"})
+                continue
+            if not isinstance(job, dict):
+                respond({"id": None, "status": "error", "error": "Invalid job: expected a JSON object"})
+                continue
+            futures.append(self.submit(job, respond))
+        wait(futures)
+
+    def serve_socket(self, socket_path: str):
+        """
+        Accept connections on a Unix socket until :meth:`shutdown` is called.
+
+        Each connection sends jobs as JSON lines and receives the responses on
+        the same connection; see :meth:`serve_stream`.
+
+        Args:
+            socket_path: Path of the socket. A stale socket file is replaced.
+                A missing directory is created with mode 0700, and the socket
+                itself is only accessible to the user.
+
+        Raises:
+            ValueError: If Unix sockets are not supported or another server is listening on the path.
+        """
+        if not unix_sockets_supported():
+            raise ValueError("Unix sockets are not supported on this platform; use --stdio")
+        os.makedirs(os.path.dirname(os.path.abspath(socket_path)), mode=0o700, exist_ok=True)
+        if os.path.exists(socket_path):
+            if is_running(socket_path):
+                raise ValueError(f"A server is already listening on {socket_path}")
+            os.unlink(socket_path)
+            
+        import socketserver
+        
+        server = self
+        
+        class Handler(socketserver.StreamRequestHandler):
+            """Serves the jobs of one connection."""
+
+            def handle(self):
+                server.serve_stream(
+                    (line.decode("utf-8") for line in self.rfile),
+                    lambda text: self.wfile.write(text.encode("utf-8")),
+                )
+
+        with socketserver.ThreadingUnixStreamServer(socket_path, Handler) as unix_server:
+            os.chmod(socket_path, 0o600)
+            unix_server.daemon_threads = True
+            self._unix_server = unix_server
+            logger.info(f"Listening on {socket_path}")
+            try:
+                unix_server.serve_forever()
+            finally:
+                self._unix_server = None
+                if os.path.exists(socket_path):
+                    os.unlink(socket_path)
+
+    def shutdown(self):
+        """Stop accepting connections and wait for the running jobs."""
+        if self._unix_server is not None:
+            self._unix_server.shutdown()
+        self._pool.shutdown(wait=True)
+
+
+def is_running(socket_path: str) -> bool:
+    """Return whether a server accepts connections on a Unix socket."""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(socket_path):
+        return False
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(socket_path)
+        except OSError:
+            return False
+    return True
+
+
+def send_jobs(socket_path: str, jobs: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+    """
+    Send jobs to a server and yield its responses as they arrive.
+
+    Args:
+        socket_path: Path of the server socket.
+        jobs: Job dictionaries, see :meth:`ConversionServer.run_job`.
+
+    Yields:
+        One response dictionary per job, in completion order.
+
+    Raises:
+        OSError: If the server cannot be reached.
+    """
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(socket_path)
+        client.sendall("".join(json.dumps(job, ensure_ascii=False) + "\n" for job in jobs).encode("utf-8"))
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile("r", encoding="utf-8") as responses:
+            for line in responses:
+                yield json.loads(line)
+
+
+def forward_job(socket_path: str, job: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run a job on the server listening on a socket, if there is one.
+
+    Args:
+        socket_path: Path of the server socket.
+        job: Job dictionary, see :meth:`ConversionServer.run_job`.
+
+    Returns:
+        Response of the server, or None if no server is running or the
+        socket does not belong to the current user.
+    """
+    if not unix_sockets_supported() or not os.path.exists(socket_path):
+        return None
+    if not is_own_socket(socket_path):
+        logger.warning(f"Not forwarding to {socket_path}: it is not a socket created by the current user")
+        return None
+    try:
+        responses = list(send_jobs(socket_path, [job]))
+    except OSError as e:
+        logger.debug(f"No server reachable on {socket_path}: {str(e)}")
+        return None
+    return responses[0] if responses else None
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the batch module.
+"""
+
+import os
+import pytest
+import tempfile
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import collect_inputs, parse_inputs, merge_results
+
+
+@pytest.fixture
+def spec_dir():
+    """Create a directory tree with markdown, YAML and unrelated files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, "nested"))
+        files = {
+            "b.md": "### TestCases (login.md)\n- ID: TC001\n  Name: Login\n",
+            "a.md": "### TestCases (logout.md)\n- ID: TC101\n  Name: Logout\n",
+            os.path.join("nested", "c.yaml"): "login.md:\n  - ID: TC002\n    Name: Login again\n",
+            "notes.txt": "not a spec",
+        }
+        for name, content in files.items():
+            with open(os.path.join(temp_dir, name), "w", encoding="utf-8") as f:
+                f.write(content)
+        yield temp_dir
+
+
+def test_collect_inputs_directory(spec_dir):
+    """Test that directories are searched recursively in sorted order."""
+    files = collect_inputs([spec_dir])
+    
+    assert [os.path.relpath(path, spec_dir) for path in files] == [
+        "a.md", "b.md", os.path.join("nested", "c.yaml")
+    ]
+
+
+def test_collect_inputs_glob_and_duplicates(spec_dir):
+    """Test glob patterns and removal of duplicate paths."""
+    first = os.path.join(spec_dir, "b.md")
+    files = collect_inputs([first, os.path.join(spec_dir, "*.md")])
+    
+    assert files == [first, os.path.join(spec_dir, "a.md")]
+
+
+def test_collect_inputs_errors(spec_dir):
+    """Test missing paths, unmatched patterns and unsupported files."""
+    with pytest.raises(ValueError, match="Input file not found"):
+        collect_inputs([os.path.join(spec_dir, "missing.md")])
+    with pytest.raises(ValueError, match="No input files match"):
+        collect_inputs([os.path.join(spec_dir, "*.markdown")])
+    with pytest.raises(ValueError, match="Unsupported file extension"):
+        collect_inputs([os.path.join(spec_dir, "notes.txt")])
+
+
+def test_parse_inputs_parallel(spec_dir):
+    """Test that parallel parsing returns the same results in input order."""
+    files = collect_inputs([spec_dir])
+    
+    serial = parse_inputs(files, jobs=1)
+    parallel = parse_inputs(files, jobs=2)
+    
+    assert parallel == serial
+    assert [path for path, _ in parallel] == files
+    assert serial[0][1]["logout.md"][0]["ID"] == "TC101"
+
+
+def test_merge_results_conflict_policies(spec_dir):
+    """Test the error, suffix and merge conflict policies."""
+    results = parse_inputs(collect_inputs([spec_dir]))
+    
+    with pytest.raises(ValueError, match="login.md"):
+        merge_results(results, on_conflict="error")
+    
+    suffixed = merge_results(results, on_conflict="suffix")
+    assert list(suffixed) == ["logout.md", "login.md", "login_2.md"]
+    assert suffixed["login_2.md"][0]["ID"] == "TC002"
+    
+    merged = merge_results(results, on_conflict="merge")
+    assert list(merged) == ["logout.md", "login.md"]
+    assert [case["ID"] for case in merged["login.md"]] == ["TC001", "TC002"]
+    
+    with pytest.raises(ValueError):
+        merge_results(results, on_conflict="ignore")
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the benchmark module.
+"""
+
+import os
+import sys
+import yaml
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench import (
+    SCENARIOS, SpecConfig, compare_results, generate_markdown, generate_test_cases, generate_yaml, percentile,
+    run_benchmarks,
+)
+from parser import TestCaseParser
+
+
+def test_generator_is_deterministic():
+    """Test that the same configuration always generates the same specification."""
+    config = SpecConfig(sections=3, cases=4, seed=7)
+    
+    assert generate_markdown(config) == generate_markdown(config)
+    assert generate_markdown(config) != generate_markdown(config._replace(seed=8))
+
+
+def test_generated_specs_parse_back():
+    """Test that generated markdown and YAML parse to the generated test cases."""
+    config = SpecConfig(sections=2, cases=5, field_size=60)
+    expected = generate_test_cases(config)
+    
+    assert TestCaseParser().parse_content(generate_markdown(config)) == expected
+    assert yaml.safe_load(generate_yaml(config)) == expected
+    
+    steps = expected["bench_section_000.md"][0]["Test Steps"]
+    assert steps.count("\n") == 3
+    assert any(ord(char) > 127 for char in generate_markdown(config))
+    assert all(ord(char) < 128 for char in generate_markdown(config._replace(non_ascii=False)))
+
+
+def test_run_benchmarks():
+    """Test that every scenario reports throughput, latency and memory."""
+    results = run_benchmarks(config=SpecConfig(sections=2, cases=3), repeat=2, warmup=0)
+    
+    assert list(results["scenarios"]) == list(SCENARIOS)
+    for result in results["scenarios"].values():
+        assert result["iterations"] == 2
+        assert result["ops_per_sec"] > 0
+        assert result["p95_ms"] >= result["p50_ms"]
+        assert result["peak_memory_mb"] >= 0
+    assert results["config"]["cases"] == 3
+
+
+def test_compare_results():
+    """Test that slower or larger results than the baseline are regressions."""
+    baseline = {"scenarios": {"parse": {"ops_per_sec": 100.0, "peak_memory_mb": 10.0}}}
+    
+    assert compare_results({"scenarios": {"parse": {"ops_per_sec": 90.0, "peak_memory_mb": 11.0}}}, baseline) == []
+    
+    regressions = compare_results({"scenarios": {"parse": {"ops_per_sec": 50.0, "peak_memory_mb": 20.0}}}, baseline)
+    assert len(regressions) == 2
+    assert regressions[0].startswith("parse:")
+    
+    assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 0.5) == 3.0
+    assert percentile([5.0, 1.0, 3.0, 2.0, 4.0], 0.95) == 5.0
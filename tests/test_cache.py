@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the SectionCache class.
+"""
+
+import os
+import pytest
+import tempfile
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import parser as parser_module
+from cache import SectionCache
+from parser import TestCaseParser
+
+
+@pytest.fixture
+def cache_dir():
+    """Create a temporary cache directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield os.path.join(temp_dir, SectionCache.DIRECTORY_NAME)
+
+
+@pytest.fixture
+def sample_markdown():
+    """Sample markdown content for testing."""
+    return """### TestCases (login.md)
+- ID: TC001
+  Name: Login
+  Priority: High
+
+### TestCases (logout.md)
+- ID: TC101
+  Name: Logout
+"""
+
+
+def test_get_put(cache_dir):
+    """Test storing and loading a parsed section."""
+    cache = SectionCache(cache_dir)
+    cases = [{"ID": "TC001", "Name": "Login"}]
+    
+    assert cache.get("- ID: TC001") is None
+    cache.put("- ID: TC001", cases)
+    
+    assert SectionCache(cache_dir).get("- ID: TC001") == cases
+    assert cache.get("- ID: TC002") is None
+
+
+def test_put_again_keeps_size(cache_dir):
+    """Test that writing an existing entry again does not count its size twice."""
+    cache = SectionCache(cache_dir)
+    for _ in range(3):
+        cache.put("- ID: TC001", [{"ID": "TC001", "Name": "Login"}])
+    cache.put("- ID: TC001", [{"ID": "TC001", "Name": "Login", "Desc": "x" * 100}])
+    cache.put("- ID: TC002", [{"ID": "TC002"}])
+    assert cache._total_bytes == cache._scan_size()
+
+
+def test_key_includes_version(monkeypatch):
+    """Test that entries written by another tool version are not reused."""
+    key = SectionCache.section_key("- ID: TC001")
+    monkeypatch.setattr("cache.__version__", "0.0.0")
+    
+    assert SectionCache.section_key("- ID: TC001") != key
+
+
+def test_evict_least_recently_used(cache_dir):
+    """Test that the oldest entries are removed when the size cap is exceeded."""
+    cache = SectionCache(cache_dir, max_bytes=10 ** 9)
+    for index in range(3):
+        cache.put(f"section {index}", [{"ID": f"TC{index:03d}", "Desc": "x" * 1000}])
+    
+    # Age the entries, then use the first one again
+    for index in range(3):
+        path = cache._entry_path(cache.section_key(f"section {index}"))
+        os.utime(path, (1000 + index, 1000 + index))
+    assert cache.get("section 0") is not None
+    
+    entry_size = os.path.getsize(cache._entry_path(cache.section_key("section 0")))
+    cache.max_bytes = entry_size * 2
+    cache.evict()
+    
+    assert cache.get("section 0") is not None
+    assert cache.get("section 1") is None
+    assert cache.get("section 2") is not None
+
+
+def test_parser_uses_cache(cache_dir, sample_markdown, monkeypatch):
+    """Test that cached sections are not parsed again."""
+    cache = SectionCache(cache_dir)
+    first = TestCaseParser(cache=cache).parse_content(sample_markdown)
+    
+    def fail(content, loader):
+        raise AssertionError("cached sections should not be parsed")
+    
+    monkeypatch.setattr(parser_module, "_load_section_yaml", fail)
+    second = TestCaseParser(cache=SectionCache(cache_dir)).parse_content(sample_markdown)
+    
+    assert second == first
+    assert second["login.md"][0]["ID"] == "TC001"
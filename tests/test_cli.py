@@ -6,7 +6,9 @@ Tests for the CLI module.
 """
 
 import os
+import json
 import pytest
+import subprocess
 import tempfile
 import sys
 from pathlib import Path
@@ -123,3 +125,238 @@ def test_convert_debug_mode(runner, sample_markdown):
         assert result.exit_code == 0
         # In debug mode, more verbose output should be present
         assert "Processing file" in result.stdout
+
+
+def test_convert_yaml_backend(runner, sample_markdown):
+    """Test the convert command with an explicit YAML backend."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        
+        result = runner.invoke(app, [
+            "convert",
+            "-i", md_path,
+            "-o", output_dir,
+            "--yaml-backend", "python",
+            "-F"
+        ])
+        assert result.exit_code == 0
+        assert os.path.exists(os.path.join(output_dir, "sample_file.csv"))
+        
+        result = runner.invoke(app, [
+            "convert",
+            "-i", md_path,
+            "-o", output_dir,
+            "--yaml-backend", "unknown",
+            "-F"
+        ])
+        assert result.exit_code != 0
+        assert "Unknown YAML backend" in result.stdout
+
+
+def test_convert_multiple_inputs(runner, sample_markdown):
+    """Test converting a directory and a glob pattern in parallel."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        spec_dir = os.path.join(temp_dir, "specs")
+        os.makedirs(os.path.join(spec_dir, "nested"))
+        with open(os.path.join(spec_dir, "first.md"), "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        with open(os.path.join(spec_dir, "nested", "second.md"), "w", encoding="utf-8") as f:
+            f.write("### TestCases (third_file.md)\n- ID: TC201\n  Name: Third\n")
+        
+        output_dir = os.path.join(temp_dir, "output")
+        
+        result = runner.invoke(app, [
+            "convert",
+            "-i", spec_dir,
+            "-i", os.path.join(spec_dir, "*.md"),
+            "-o", output_dir,
+            "--jobs", "2",
+            "-F"
+        ])
+        
+        assert result.exit_code == 0
+        assert "2 files, 3 sections, 3 test cases" in result.stdout
+        assert os.path.exists(os.path.join(output_dir, "third_file.csv"))
+        
+        # The same section names in another file are a conflict
+        copy_path = os.path.join(temp_dir, "copy.md")
+        with open(copy_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        result = runner.invoke(app, [
+            "convert",
+            "-i", spec_dir,
+            "-i", copy_path,
+            "-o", output_dir,
+            "-F"
+        ])
+        assert result.exit_code != 0
+        assert "is defined in both" in result.stdout
+        
+        result = runner.invoke(app, [
+            "convert",
+            "-i", spec_dir,
+            "-i", copy_path,
+            "-o", output_dir,
+            "--on-conflict", "suffix",
+            "-F"
+        ])
+        assert result.exit_code == 0
+        assert os.path.exists(os.path.join(output_dir, "sample_file_2.csv"))
+
+
+def test_convert_no_cache(runner, sample_markdown):
+    """Test that the section cache is only written when enabled."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        cache_dir = os.path.join(output_dir, ".mdtc-cache")
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--no-cache", "-F"])
+        assert result.exit_code == 0
+        assert not os.path.exists(cache_dir)
+        
+        # -F rewrites every output, so all sections are parsed again and cached, although unchanged
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-F"])
+        assert result.exit_code == 0
+        assert len(os.listdir(os.path.join(cache_dir, "sections"))) == 2
+
+
+def test_import_is_lazy():
+    """Test that importing the CLI does not load heavy optional modules or the modules of other commands."""
+    root_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    modules = {'openpyxl', 'markdown_it', 'yaml', 'server', 'pipeline', 'watch', 'getpass', 'tempfile'}
+    result = subprocess.run(
+        [sys.executable, "-c", f"import sys, cli; print(sorted(set(sys.modules) & {modules!r}))"],
+        cwd=root_dir, check=True, capture_output=True, text=True,
+    )
+    assert result.stdout.strip() == "[]"
+
+
+def test_convert_format_selection(runner, sample_markdown):
+    """Test that only the requested output formats are written."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-f", "csv", "-f", "jsonl", "-F"])
+        assert result.exit_code == 0
+        assert os.path.exists(os.path.join(output_dir, "sample_file.csv"))
+        assert os.path.exists(os.path.join(output_dir, "test_cases.jsonl"))
+        assert not os.path.exists(os.path.join(output_dir, "test_cases.xlsx"))
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-f", "docx", "-F"])
+        assert result.exit_code != 0
+        assert "Unknown output format" in result.stdout
+
+
+def test_convert_parquet_requires_pyarrow(runner, sample_markdown, monkeypatch):
+    """Test that --format parquet is rejected before converting when pyarrow cannot be imported."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-f", "csv", "-f", "parquet", "-F"])
+        assert result.exit_code == 1
+        assert "Parquet output requires pyarrow" in result.stdout
+        assert not os.path.exists(output_dir)
+
+
+def test_bench_command(runner):
+    """Test writing benchmark results and failing on a regression against a baseline."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results_path = os.path.join(temp_dir, "results.json")
+        args = ["bench", "-s", "parse", "-s", "csv", "--sections", "2", "--cases", "3", "-r", "2"]
+        
+        result = runner.invoke(app, args + ["-o", results_path])
+        assert result.exit_code == 0
+        with open(results_path, encoding="utf-8") as f:
+            results = json.load(f)
+        assert list(results["scenarios"]) == ["parse", "csv"]
+        
+        results["scenarios"]["parse"]["ops_per_sec"] *= 1000
+        with open(results_path, "w", encoding="utf-8") as f:
+            json.dump(results, f)
+        
+        result = runner.invoke(app, args + ["--baseline", results_path])
+        assert result.exit_code == 1
+        assert "Regression: parse" in result.stdout
+        
+        result = runner.invoke(app, ["bench", "-s", "docx"])
+        assert result.exit_code == 1
+
+
+def test_convert_timings(runner, sample_markdown):
+    """Test printing stage timings and writing them to a JSON file."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        metrics_path = os.path.join(temp_dir, "metrics.json")
+        
+        result = runner.invoke(app, [
+            "convert", "-i", md_path, "-o", output_dir, "-F", "--timings", "--metrics-out", metrics_path,
+            "--profile", "cpu",
+        ])
+        assert result.exit_code == 0
+        assert "yaml" in result.stdout
+        assert os.path.exists(os.path.join(output_dir, "profile.pstats"))
+        
+        with open(metrics_path, encoding="utf-8") as f:
+            metrics = json.load(f)
+        assert metrics["stages"]["yaml"]["cases"] == 2
+        assert metrics["stages"]["save"]["count"] == 1
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-F", "--profile", "gpu"])
+        assert result.exit_code == 1
+
+
+def test_convert_pipeline(runner, sample_markdown):
+    """Test converting in pipeline mode."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--pipeline", "--queue-size", "1", "-F"])
+        assert result.exit_code == 0
+        assert "1 files, 2 sections, 2 test cases" in result.stdout
+        assert os.path.exists(os.path.join(output_dir, "another_file.csv"))
+        assert os.path.exists(os.path.join(output_dir, "test_cases.xlsx"))
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--pipeline", "--on-conflict", "merge"])
+        assert result.exit_code != 0
+
+
+def test_convert_csv_workers(runner, sample_markdown):
+    """Test that CSV files are written by several threads and failed files are reported."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "sample.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(sample_markdown)
+        
+        output_dir = os.path.join(temp_dir, "output")
+        os.makedirs(os.path.join(output_dir, "another_file.csv"))
+        
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--csv-workers", "2", "-F"])
+        assert result.exit_code == 0
+        assert "1 failed" in result.stdout
+        assert os.path.exists(os.path.join(output_dir, "test_cases.xlsx"))
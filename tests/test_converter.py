@@ -7,6 +7,7 @@ Tests for the TestCaseConverter class.
 
 import os
 import csv
+import json
 import pytest
 import tempfile
 import sys
@@ -16,7 +17,13 @@ import openpyxl
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from converter import TestCaseConverter
+from converter import (
+    OUTPUT_WRITERS, TestCaseConverter, TEST_CASE_FIELDS, _run_writer, display_width, normalize_case, normalize_cases,
+    output_writer,
+)
+from overwrite import plan_overwrites
+
+TEST_CASE_FIELDS_LIST = list(TEST_CASE_FIELDS)
 
 
 @pytest.fixture
@@ -162,3 +169,400 @@ def test_convert_empty_test_cases(converter):
     # Convert empty test cases to Excel
     result_excel = converter.convert_to_excel({})
     assert result_excel is None
+
+
+def test_convert_to_excel_streaming(converter, sample_test_cases):
+    """Test that streaming mode produces the same workbook content as the default mode."""
+    in_memory_path = converter.convert_to_excel(sample_test_cases, force=True, streaming=False)
+    in_memory = openpyxl.load_workbook(in_memory_path)
+    expected = {
+        name: (list(in_memory[name].values), {
+            letter: dim.width for letter, dim in in_memory[name].column_dimensions.items()
+        })
+        for name in in_memory.sheetnames
+    }
+    
+    streaming_path = converter.convert_to_excel(sample_test_cases, force=True, streaming=True)
+    assert streaming_path == in_memory_path
+    
+    workbook = openpyxl.load_workbook(streaming_path)
+    assert workbook.sheetnames == ["test_file1", "test_file2"]
+    
+    for name in workbook.sheetnames:
+        sheet = workbook[name]
+        values, widths = expected[name]
+        assert list(sheet.values) == values
+        assert sheet.cell(1, 1).font.bold
+        assert sheet.cell(2, 1).alignment.wrap_text
+        for letter, width in widths.items():
+            assert sheet.column_dimensions[letter].width == width
+
+
+def test_convert_to_excel_streaming_threshold(sample_test_cases, monkeypatch):
+    """Test that streaming mode is selected automatically above the threshold."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, streaming_threshold=2)
+        calls = []
+        original = converter._convert_to_excel_streaming
+        
+        def record(test_cases, excel_path, *args):
+            calls.append(excel_path)
+            return original(test_cases, excel_path, *args)
+        
+        monkeypatch.setattr(converter, "_convert_to_excel_streaming", record)
+        
+        result = converter.convert_to_excel(sample_test_cases, force=True)
+        assert result is not None
+        assert len(calls) == 1
+        
+        converter.streaming_threshold = 3
+        converter.convert_to_excel(sample_test_cases, force=True)
+        assert len(calls) == 1
+
+
+def test_normalize_case():
+    """Test resolving fields into a fixed-order row tuple."""
+    row = normalize_case({"id": "TC001", "NAME": "Lower", "Name": "Exact", "Extra": "ignored"})
+    
+    assert len(row) == len(TEST_CASE_FIELDS)
+    assert row[0] == "TC001"  # Case-insensitive match
+    assert row[1] == "Exact"  # Exact match wins
+    assert row[2] == ""  # Missing field
+    assert "ignored" not in row
+
+
+def test_normalize_cases_mixed_key_sets():
+    """Test normalizing cases whose key sets differ from row to row."""
+    cases = [
+        {"ID": "TC001", "Priority": "High"},
+        {"priority": "Low", "id": "TC002"},
+        {"ID": "TC003", "Priority": None},
+    ]
+    
+    rows = list(normalize_cases(cases, ["ID", "Priority"]))
+    assert rows == [("TC001", "High"), ("TC002", "Low"), ("TC003", None)]
+
+
+def test_convert_to_jsonl(converter, sample_test_cases):
+    """Test converting test cases to a JSON Lines file."""
+    result = converter.convert_to_jsonl(sample_test_cases, force=True)
+    
+    with open(result, encoding="utf-8") as f:
+        records = [json.loads(line) for line in f]
+    
+    assert [record["ID"] for record in records] == ["TC001", "TC002", "TC101"]
+    assert records[0]["section"] == "test_file1.md"
+    assert records[2]["section"] == "test_file2.md"
+    assert records[0]["Priority"] == "High"
+    assert records[0]["Status"] == ""
+    assert list(records[0]) == ["section"] + TEST_CASE_FIELDS_LIST
+
+
+def test_convert_to_parquet(converter, sample_test_cases):
+    """Test converting test cases to a Parquet file."""
+    pyarrow_parquet = pytest.importorskip("pyarrow.parquet")
+    
+    result = converter.convert_to_parquet(sample_test_cases, force=True)
+    table = pyarrow_parquet.read_table(result)
+    
+    assert table.column_names == ["section"] + TEST_CASE_FIELDS_LIST
+    assert table.column("ID").to_pylist() == ["TC001", "TC002", "TC101"]
+    assert table.column("section").to_pylist() == ["test_file1.md", "test_file1.md", "test_file2.md"]
+
+
+def test_parquet_without_pyarrow_fails(converter, sample_test_cases, monkeypatch):
+    """Test that the Parquet output is reported as failed when pyarrow cannot be imported."""
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+    monkeypatch.setitem(sys.modules, "pyarrow.parquet", None)
+    parquet_path = converter.output_path("parquet")
+    
+    assert converter.convert_to_parquet(sample_test_cases, force=True) is None
+    assert converter.failed == [parquet_path]
+    result = converter.convert_sections(sample_test_cases.items(), formats=["parquet"], force=True)
+    assert result["parquet"] is None
+    assert converter.failed == [parquet_path, parquet_path]
+    assert not os.path.exists(parquet_path)
+
+
+def test_convert_to_sqlite(sample_test_cases):
+    """Test that the SQLite output is upserted by section and ID and only changed rows are written."""
+    import sqlite3
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # Disable the manifest, so that every run goes through the row hashes
+        converter = TestCaseConverter(output_dir=temp_dir, skip_unchanged=False)
+        sample_test_cases["test_file1.md"][0]["Owner"] = "QA"
+        result = converter.convert_to_sqlite(sample_test_cases, force=True)
+        assert converter.written == [result]
+        
+        with sqlite3.connect(result) as connection:
+            rows = connection.execute('SELECT section, "ID", "Priority", extra FROM test_cases ORDER BY "ID"').fetchall()
+            indexes = {row[0] for row in connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert rows[0] == ("test_file1.md", "TC001", "High", '{"Owner": "QA"}')
+        assert rows[2] == ("test_file2.md", "TC101", "Low", None)
+        assert {"test_cases_priority", "test_cases_status", "test_cases_severity"} <= indexes
+        
+        converter.convert_to_sqlite(sample_test_cases, force=True)
+        assert converter.skipped == [result]
+        
+        # Edit one case, drop another and leave the other section out of the run
+        sample_test_cases["test_file1.md"][0]["Status"] = "Passed"
+        del sample_test_cases["test_file1.md"][1]
+        del sample_test_cases["test_file2.md"]
+        with sqlite3.connect(result) as connection:
+            hashes = dict(connection.execute('SELECT "ID", row_hash FROM test_cases'))
+        converter.convert_to_sqlite(sample_test_cases, force=True)
+        with sqlite3.connect(result) as connection:
+            rows = dict(connection.execute('SELECT "ID", row_hash FROM test_cases'))
+            status = connection.execute('SELECT "Status" FROM test_cases WHERE "ID" = ?', ("TC001",)).fetchone()[0]
+        assert set(rows) == {"TC001", "TC101"}
+        assert rows["TC101"] == hashes["TC101"]
+        assert rows["TC001"] != hashes["TC001"]
+        assert status == "Passed"
+
+
+def test_sqlite_asks_to_update(sample_test_cases, monkeypatch):
+    """Test that an existing SQLite database is asked about as updated in place, not overwritten."""
+    questions = []
+    monkeypatch.setattr('builtins.input', lambda question: questions.append(question) or 'y')
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, skip_unchanged=False)
+        result = converter.convert_to_sqlite(sample_test_cases)
+        assert questions == []
+        
+        converter.convert_sections(sample_test_cases.items(), formats=["sqlite"])
+        assert questions == [f"File {result} already exists. Update it in place? (y/n): "]
+        
+        plan = plan_overwrites([], converter.output_path, ["sqlite"], in_place=["sqlite"],
+                               prompt=lambda question: questions.append(question) or "n")
+        assert questions[-1] == f"File {result} already exists. Update it in place? (y/n/all/none): "
+        assert plan.kept == [result]
+
+
+def test_convert_selected_formats(converter, sample_test_cases):
+    """Test that only the requested writers run."""
+    result = converter.convert(sample_test_cases, formats=["jsonl", "csv"], force=True)
+    
+    assert list(result) == ["jsonl", "csv"]
+    assert len(result["csv"]) == 2
+    assert not os.path.exists(os.path.join(converter.output_dir, "test_cases.xlsx"))
+    
+    with pytest.raises(ValueError):
+        converter.convert(sample_test_cases, formats=["docx"])
+
+
+def test_output_writer_registers_format(sample_test_cases):
+    """Test that a format registered with the decorator is found by every way of converting."""
+    class TextConverter(TestCaseConverter):
+        TEXT_FILE_NAME = "test_cases.txt"
+        
+        @output_writer("txt", stream="_text_stream", file_name="TEXT_FILE_NAME")
+        def convert_to_text(self, test_cases, force=False):
+            return _run_writer(self._text_stream(self.output_path("txt")), test_cases.items())
+        
+        def _text_stream(self, path):
+            names = []
+            section = yield
+            while section is not None:
+                names.append(section[0])
+                section = yield
+            with open(path, "w", encoding="utf-8") as f:
+                f.write("\n".join(names))
+            return path
+    
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            converter = TextConverter(output_dir=temp_dir)
+            path = os.path.join(temp_dir, "test_cases.txt")
+            assert converter.output_path("txt") == path
+            assert converter.convert(sample_test_cases, formats=["txt"], force=True) == {"txt": path}
+            assert converter.convert_sections(sample_test_cases.items(), formats=["txt"], force=True) == {"txt": path}
+            assert Path(path).read_text(encoding="utf-8") == "test_file1.md\ntest_file2.md"
+    finally:
+        del OUTPUT_WRITERS["txt"]
+
+
+def test_convert_sections_streams(converter, sample_test_cases):
+    """Test that sections from an iterator are written like a dictionary of test cases."""
+    consumed = []
+    
+    def sections():
+        for file_name, cases in sample_test_cases.items():
+            consumed.append(file_name)
+            yield file_name, cases
+    
+    result = converter.convert_sections(sections(), formats=["csv", "xlsx", "jsonl", "sqlite"], force=True)
+    
+    assert consumed == ["test_file1.md", "test_file2.md"]
+    assert set(result["csv"]) == {"test_file1.md", "test_file2.md"}
+    
+    workbook = openpyxl.load_workbook(result["xlsx"])
+    assert workbook.sheetnames == ["test_file1", "test_file2"]
+    assert workbook["test_file1"]["A3"].value == "TC002"
+    
+    with open(result["jsonl"], encoding="utf-8") as f:
+        assert [json.loads(line)["ID"] for line in f] == ["TC001", "TC002", "TC101"]
+    
+    import sqlite3
+    
+    with sqlite3.connect(result["sqlite"]) as connection:
+        assert connection.execute("SELECT COUNT(*) FROM test_cases").fetchone()[0] == 3
+
+
+def test_convert_cases_groups_sections(converter, sample_test_cases):
+    """Test converting a stream of single test cases."""
+    cases = ((file_name, case) for file_name, section in sample_test_cases.items() for case in section)
+    result = converter.convert_cases(cases, formats=["csv"], force=True)
+    
+    with open(result["csv"]["test_file1.md"], newline="", encoding="utf-8") as f:
+        rows = list(csv.reader(f))
+    assert [row[0] for row in rows[1:]] == ["TC001", "TC002"]
+    
+    assert converter.convert_sections(iter([]), formats=["xlsx"], force=True) == {"xlsx": None}
+
+
+def test_display_width():
+    """Test that widths use the longest line and count East Asian wide characters twice."""
+    assert display_width("") == 0
+    assert display_width("abc") == 3
+    assert display_width("1. short\n2. a longer line\n") == 16
+    assert display_width("ログイン画面") == 12
+    assert display_width("ｶﾅ and ログイン\nx") == 15
+
+
+def test_excel_column_widths(converter):
+    """Test column widths of multiline and Japanese values in both Excel writers."""
+    test_cases = {"widths.md": [{
+        "ID": "TC001",
+        "Name": "ログイン画面を開く",
+        "Test Steps": "1. Open the page\n2. Submit",
+        "Desc": "x" * 80,
+    }]}
+    
+    for streaming in (False, True):
+        result = converter.convert_to_excel(test_cases, force=True, streaming=streaming)
+        sheet = openpyxl.load_workbook(result)["widths"]
+        assert sheet.column_dimensions["B"].width == 18 + 2
+        assert sheet.column_dimensions["C"].width == TestCaseConverter.MAX_COLUMN_WIDTH
+        assert sheet.column_dimensions["E"].width == len("1. Open the page") + 2
+
+
+def test_excel_splits_oversized_sections(converter, sample_test_cases):
+    """Test that sections with more rows than a worksheet holds continue on "_part" sheets."""
+    converter.MAX_SHEET_ROWS = 1
+    for streaming in (False, True):
+        result = converter.convert_to_excel(sample_test_cases, force=True, streaming=streaming)
+        workbook = openpyxl.load_workbook(result)
+        assert workbook.sheetnames == ["test_file1", "test_file1_part2", "test_file2"]
+        assert workbook["test_file1_part2"].cell(2, 1).value == "TC002"
+    assert TestCaseConverter.sheet_name("x" * 40 + ".md", 12) == "x" * 24 + "_part12"
+
+
+@pytest.mark.parametrize("shard, size, workers, workbooks", [
+    ("section", 0, 1, {"test_file1.xlsx": ["test_file1"], "test_file2.xlsx": ["test_file2"]}),
+    ("sections", 2, 2, {"test_cases_001.xlsx": ["test_file1", "test_file2"]}),
+    ("rows", 1, 2, {
+        "test_cases_001.xlsx": ["test_file1"], "test_cases_002.xlsx": ["test_file1_part2"],
+        "test_cases_003.xlsx": ["test_file2"],
+    }),
+])
+def test_excel_shards(sample_test_cases, shard, size, workers, workbooks):
+    """Test that sharded workbooks hold the expected sheets and are listed in the index."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(
+            output_dir=temp_dir, excel_shard=shard, excel_shard_size=size, excel_workers=workers
+        )
+        index_path = converter.convert_to_excel(sample_test_cases, force=True)
+        assert index_path == os.path.join(temp_dir, TestCaseConverter.EXCEL_INDEX_FILE_NAME)
+        assert not os.path.exists(os.path.join(temp_dir, TestCaseConverter.EXCEL_FILE_NAME))
+        
+        with open(index_path, encoding="utf-8") as f:
+            entries = json.load(f)["sheets"]
+        assert {entry["workbook"] for entry in entries} == set(workbooks)
+        assert sum(entry["rows"] for entry in entries) == 3
+        for name, sheets in workbooks.items():
+            workbook = openpyxl.load_workbook(os.path.join(temp_dir, name))
+            assert workbook.sheetnames == sheets
+            assert workbook[sheets[0]].cell(1, 1).value == "ID"
+        
+        # Unchanged workbooks are not built again
+        written = len(converter.written)
+        converter.convert_to_excel(sample_test_cases, force=True)
+        assert len(converter.written) == written
+
+
+def test_excel_shard_names_do_not_collide(sample_test_cases):
+    """Test that a numbered workbook name never replaces the workbook of a section with that name."""
+    cases = sample_test_cases["test_file1.md"]
+    sections = {"login_3.md": cases[:1], "login.md": cases[1:], "login.yaml": sample_test_cases["test_file2.md"]}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, excel_shard="section")
+        with open(converter.convert_to_excel(sections, force=True), encoding="utf-8") as f:
+            workbooks = {entry["section"]: entry["workbook"] for entry in json.load(f)["sheets"]}
+        assert workbooks == {"login_3.md": "login_3.xlsx", "login.md": "login.xlsx", "login.yaml": "login_4.xlsx"}
+        for section, name in workbooks.items():
+            workbook = openpyxl.load_workbook(os.path.join(temp_dir, name))
+            assert workbook.active.cell(2, 1).value == sections[section][0]["ID"]
+
+
+def test_excel_shards_remove_stale_workbooks(sample_test_cases):
+    """Test that workbooks of sections no longer in the output are removed."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, excel_shard="section")
+        converter.convert_to_excel(sample_test_cases, force=True)
+        del sample_test_cases["test_file2.md"]
+        converter.convert_to_excel(sample_test_cases, force=True)
+        assert sorted(name for name in os.listdir(temp_dir) if name.endswith(".xlsx")) == ["test_file1.xlsx"]
+        
+        with pytest.raises(ValueError):
+            TestCaseConverter(output_dir=temp_dir, excel_shard="rows")
+
+
+def test_convert_to_csv_workers(sample_test_cases):
+    """Test that CSV files written by several threads match those written serially, in section order."""
+    sections = {f"section{number}.md": sample_test_cases["test_file1.md"] for number in range(20)}
+    contents = []
+    for workers in (1, 4):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            converter = TestCaseConverter(output_dir=temp_dir, csv_workers=workers)
+            result = converter.convert_to_csv(sections, force=True)
+            assert list(result) == list(sections)
+            contents.append([Path(path).read_text(encoding="utf-8") for path in result.values()])
+    assert contents[0] == contents[1]
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_convert_to_csv_same_file_keeps_later_section(sample_test_cases, workers):
+    """Test that of two sections sharing a CSV file, the later one is kept as when writing serially."""
+    # The earlier section is large, so that a concurrent write of the later one would finish first
+    case = sample_test_cases["test_file1.md"][0]
+    sections = [
+        ("login.md", [dict(case, ID=f"TC{number}") for number in range(20000)]),
+        ("login.yaml", sample_test_cases["test_file2.md"]),
+    ]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, csv_workers=workers, skip_unchanged=False)
+        result = converter.convert_sections(sections, formats=["csv"], force=True)["csv"]
+        assert result["login.md"] == result["login.yaml"]
+        with open(result["login.yaml"], 'r', newline='', encoding='utf-8') as csvfile:
+            assert [row["ID"] for row in csv.DictReader(csvfile)] == ["TC101"]
+        assert converter.failed == []
+
+
+@pytest.mark.parametrize("workers", [1, 4])
+def test_convert_to_csv_reports_failed_files(sample_test_cases, workers):
+    """Test that a CSV file that cannot be written does not stop the other files."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir, csv_workers=workers)
+        blocked_path = converter.output_path("csv", "test_file1.md")
+        os.makedirs(blocked_path)
+        
+        result = converter.convert_to_csv(sample_test_cases, force=True)
+        assert list(result) == ["test_file2.md"]
+        assert converter.failed == [blocked_path]
+        
+        results = converter.convert_sections(sample_test_cases.items(), formats=["csv", "jsonl"], force=True)
+        assert list(results["csv"]) == ["test_file2.md"]
+        assert results["jsonl"] is not None
+        assert converter.failed == [blocked_path, blocked_path]
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the IDs module.
+"""
+
+import os
+import pytest
+import tempfile
+import sys
+from typer.testing import CliRunner
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from batch import _parse_input_measured, parse_inputs
+from cli import app
+from ids import IdError, IdGap, IdIndex, IdLocation, case_id
+from parser import TestCaseParser
+from records import compact_case
+
+SAMPLE_MARKDOWN = """# Spec
+
+### TestCases (login.md)
+- ID: TC001
+  Name: Login
+- ID: TC002
+  Name: Logout
+
+### TestCases (search.md)
+- ID: TC005
+  Name: Search
+- Name: Search without ID
+- ID: TC001
+  Name: Login again
+"""
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+@pytest.fixture
+def md_path(temp_dir):
+    """Write the sample markdown to a file."""
+    path = os.path.join(temp_dir, "spec.md")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_MARKDOWN)
+    return path
+
+
+def test_case_id():
+    """Test that IDs are read from dictionaries with any key casing and from records."""
+    assert case_id({"ID": 7}) == "7"
+    assert case_id({"id": " TC001 "}) == "TC001"
+    assert case_id({"Name": "No ID"}) is None
+    assert case_id({"ID": ""}) is None
+    assert case_id(compact_case({"ID": "TC002", "Name": "Record"})) == "TC002"
+    assert case_id("not a test case") is None
+
+
+def test_parser_builds_index(md_path):
+    """Test that the parser indexes each section with the line of its heading."""
+    index = IdIndex()
+    TestCaseParser(id_index=index, compact=True).parse_file(md_path)
+    assert index.locations["TC001"] == IdLocation(md_path, "login.md", 3, 1)
+    assert index.locations["TC005"] == IdLocation(md_path, "search.md", 9, 1)
+    assert index.missing == [IdLocation(md_path, "search.md", 9, 2)]
+    assert [(test_case_id, later.position) for test_case_id, _, later in index.duplicates] == [("TC001", 3)]
+    assert index.gaps() == [IdGap("TC", 3, 4, 3)]
+    assert str(index.gaps()[0]) == "TC003..TC004"
+    assert index.report() == (1, 1, 1)
+
+
+def test_gaps_skip_sparse_numbering():
+    """Test that single missing numbers are reported and sparsely numbered prefixes are not checked."""
+    index = IdIndex()
+    index.add_ids("a.md", "a", 1, ("A-1", "A-3", "B1", "B1000", "misc"))
+    assert [str(gap) for gap in index.gaps()] == ["A-2"]
+
+
+def test_strict_index_fails_fast(md_path):
+    """Test that a strict index stops parsing at the first problem."""
+    with pytest.raises(IdError, match="without ID"):
+        TestCaseParser(id_index=IdIndex(strict=True)).parse_file(md_path)
+        
+    yaml_path = os.path.join(os.path.dirname(md_path), "spec.yaml")
+    with open(yaml_path, "w", encoding="utf-8") as f:
+        f.write("a.md:\n  - ID: TC001\nb.md:\n  - ID: TC001\n")
+    with pytest.raises(IdError, match="Duplicate ID TC001"):
+        TestCaseParser(id_index=IdIndex(strict=True)).parse_yaml_file(yaml_path)
+
+
+def test_parallel_parsing_merges_indexes(temp_dir):
+    """Test that the indexes of worker processes are merged in input order."""
+    paths = []
+    for number in range(3):
+        path = os.path.join(temp_dir, f"spec{number}.md")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"### TestCases (part{number}.md)\n- ID: TS{number}\n- ID: TC001\n")
+        paths.append(path)
+    index = IdIndex()
+    parse_inputs(paths, jobs=2, id_index=index)
+    assert index.locations["TC001"].source == paths[0]
+    assert [later.source for _, _, later in index.duplicates] == paths[1:]
+    
+    with open(paths[1], "a", encoding="utf-8") as f:
+        f.write("- ID: TS1\n")
+    with pytest.raises(IdError, match=f"Duplicate ID TS1 in {paths[1]}"):
+        _parse_input_measured(paths[1], index_ids=True, strict_ids=True)
+    with pytest.raises(IdError, match="Duplicate ID"):
+        parse_inputs(paths, jobs=2, id_index=IdIndex(strict=True))
+
+
+def test_saved_index_checks_new_files(temp_dir, md_path):
+    """Test that a saved index is reloaded, and that sections parsed again replace their entries."""
+    index_path = os.path.join(temp_dir, "ids.json")
+    index = IdIndex()
+    TestCaseParser(id_index=index).parse_file(md_path)
+    index.save(index_path)
+    
+    loaded = IdIndex.load(index_path)
+    assert loaded.locations == index.locations
+    assert len(loaded.duplicates) == 1
+    with pytest.raises(IdError, match="without ID"):
+        IdIndex.load(index_path, strict=True)
+        
+    loaded = IdIndex.load(index_path, strict=True, forget={md_path: {"login.md"}})
+    assert set(loaded.locations) == {"TC001", "TC002"}
+    with pytest.raises(IdError, match="first defined in"):
+        loaded.add_section("new.md", "new.md", [{"ID": "TC002"}])
+        
+    with open(index_path, "w", encoding="utf-8") as f:
+        f.write("not json")
+    assert len(IdIndex.load(index_path)) == 0
+
+
+def test_cli_ids(temp_dir, md_path):
+    """Test the --strict-ids and --id-index options."""
+    runner = CliRunner()
+    output_dir = os.path.join(temp_dir, "output")
+    index_path = os.path.join(temp_dir, "ids.json")
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--force", "--strict-ids"])
+    assert result.exit_code == 1
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write("### TestCases (login.md)\n- ID: TC001\n  Name: Login\n")
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--force", "--id-index", index_path])
+    assert result.exit_code == 0
+    assert set(IdIndex.load(index_path).locations) == {"TC001"}
+    
+    new_path = os.path.join(temp_dir, "new.md")
+    with open(new_path, "w", encoding="utf-8") as f:
+        f.write("### TestCases (other.md)\n- ID: TC001\n  Name: Copy\n")
+    result = runner.invoke(app, [
+        "convert", "-i", new_path, "-o", output_dir, "--force", "--id-index", index_path, "--strict-ids",
+    ])
+    assert result.exit_code == 1
+
+
+def test_cli_strict_ids_checks_kept_outputs(temp_dir, md_path):
+    """Test that --strict-ids fails on a rerun that keeps every output, since all sections are still checked."""
+    runner = CliRunner()
+    output_dir = os.path.join(temp_dir, "output")
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir])
+    assert result.exit_code == 0
+    assert "Duplicate ID TC001" in result.stdout
+    
+    for options in ([], ["--overwrite", "if-changed"], ["--id-index", os.path.join(temp_dir, "ids.json")]):
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--strict-ids", *options])
+        assert result.exit_code == 1
+        assert "nothing to convert" not in result.stdout
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the OutputManifest class and skipping unchanged outputs.
+"""
+
+import os
+import json
+import pytest
+import tempfile
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from converter import TestCaseConverter
+from manifest import OutputManifest
+from parser import TestCaseParser
+
+SAMPLE_MARKDOWN = """### TestCases (login.md)
+- ID: TC001
+  Name: Login
+  Priority: High
+
+### TestCases (logout.md)
+- ID: TC101
+  Name: Logout
+"""
+
+
+@pytest.fixture
+def output_dir():
+    """Create a temporary output directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+@pytest.fixture
+def test_cases():
+    """Parsed sample test cases."""
+    return TestCaseParser().parse_content(SAMPLE_MARKDOWN)
+
+
+def _age(*paths):
+    """Set an old modification time on files, so that rewriting them is detected."""
+    for path in paths:
+        os.utime(path, (1000, 1000))
+
+
+def test_converter_skips_unchanged_csv(output_dir, test_cases):
+    """Test that unchanged CSV files are not rewritten."""
+    converter = TestCaseConverter(output_dir=output_dir)
+    result = converter.convert_to_csv(test_cases, force=True)
+    login_path = result["login.md"]
+    logout_path = result["logout.md"]
+    _age(login_path, logout_path)
+    
+    test_cases["logout.md"][0]["Name"] = "Sign out"
+    converter = TestCaseConverter(output_dir=output_dir)
+    result = converter.convert_to_csv(test_cases, force=True)
+    
+    assert result == {"login.md": login_path, "logout.md": logout_path}
+    assert os.path.getmtime(login_path) == 1000
+    assert os.path.getmtime(logout_path) != 1000
+    assert converter.written == [logout_path]
+    assert converter.skipped == [login_path]
+    with open(logout_path, encoding="utf-8") as f:
+        assert "Sign out" in f.read()
+
+
+def test_unchanged_outputs_do_not_prompt(output_dir, test_cases, monkeypatch):
+    """Test that unchanged outputs are skipped without asking, and changed ones are asked about."""
+    TestCaseConverter(output_dir=output_dir).convert(test_cases, formats=["csv", "xlsx", "jsonl"], force=True)
+    
+    def fail(_):
+        raise AssertionError("Unexpected prompt")
+
+    monkeypatch.setattr("builtins.input", fail)
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.convert(test_cases, formats=["csv", "xlsx", "jsonl"])
+    assert converter.written == []
+    assert len(converter.skipped) == 4
+
+    monkeypatch.setattr("builtins.input", lambda _: "n")
+    test_cases["login.md"][0]["Name"] = "Sign in"
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.convert(test_cases, formats=["csv", "jsonl"])
+    assert converter.written == []
+    assert len(converter.skipped) == 3
+
+
+def test_unchanged_excel_is_not_built(output_dir, test_cases, monkeypatch):
+    """Test that the workbook of an unchanged Excel file is never created."""
+    excel_path = TestCaseConverter(output_dir=output_dir).convert_to_excel(test_cases, force=True)
+    _age(excel_path)
+    
+    import openpyxl
+    
+    def fail(*args, **kwargs):
+        raise AssertionError("Workbook built")
+
+    monkeypatch.setattr(openpyxl, "Workbook", fail)
+    assert TestCaseConverter(output_dir=output_dir).convert_to_excel(test_cases, force=True) == excel_path
+    assert os.path.getmtime(excel_path) == 1000
+
+
+def test_streamed_outputs_skip_unchanged(output_dir, test_cases):
+    """Test that streamed single-file outputs keep unchanged files and leave no temporary files."""
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.convert_sections(test_cases.items(), formats=["xlsx", "jsonl"], force=True)
+    paths = [os.path.join(output_dir, name) for name in ("test_cases.xlsx", "test_cases.jsonl")]
+    assert converter.written == paths
+    _age(*paths)
+    
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.convert_sections(test_cases.items(), formats=["xlsx", "jsonl"], force=True)
+    assert converter.skipped == paths
+    assert all(os.path.getmtime(path) == 1000 for path in paths)
+    
+    # The digest of a streamed output matches the one computed before writing
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.convert(test_cases, formats=["xlsx", "jsonl"], force=True)
+    assert converter.skipped == paths
+    assert not [name for name in os.listdir(output_dir) if name.endswith(".tmp")]
+
+
+def test_manifest_checks_size_and_version(output_dir, test_cases):
+    """Test that edited outputs and manifests of another version are not trusted."""
+    converter = TestCaseConverter(output_dir=output_dir)
+    csv_path = converter.convert_to_csv(test_cases, force=True)["login.md"]
+    manifest_path = os.path.join(output_dir, OutputManifest.FILE_NAME)
+    
+    with open(csv_path, "a", encoding="utf-8") as f:
+        f.write("edited\n")
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.convert_to_csv(test_cases, force=True)
+    assert csv_path in converter.written
+    
+    with open(manifest_path, encoding="utf-8") as f:
+        data = json.load(f)
+    assert set(data["outputs"]) == {"login.csv", "logout.csv"}
+    data["version"] = "0.0.0"
+    with open(manifest_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    assert not OutputManifest(output_dir).is_unchanged(csv_path, data["outputs"]["login.csv"]["digest"])
+    
+    converter = TestCaseConverter(output_dir=output_dir, skip_unchanged=False)
+    converter.convert_to_csv(test_cases, force=True)
+    assert len(converter.written) == 2
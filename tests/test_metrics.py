@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the metrics module.
+"""
+
+import os
+import pstats
+import sys
+import tempfile
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics import Metrics, profiled
+from parser import TestCaseParser
+from converter import TestCaseConverter
+
+
+SAMPLE_MARKDOWN = """# Spec
+
+### TestCases (first.md)
+- ID: TC001
+  Name: First
+- ID: TC002
+  Name: Second
+
+### TestCases (second.md)
+- ID: TC101
+  Name: Third
+"""
+
+
+def test_stage_records():
+    """Test that stages are recorded with their counts and summed in pipeline order."""
+    metrics = Metrics()
+    with metrics.stage("write", "out.csv") as record:
+        record["cases"] = 2
+    with metrics.stage("yaml", "first.md", size=10) as record:
+        record["cases"] = 3
+    assert list(metrics.timed_iter("scan", "spec.md", iter([1, 2]), size=100)) == [1, 2]
+    
+    summary = metrics.summary()
+    assert list(summary) == ["scan", "yaml", "write"]
+    assert summary["yaml"]["cases"] == 3
+    assert summary["scan"]["bytes"] == 100
+    assert "total" in metrics.format_table()
+    
+    disabled = Metrics(enabled=False)
+    with disabled.stage("yaml") as record:
+        record["cases"] = 1
+    assert list(disabled.timed_iter("scan", "", [1])) == [1]
+    assert disabled.records == []
+
+
+def test_parser_and_converter_stages():
+    """Test that a parse and conversion records every stage per section and output."""
+    metrics = Metrics()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "spec.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(SAMPLE_MARKDOWN)
+        
+        test_cases = TestCaseParser(metrics=metrics).parse_file(md_path)
+        converter = TestCaseConverter(output_dir=os.path.join(temp_dir, "out"), metrics=metrics)
+        converter.convert(test_cases, force=True)
+    
+    summary = metrics.summary()
+    assert list(summary) == ["read", "scan", "yaml", "normalize", "write", "save"]
+    assert summary["yaml"]["count"] == 2
+    assert summary["yaml"]["cases"] == 3
+    assert summary["read"]["bytes"] == len(SAMPLE_MARKDOWN.encode("utf-8"))
+    assert {record["target"] for record in metrics.records if record["stage"] == "yaml"} == {"first.md", "second.md"}
+
+
+def test_profiled():
+    """Test that CPU and memory profiles are written to the output directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        with profiled("cpu", temp_dir) as cpu_path:
+            sum(range(1000))
+        assert pstats.Stats(cpu_path).total_calls > 0
+        
+        with profiled("memory", temp_dir) as memory_path:
+            [str(i) for i in range(1000)]
+        with open(memory_path, encoding="utf-8") as f:
+            assert f.readline().startswith("Current:")
+        
+        with profiled(None, temp_dir) as no_path:
+            pass
+        assert no_path is None
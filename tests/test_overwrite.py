@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the overwrite module.
+"""
+
+import os
+import pytest
+import tempfile
+import sys
+from typer.testing import CliRunner
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli import app
+from converter import TestCaseConverter
+from overwrite import plan_overwrites, scan_input_sections
+from parser import TestCaseParser
+
+SAMPLE_MARKDOWN = """### TestCases (login.md)
+- ID: TC001
+  Name: Login
+
+### TestCases (logout.md)
+- ID: TC101
+  Name: Logout
+"""
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        yield temp_dir
+
+
+@pytest.fixture
+def md_path(temp_dir):
+    """Write the sample markdown to a file."""
+    path = os.path.join(temp_dir, "spec.md")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_MARKDOWN)
+    return path
+
+
+def _convert(md_path, output_dir, policy, prompt=None, formats=("csv", "xlsx")):
+    """Plan the outputs of the sample file, then parse and convert the sections the plan needs."""
+    converter = TestCaseConverter(output_dir=output_dir, overwrite=policy)
+    plan = plan_overwrites(
+        [md_path], converter.output_path, formats, policy=policy, manifest=converter.manifest,
+        prompt=prompt or input,
+    )
+    converter.apply_overwrite_plan(plan)
+    parser = TestCaseParser(skip_sections=plan.skip_sections)
+    test_cases = parser.parse_file(md_path)
+    converter.convert(test_cases, formats=formats)
+    return plan, test_cases, converter
+
+
+def test_missing_outputs_are_written(temp_dir, md_path):
+    """Test that outputs that do not exist yet are written under every policy."""
+    output_dir = os.path.join(temp_dir, "output")
+    plan, test_cases, converter = _convert(md_path, output_dir, "never")
+    assert all(plan.decisions.values())
+    assert plan.skip_sections == {}
+    assert set(test_cases) == {"login.md", "logout.md"}
+    assert len(converter.written) == 3
+
+
+def test_if_changed_skips_parsing_unchanged_sections(temp_dir, md_path):
+    """Test that only the outputs of edited sections are written, and the other sections are not parsed."""
+    output_dir = os.path.join(temp_dir, "output")
+    _convert(md_path, output_dir, "always")
+    
+    plan, test_cases, converter = _convert(md_path, output_dir, "if-changed")
+    assert not any(plan.decisions.values())
+    assert test_cases == {}
+    assert converter.written == []
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_MARKDOWN.replace("Name: Logout", "Name: Sign out"))
+    plan, test_cases, converter = _convert(md_path, output_dir, "if-changed")
+    assert plan.kept == [os.path.join(output_dir, "login.csv")]
+    assert plan.skip_sections == {}
+    assert sorted(os.path.basename(path) for path in converter.written) == ["logout.csv", "test_cases.xlsx"]
+
+
+def test_if_changed_skips_sections_of_kept_csv_files(temp_dir, md_path):
+    """Test that a section whose only output is kept is not parsed."""
+    output_dir = os.path.join(temp_dir, "output")
+    _convert(md_path, output_dir, "always", formats=["csv"])
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_MARKDOWN.replace("Name: Logout", "Name: Sign out"))
+    plan, test_cases, converter = _convert(md_path, output_dir, "if-changed", formats=["csv"])
+    assert plan.skip_sections == {md_path: frozenset({"login.md"})}
+    assert list(test_cases) == ["logout.md"]
+    assert converter.written == [os.path.join(output_dir, "logout.csv")]
+
+
+def test_always_rewrites_unchanged_outputs(temp_dir, md_path):
+    """Test that "always" parses and rewrites the outputs that "if-changed" keeps."""
+    output_dir = os.path.join(temp_dir, "output")
+    _convert(md_path, output_dir, "always")
+    plan, _, converter = _convert(md_path, output_dir, "if-changed")
+    assert converter.written == []
+    
+    plan, test_cases, converter = _convert(md_path, output_dir, "always")
+    assert all(plan.decisions.values())
+    assert set(test_cases) == {"login.md", "logout.md"}
+    assert len(converter.written) == 3
+    assert converter.skipped == []
+
+
+def test_ask_prompts_before_any_work(temp_dir, md_path):
+    """Test that all questions are asked while planning and answers can apply to the remaining files."""
+    output_dir = os.path.join(temp_dir, "output")
+    _convert(md_path, output_dir, "always")
+    plan, _, _ = _convert(md_path, output_dir, "ask", prompt=pytest.fail)
+    assert not any(plan.decisions.values())
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_MARKDOWN.replace("TC", "TS"))
+    questions = []
+    
+    def prompt(question):
+        questions.append(question)
+        return "n" if len(questions) == 1 else "all"
+
+    plan, _, converter = _convert(md_path, output_dir, "ask", prompt=prompt)
+    assert len(questions) == 2
+    assert plan.kept == [os.path.join(output_dir, "login.csv")]
+    assert converter.skipped[0] == os.path.join(output_dir, "login.csv")
+
+
+def test_if_newer_compares_modification_times(temp_dir, md_path):
+    """Test that outputs older than their input are overwritten."""
+    output_dir = os.path.join(temp_dir, "output")
+    _convert(md_path, output_dir, "always")
+    
+    converter = TestCaseConverter(output_dir=output_dir)
+    plan = plan_overwrites([md_path], converter.output_path, ["csv"], policy="if-newer")
+    assert not any(plan.decisions.values())
+    
+    os.utime(os.path.join(output_dir, "login.csv"), (1000, 1000))
+    plan = plan_overwrites([md_path], converter.output_path, ["csv"], policy="if-newer")
+    assert plan.kept == [os.path.join(output_dir, "logout.csv")]
+
+
+def test_scan_yaml_sections(temp_dir):
+    """Test that the sections of a YAML file are found without loading it."""
+    yaml_path = os.path.join(temp_dir, "spec.yaml")
+    with open(yaml_path, "w", encoding="utf-8") as f:
+        f.write("# Test cases\nlogin.md:\n  - ID: TC001\n    Name: 'a: b'\n\"logout.md\":\n  - ID: TC101\n")
+    sections = scan_input_sections(yaml_path)
+    assert [name for name, _ in sections] == ["login.md", "logout.md"]
+    
+    with pytest.raises(ValueError, match="Unknown overwrite policy"):
+        plan_overwrites([yaml_path], TestCaseConverter(output_dir=temp_dir).output_path, ["csv"], policy="sometimes")
+
+
+def test_cli_overwrite_policy(temp_dir, md_path):
+    """Test the --overwrite option, and that existing outputs are kept without a terminal."""
+    runner = CliRunner()
+    output_dir = os.path.join(temp_dir, "output")
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--overwrite", "if-changed"])
+    assert result.exit_code == 0
+    assert "3 outputs written" in result.stdout
+    
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--overwrite", "if-changed"])
+    assert result.exit_code == 0
+    assert "nothing to convert" in result.stdout
+    assert "0 outputs written, 3 unchanged or skipped" in result.stdout
+    
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir])
+    assert result.exit_code == 0
+    assert "existing output files are kept" in result.stdout
+    
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "--overwrite", "maybe"])
+    assert result.exit_code != 0
+
+
+def test_cli_ask_without_terminal_warns(temp_dir, md_path):
+    """Test that "ask" keeps existing outputs with a warning when stdin is not a terminal."""
+    runner = CliRunner()
+    output_dir = os.path.join(temp_dir, "output")
+    runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-F"])
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(SAMPLE_MARKDOWN.replace("Name: Logout", "Name: Sign out"))
+        
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir], input="y\n")
+    assert result.exit_code == 0
+    assert "WARNING" in result.stdout
+    assert "Input is not a terminal, so existing output files are kept" in result.stdout
+    assert "0 outputs written" in result.stdout
@@ -5,6 +5,7 @@
 Tests for the TestCaseParser class.
 """
 
+import io
 import os
 import pytest
 from pathlib import Path
@@ -14,7 +15,7 @@ import sys
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from parser import TestCaseParser
+from parser import TestCaseParser, scan_sections, scan_mapped_sections
 
 
 @pytest.fixture
@@ -170,3 +171,216 @@ def test_parse_non_existent_file(parser):
     """Test parsing a non-existent file."""
     result = parser.parse_file("non_existent_file.md")
     assert result == {}
+
+
+def test_scan_sections_line_numbers(sample_markdown):
+    """Test that sections are reported with their line ranges."""
+    sections = list(scan_sections(sample_markdown.splitlines(keepends=True)))
+    
+    assert [section.name for section in sections] == ["sample_file.md", "another_file.md"]
+    assert (sections[0].start_line, sections[0].end_line) == (5, 21)
+    assert (sections[1].start_line, sections[1].end_line) == (22, 27)
+    assert sections[0].content.startswith("- ID: TC001")
+    assert sections[0].content.endswith("Priority: Medium")
+
+
+def test_scan_sections_ignores_code_fences(parser):
+    """Test that headings inside code fences and block scalars do not end a section."""
+    markdown = """# Spec
+
+```markdown
+### TestCases (example.md)
+- ID: EX001
+```
+
+### TestCases (fenced.md)
+- ID: TC001
+  Test Steps: |
+    ### Not a heading
+    1. Step one
+  Expected Result: Checked by step###2
+
+## Next chapter
+- ID: TC999
+"""
+    sections = list(scan_sections(markdown.splitlines(keepends=True)))
+    assert [section.name for section in sections] == ["fenced.md"]
+    assert (sections[0].start_line, sections[0].end_line) == (8, 14)
+    
+    result = parser.parse_content(markdown, "fenced_source.md")
+    assert list(result) == ["fenced.md"]
+    assert result["fenced.md"][0]["Test Steps"] == "### Not a heading\n1. Step one\n"
+    assert result["fenced.md"][0]["Expected Result"] == "Checked by step###2"
+
+
+def test_parse_content_parallel(sample_markdown):
+    """Test that parallel section parsing keeps section order and results."""
+    invalid_section = """
+### TestCases (invalid.md)
+- ID: TC900
+  Test Steps:
+  - Wrong indentation
+    Expected Result: Fails
+"""
+    content = sample_markdown + invalid_section
+    
+    serial = TestCaseParser(verbose=True).parse_content(content, "serial_source.md")
+    parallel = TestCaseParser(verbose=True, section_workers=2, parallel_threshold=0).parse_content(
+        content, "parallel_source.md"
+    )
+    
+    assert list(parallel) == ["sample_file.md", "another_file.md"]
+    assert parallel == serial
+
+
+def test_parse_content_parallel_threshold(sample_markdown, monkeypatch):
+    """Test that documents below the size threshold are parsed serially."""
+    parser = TestCaseParser(section_workers=2)
+    
+    def fail(sections):
+        raise AssertionError("small documents should not use worker processes")
+    
+    monkeypatch.setattr(parser, "_load_sections_parallel", fail)
+    assert len(parser.parse_content(sample_markdown)) == 2
+
+
+def test_iter_sections(parser, sample_markdown):
+    """Test that sections are yielded one at a time while the file is read."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", delete=False) as temp_file:
+        temp_file.write(sample_markdown + "### TestCases (bad.md)\n- ID: [unclosed\n")
+        temp_path = temp_file.name
+    
+    try:
+        sections = parser.iter_sections(temp_path)
+        file_name, cases = next(sections)
+        assert file_name == "sample_file.md"
+        assert [case["ID"] for case in cases] == ["TC001", "TC002"]
+        
+        assert dict(sections) == {"another_file.md": parser.parse_file(temp_path)["another_file.md"]}
+        
+        cases = list(parser.iter_cases(temp_path))
+        assert [(file_name, case["ID"]) for file_name, case in cases] == [
+            ("sample_file.md", "TC001"), ("sample_file.md", "TC002"), ("another_file.md", "TC101"),
+        ]
+    finally:
+        os.unlink(temp_path)
+    
+    assert list(parser.iter_sections("non_existent_file.md")) == []
+
+
+def test_scan_mapped_sections_matches_text_scan(sample_markdown):
+    """Test that the bytes-level scanner finds the same sections as the line scanner."""
+    fenced = """
+~~~
+### TestCases (hidden.md)
+~~~
+### TestCases (日本語.md) - ID: JP001
+  Name: ログイン
+    ### indented heading
+# Title"""
+    for content in (sample_markdown, sample_markdown + fenced, (sample_markdown + fenced).replace("\n", "\r\n")):
+        expected = list(scan_sections(io.StringIO(content, newline=None)))
+        assert list(scan_mapped_sections(content.encode("utf-8"))) == expected
+    
+    assert [section.name for section in expected] == ["sample_file.md", "another_file.md", "日本語.md"]
+
+
+def test_parse_file_mmap(sample_markdown):
+    """Test that files above the mmap threshold are parsed through a memory map."""
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".md", encoding="utf-8", delete=False) as temp_file:
+        temp_file.write(sample_markdown)
+        temp_path = temp_file.name
+    
+    try:
+        mapped_parser = TestCaseParser(mmap_threshold=1)
+        calls = []
+        original = mapped_parser.parse_mapped_file
+        mapped_parser.parse_mapped_file = lambda path: calls.append(path) or original(path)
+        
+        assert mapped_parser.parse_file(temp_path) == TestCaseParser().parse_file(temp_path)
+        assert calls == [temp_path]
+    finally:
+        os.unlink(temp_path)
+
+
+_FLAT_KEYS = ["ID", "Name", "Test Steps", "Pre-conditions", "Comments/Notes", "yes", "No", "1", "null", "C#", "<<"]
+
+_FLAT_VALUES = [
+    "Login", "Convert 32°F to Celsius", "通常の変換", "32", "-40", "0.0", "1e3", "0x1F", "012", "1_000", "10:30",
+    "2025-04-05", "2025-04-05 10:00:00", "yes", "No", "on", "OFF", "true", "~", "null", "", "a:b", "C#",
+    '"quoted: text"', "'it''s'", "-x", ".5", "+1", "x  ", "1. Step \\n2. Step", "-40°F and -40°C",
+]
+
+_ODD_VALUES = [
+    "a: b", "a #b", "end:", '"a\\nb"', "'unterminated", '"x" y', "&anchor x", "*alias", "!tag x", "[1, 2]",
+    "{a: 1}", "- x", "? x", ":x", "@x", "`x`", "%x", ",x", "=",
+]
+
+_BLOCK_LINES = ["1. Step one", "- item", "# not a comment", "key: value", "  more indented", "", "text  "]
+
+
+def _flat_document(rng):
+    """Generate a section mostly in the flat test case shape, with occasional constructs it does not handle."""
+    lines = []
+    item_indent = " " * rng.choice([0, 0, 2])
+    for number in range(rng.randint(1, 4)):
+        prefix = item_indent + rng.choice(["- ", "- ", "-  "])
+        key_indent = " " * len(prefix)
+        for key_number in range(rng.randint(1, 5)):
+            key = "ID" if key_number == 0 else rng.choice(_FLAT_KEYS)
+            roll = rng.random()
+            if roll < 0.2:
+                lines.append(f"{prefix}{key}: {rng.choice(['|', '|-', '|+', '>', '>-', '>+', '|2'])}")
+                block_indent = key_indent + rng.choice(["  ", "  ", " "])
+                lines.extend(
+                    block_indent + rng.choice(_BLOCK_LINES) if rng.random() < 0.9 else ""
+                    for _ in range(rng.randint(1, 4))
+                )
+            else:
+                value = f"TC{number:03d}" if key_number == 0 and roll < 0.8 else rng.choice(
+                    _FLAT_VALUES if rng.random() < 0.95 else _ODD_VALUES
+                )
+                lines.append(f"{prefix}{key}: {value}".rstrip() if rng.random() < 0.9 else f"{prefix}{key}:")
+            noise = rng.random()
+            if noise < 0.05:
+                lines.append("")
+            elif noise < 0.08:
+                lines.append(rng.choice([" " * rng.randint(0, 6) + "# comment", key_indent + "  nested: x", "---"]))
+            elif noise < 0.09:
+                lines.append(key_indent + "Tab:\tvalue")
+            prefix = key_indent
+    # The scanner strips section contents
+    return "\n".join(lines).strip()
+
+
+def test_parse_flat_yaml_matches_safe_load():
+    """Test on generated sections that the flat parser either declines or returns what yaml.safe_load returns."""
+    import random
+    import yaml
+    from parser import parse_flat_yaml
+    
+    rng = random.Random(0)
+    handled = 0
+    for _ in range(3000):
+        content = _flat_document(rng)
+        try:
+            expected = yaml.safe_load(content)
+        except yaml.YAMLError:
+            expected = yaml.YAMLError
+        parsed = parse_flat_yaml(content)
+        if parsed is not None:
+            handled += 1
+            assert parsed == expected, content
+    assert handled > 300
+
+
+def test_fast_path_falls_back(parser):
+    """Test that sections the flat parser declines are still loaded, and YAML errors are still reported."""
+    flat = "- ID: TC001\n  Name: Login\n  Steps: |\n    1. Open\n    2. Submit\n"
+    nested = "- ID: TC001\n  Data: [1, 2]\n  Meta:\n    owner: QA\n"
+    invalid = "- ID: TC001\n  Name: [unclosed\n"
+    for content in (flat, nested):
+        markdown = f"### TestCases (a.md)\n{content}"
+        assert parser.parse_content(markdown) == TestCaseParser(fast_path=False).parse_content(markdown)
+    assert parser.parse_content(f"### TestCases (a.md)\n{nested}")["a.md"][0]["Meta"] == {"owner": "QA"}
+    assert parser.parse_content(f"### TestCases (a.md)\n{invalid}") == {}
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the pipeline module.
+"""
+
+import os
+import pytest
+import tempfile
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import TestCaseParser
+from converter import TestCaseConverter
+from pipeline import run_pipeline
+
+
+@pytest.fixture
+def spec_dir():
+    """Create markdown and YAML input files sharing a section name."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        files = {
+            "a.md": (
+                "### TestCases (login.md)\n- ID: TC001\n  Name: Login\n"
+                "### TestCases (logout.md)\n- ID: TC101\n  Name: Logout\n- ID: TC102\n  Name: Logout again\n"
+            ),
+            "b.yaml": "login.md:\n  - ID: TC002\n    Name: Login again\n",
+        }
+        for name, content in files.items():
+            with open(os.path.join(temp_dir, name), "w", encoding="utf-8") as f:
+                f.write(content)
+        yield temp_dir
+
+
+def _read(path):
+    """Return the content of a text file."""
+    with open(path, encoding="utf-8") as f:
+        return f.read()
+
+
+def test_run_pipeline_matches_convert(spec_dir):
+    """Test that the pipeline writes the same outputs as a parse followed by a conversion."""
+    md_path = os.path.join(spec_dir, "a.md")
+    parser = TestCaseParser()
+    
+    pipelined = TestCaseConverter(output_dir=os.path.join(spec_dir, "pipelined"))
+    result = run_pipeline([md_path], parser, pipelined, formats=["csv", "jsonl"], force=True, queue_size=1)
+    
+    serial = TestCaseConverter(output_dir=os.path.join(spec_dir, "serial"))
+    serial.convert(parser.parse_file(md_path), formats=["csv", "jsonl"], force=True)
+    
+    assert (result.sections, result.cases) == (2, 3)
+    assert sorted(result.outputs["csv"]) == ["login.md", "logout.md"]
+    for name in ("login.csv", "logout.csv", "test_cases.jsonl"):
+        assert _read(os.path.join(spec_dir, "pipelined", name)) == _read(os.path.join(spec_dir, "serial", name))
+
+
+def test_run_pipeline_conflicts(spec_dir):
+    """Test the conflict policies on a section name found in two files."""
+    files = [os.path.join(spec_dir, "a.md"), os.path.join(spec_dir, "b.yaml")]
+    converter = TestCaseConverter(output_dir=os.path.join(spec_dir, "output"))
+    
+    with pytest.raises(ValueError, match="login.md is defined in both"):
+        run_pipeline(files, TestCaseParser(), converter, formats=["csv"], force=True)
+    with pytest.raises(ValueError, match="merge"):
+        run_pipeline(files, TestCaseParser(), converter, on_conflict="merge")
+        
+    result = run_pipeline(files, TestCaseParser(), converter, formats=["csv"], force=True, on_conflict="suffix")
+    assert list(result.outputs["csv"]) == ["login.md", "logout.md", "login_2.md"]
+    assert "TC002" in _read(result.outputs["csv"]["login_2.md"])
+
+
+def test_run_pipeline_parser_error(spec_dir):
+    """Test that an error raised by the parser thread reaches the caller."""
+    class FailingParser(TestCaseParser):
+        def iter_sections(self, file_path):
+            yield from super().iter_sections(file_path)
+            raise RuntimeError("broken input")
+
+    converter = TestCaseConverter(output_dir=os.path.join(spec_dir, "output"))
+    with pytest.raises(RuntimeError, match="broken input"):
+        run_pipeline([os.path.join(spec_dir, "a.md")], FailingParser(), converter, formats=["csv"], force=True)
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the records module.
+"""
+
+import os
+import pickle
+import pytest
+import tempfile
+import sys
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from records import TEST_CASE_FIELDS, TestCaseRecord, compact_case, compact_cases
+from converter import TestCaseConverter, normalize_case
+from parser import TestCaseParser
+
+
+@pytest.fixture
+def case():
+    """Test case with lowercase, duplicate and extra keys."""
+    return {"id": "TC001", "Name": "Login", "name": "login", "Priority": "High", "Owner": "QA", 3: None}
+
+
+def test_compact_case_mapping_view(case):
+    """Test that a record behaves like the dictionary it was built from."""
+    record = compact_case(case)
+    
+    assert isinstance(record, TestCaseRecord)
+    assert record == case
+    assert case == record
+    assert list(record) == list(case)
+    assert len(record) == len(case)
+    assert record["id"] == "TC001"
+    assert record["name"] == "login"
+    assert record[3] is None
+    assert record.get("ID") is None
+    assert "ID" not in record
+    assert "Owner" in record
+    with pytest.raises(KeyError):
+        record["Desc"]
+    assert dict(record) == case
+
+
+def test_compact_case_row(case):
+    """Test that the row holds the normalized values in field order."""
+    record = compact_case(case)
+    
+    assert len(record.row) == len(TEST_CASE_FIELDS)
+    assert record.row == normalize_case(case)
+    assert normalize_case(record) is record.row
+    assert normalize_case(record, ["Owner", "ID"]) == ("QA", "TC001")
+    assert record.extra == {"name": "login", "Owner": "QA", 3: None}
+
+
+def test_compact_cases_share_shape():
+    """Test that records with the same keys share their shape and keep non-dictionary items."""
+    records = compact_cases([{"ID": "TC001"}, {"ID": "TC002"}, "not a case"])
+    
+    assert records[0].shape is records[1].shape
+    assert records[0].extra is None
+    assert records[2] == "not a case"
+    
+    restored = pickle.loads(pickle.dumps(records))
+    assert restored == records
+    assert restored[0].shape is records[0].shape
+
+
+def test_parser_compact_mode():
+    """Test that compact parsing produces the same outputs as dictionaries."""
+    content = (
+        "### TestCases (login.md)\n"
+        "- ID: TC001\n  Name: Login\n  Owner: QA\n"
+        "- id: TC002\n  name: Login again\n  Priority: Low\n"
+    )
+    parsed = TestCaseParser().parse_content(content)
+    compacted = TestCaseParser(compact=True).parse_content(content)
+    
+    assert compacted == parsed
+    assert all(isinstance(record, TestCaseRecord) for record in compacted["login.md"])
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        converter = TestCaseConverter(output_dir=temp_dir)
+        first = converter.convert_to_csv(parsed, force=True)["login.md"]
+        with open(first, encoding="utf-8") as f:
+            expected = f.read()
+        second = converter.convert_to_csv(compacted, force=True)["login.md"]
+        with open(second, encoding="utf-8") as f:
+            assert f.read() == expected
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the server module.
+"""
+
+import os
+import json
+import socket
+import pytest
+import tempfile
+import threading
+import time
+import sys
+from typer.testing import CliRunner
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cli import app
+from server import ConversionServer, default_socket_path, forward_job, is_own_socket, is_running, send_jobs
+
+SPEC = """### TestCases (login.md)
+- ID: TC001
+  Name: Login
+
+### TestCases (logout.md)
+- ID: TC101
+  Name: Logout
+"""
+
+
+@pytest.fixture
+def workspace():
+    """Create a spec file and an output directory path."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "spec.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(SPEC)
+        yield md_path, os.path.join(temp_dir, "output")
+
+
+@pytest.fixture
+def running_server():
+    """Run a server on a Unix socket in a background thread."""
+    if not hasattr(socket, "AF_UNIX"):
+        pytest.skip("Unix sockets are not supported")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = os.path.join(temp_dir, "mdtc.sock")
+        server = ConversionServer(workers=2)
+        thread = threading.Thread(target=server.serve_socket, args=(socket_path,), daemon=True)
+        thread.start()
+        deadline = time.monotonic() + 5
+        while not is_running(socket_path) and time.monotonic() < deadline:
+            time.sleep(0.01)
+        yield socket_path
+        server.shutdown()
+        thread.join(5)
+
+
+def test_run_job(workspace):
+    """Test running a job and reporting errors as responses."""
+    md_path, output_dir = workspace
+    server = ConversionServer(workers=1)
+    
+    response = server.run_job({"id": 1, "inputs": [md_path], "output_dir": output_dir, "formats": ["csv"]})
+    assert response["status"] == "ok"
+    assert response["id"] == 1
+    assert (response["sections"], response["cases"]) == (2, 2)
+    assert os.path.exists(response["outputs"]["csv"]["login.md"])
+    assert "yaml" in response["metrics"]["stages"]
+    
+    assert server.run_job({"id": 2, "inputs": []})["status"] == "error"
+    response = server.run_job({"id": 3, "inputs": [md_path], "output_dir": output_dir, "formats": ["docx"]})
+    assert response["status"] == "error"
+    assert "Unknown output format" in response["error"]
+    server.shutdown()
+
+
+def test_serve_stream(workspace):
+    """Test that every job line gets one response line."""
+    md_path, output_dir = workspace
+    server = ConversionServer(workers=2)
+    lines = []
+    
+    jobs = [
+        json.dumps({"id": "a", "inputs": [md_path], "output_dir": output_dir + "_a", "formats": ["jsonl"]}),
+        "not json",
+        json.dumps({"id": "b", "inputs": [md_path], "output_dir": output_dir + "_b", "formats": ["csv"]}),
+    ]
+    server.serve_stream(jobs, lines.append)
+    server.shutdown()
+    
+    responses = [json.loads(line) for line in lines]
+    assert sorted(str(response["id"]) for response in responses) == ["None", "a", "b"]
+    assert {response["id"]: response["status"] for response in responses} == {"a": "ok", "b": "ok", None: "error"}
+
+
+def test_serve_socket(running_server, workspace):
+    """Test sending jobs over the socket and forwarding a conversion from the CLI."""
+    md_path, output_dir = workspace
+    
+    responses = list(send_jobs(running_server, [
+        {"id": index, "inputs": [md_path], "output_dir": f"{output_dir}_{index}", "formats": ["csv"]}
+        for index in range(3)
+    ]))
+    assert sorted(response["id"] for response in responses) == [0, 1, 2]
+    assert all(response["status"] == "ok" for response in responses)
+    
+    assert forward_job(running_server + ".missing", {"inputs": [md_path]}) is None
+    
+    result = CliRunner().invoke(app, [
+        "convert", "-i", md_path, "-o", output_dir, "-F", "--server", "--server-socket", running_server, "--timings"
+    ])
+    assert result.exit_code == 0
+    assert "Converted by the server" in result.stdout
+    assert "2 sections, 2 test cases" in result.stdout
+    assert "yaml" in result.stdout
+    assert os.path.exists(os.path.join(output_dir, "test_cases.xlsx"))
+
+
+def test_convert_forwards_only_on_request(running_server, workspace, monkeypatch):
+    """Test that conversions are only forwarded with --server, without local-only options, to an own socket."""
+    md_path, output_dir = workspace
+    runner = CliRunner()
+    monkeypatch.setenv("MDTC_SERVER_SOCKET", running_server)
+    
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-F"])
+    assert result.exit_code == 0
+    assert "Converted by the server" not in result.stdout
+    
+    for options in (["--pipeline"], ["--jobs", "2"], ["--section-workers", "2"], ["--verbose"]):
+        result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-F", "--server"] + options)
+        assert result.exit_code == 0
+        assert "Converted by the server" not in result.stdout
+        assert f"does not support {options[0]}" in result.stdout
+        
+    result = runner.invoke(app, ["convert", "-i", md_path, "-o", output_dir, "-F", "--server"])
+    assert "Converted by the server" in result.stdout
+    
+    assert os.stat(running_server).st_mode & 0o777 == 0o600
+    
+    # A socket created by another user is not trusted
+    monkeypatch.setattr(os, "getuid", lambda: os.stat(running_server).st_uid + 1)
+    assert not is_own_socket(running_server)
+    assert forward_job(running_server, {"inputs": [md_path]}) is None
+
+
+def test_default_socket_path(monkeypatch):
+    """Test that the default socket is in the runtime directory or a per-user temporary directory."""
+    monkeypatch.delenv("MDTC_SERVER_SOCKET", raising=False)
+    with tempfile.TemporaryDirectory() as runtime_dir:
+        monkeypatch.setenv("XDG_RUNTIME_DIR", runtime_dir)
+        assert default_socket_path() == os.path.join(runtime_dir, "mdtc.sock")
+        
+    monkeypatch.delenv("XDG_RUNTIME_DIR")
+    assert default_socket_path() == os.path.join(tempfile.gettempdir(), f"mdtc-{os.getuid()}", "mdtc.sock")
+
+
+def test_no_unix_sockets_without_user_ids(running_server, workspace, monkeypatch):
+    """Test that without os.getuid, as on Windows, conversions stay local and serve asks for --stdio."""
+    md_path, output_dir = workspace
+    runner = CliRunner()
+    monkeypatch.delattr(os, "getuid")
+    assert not is_own_socket(running_server)
+    with pytest.raises(ValueError, match="use --stdio"):
+        default_socket_path()
+        
+    result = runner.invoke(app, [
+        "convert", "-i", md_path, "-o", output_dir, "-F", "--server", "--server-socket", running_server,
+    ])
+    assert result.exit_code == 0
+    assert "Unix sockets are not supported" in result.stdout
+    assert "Converted by the server" not in result.stdout
+    
+    result = runner.invoke(app, ["serve"])
+    assert result.exit_code == 1
+    assert "use --stdio" in result.stdout
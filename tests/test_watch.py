@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Tests for the Watcher class.
+"""
+
+import os
+import pytest
+import tempfile
+import sys
+import openpyxl
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from converter import TestCaseConverter
+from parser import TestCaseParser
+from watch import Watcher
+
+INITIAL = """### TestCases (login.md)
+- ID: TC001
+  Name: Login
+
+### TestCases (logout.md)
+- ID: TC101
+  Name: Logout
+"""
+
+
+@pytest.fixture
+def workspace():
+    """Create a spec file and an output directory."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        md_path = os.path.join(temp_dir, "spec.md")
+        with open(md_path, "w", encoding="utf-8") as f:
+            f.write(INITIAL)
+        yield md_path, os.path.join(temp_dir, "output")
+
+
+def test_watch_regenerates_changed_sections(workspace):
+    """Test that only the outputs of changed sections are regenerated."""
+    md_path, output_dir = workspace
+    watcher = Watcher([md_path], TestCaseParser(), TestCaseConverter(output_dir=output_dir))
+    
+    assert watcher.refresh(watcher.poll()) == ["login.md", "logout.md"]
+    assert watcher.poll() == []
+    
+    login_csv = os.path.join(output_dir, "login.csv")
+    os.utime(login_csv, (1000, 1000))
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(INITIAL.replace("Name: Logout", "Name: Sign out") + "\n### TestCases (signup.md)\n- ID: TC201\n")
+    
+    assert watcher.refresh(watcher.poll()) == ["logout.md", "signup.md"]
+    assert os.path.getmtime(login_csv) == 1000
+    with open(os.path.join(output_dir, "logout.csv"), encoding="utf-8") as f:
+        assert "Sign out" in f.read()
+    
+    workbook = openpyxl.load_workbook(os.path.join(output_dir, "test_cases.xlsx"))
+    assert workbook.sheetnames == ["login", "logout", "signup"]
+    assert workbook["logout"].cell(2, 2).value == "Sign out"
+
+
+def test_watch_removes_deleted_sections(workspace):
+    """Test that the worksheets of removed sections are dropped."""
+    md_path, output_dir = workspace
+    watcher = Watcher([md_path], TestCaseParser(), TestCaseConverter(output_dir=output_dir))
+    watcher.refresh(watcher.poll())
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(INITIAL.split("### TestCases (logout.md)")[0])
+    
+    assert watcher.refresh(watcher.poll()) == []
+    workbook = openpyxl.load_workbook(os.path.join(output_dir, "test_cases.xlsx"))
+    assert workbook.sheetnames == ["login"]
+
+
+def test_watch_splits_large_sections(workspace):
+    """Test that a section with more rows than a worksheet holds continues on "_part" sheets."""
+    md_path, output_dir = workspace
+    converter = TestCaseConverter(output_dir=output_dir)
+    converter.MAX_SHEET_ROWS = 1
+    watcher = Watcher([md_path], TestCaseParser(), converter)
+    watcher.refresh(watcher.poll())
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(INITIAL.replace("  Name: Login\n", "  Name: Login\n- ID: TC002\n  Name: Login again\n"))
+    
+    assert watcher.refresh(watcher.poll()) == ["login.md"]
+    workbook = openpyxl.load_workbook(os.path.join(output_dir, "test_cases.xlsx"))
+    assert workbook.sheetnames == ["login", "login_part2", "logout"]
+    assert workbook["login_part2"].cell(2, 1).value == "TC002"
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(INITIAL)
+    watcher.refresh(watcher.poll())
+    workbook = openpyxl.load_workbook(os.path.join(output_dir, "test_cases.xlsx"))
+    assert workbook.sheetnames == ["login", "logout"]
+
+
+def test_watch_tracks_renamed_sheets(workspace):
+    """Test that worksheets renamed by openpyxl for a taken title are removed with their section."""
+    md_path, output_dir = workspace
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(INITIAL + "\n### TestCases (login.yaml)\n- ID: TC301\n  Name: Login from YAML\n")
+    watcher = Watcher([md_path], TestCaseParser(), TestCaseConverter(output_dir=output_dir))
+    watcher.refresh(watcher.poll())
+    workbook = openpyxl.load_workbook(os.path.join(output_dir, "test_cases.xlsx"))
+    assert workbook.sheetnames == ["login", "logout", "login1"]
+    assert workbook["login1"].cell(2, 1).value == "TC301"
+    
+    with open(md_path, "w", encoding="utf-8") as f:
+        f.write(INITIAL)
+    watcher.refresh(watcher.poll())
+    workbook = openpyxl.load_workbook(os.path.join(output_dir, "test_cases.xlsx"))
+    assert workbook.sheetnames == ["login", "logout"]
+    assert workbook["login"].cell(2, 1).value == "TC001"
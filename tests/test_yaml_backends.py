@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Parity tests for the YAML loader backends of TestCaseParser.
+"""
+
+import os
+import sys
+import pytest
+import tempfile
+import yaml
+
+# Add parent directory to path for imports
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parser import TestCaseParser, select_yaml_loader
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_FILES = ["sample_input_file.md", "sample_input_file_JAPANEASE.md"]
+
+requires_libyaml = pytest.mark.skipif(
+    not hasattr(yaml, "CSafeLoader"), reason="PyYAML was built without libyaml"
+)
+
+
+@requires_libyaml
+@pytest.mark.parametrize("sample_file", SAMPLE_FILES)
+def test_markdown_backend_parity(sample_file):
+    """Test that both backends, and the flat YAML fast path, parse the sample markdown files identically."""
+    path = os.path.join(ROOT_DIR, sample_file)
+    
+    c_result = TestCaseParser(yaml_backend="c", fast_path=False).parse_file(path)
+    python_result = TestCaseParser(yaml_backend="python", fast_path=False).parse_file(path)
+    fast_result = TestCaseParser().parse_file(path)
+    
+    assert len(c_result) == 3
+    assert c_result == python_result == fast_result
+
+
+@requires_libyaml
+@pytest.mark.parametrize("sample_file", SAMPLE_FILES)
+def test_yaml_file_backend_parity(sample_file):
+    """Test that both backends parse the same test cases from a YAML file."""
+    sections = TestCaseParser(yaml_backend="python").parse_file(os.path.join(ROOT_DIR, sample_file))
+    
+    with tempfile.NamedTemporaryFile(mode="w", suffix=".yaml", encoding="utf-8", delete=False) as temp_file:
+        yaml.safe_dump(sections, temp_file, allow_unicode=True)
+        temp_path = temp_file.name
+    
+    try:
+        c_result = TestCaseParser(yaml_backend="c").parse_yaml_file(temp_path)
+        python_result = TestCaseParser(yaml_backend="python").parse_yaml_file(temp_path)
+        
+        assert c_result == python_result == sections
+    finally:
+        os.unlink(temp_path)
+
+
+def test_select_auto_backend():
+    """Test that the auto backend prefers libyaml when it is available."""
+    loader, backend = select_yaml_loader("auto")
+    
+    if hasattr(yaml, "CSafeLoader"):
+        assert (loader, backend) == (yaml.CSafeLoader, "c")
+    else:
+        assert (loader, backend) == (yaml.SafeLoader, "python")
+
+
+def test_select_backend_without_libyaml(monkeypatch):
+    """Test the fallback when PyYAML was built without libyaml."""
+    monkeypatch.delattr(yaml, "CSafeLoader", raising=False)
+    
+    assert select_yaml_loader("auto") == (yaml.SafeLoader, "python")
+    with pytest.raises(ValueError):
+        select_yaml_loader("c")
+
+
+def test_select_unknown_backend():
+    """Test that an unknown backend name is rejected."""
+    with pytest.raises(ValueError):
+        TestCaseParser(yaml_backend="ruamel")
@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Version information for the markdown_to_testcase tool.
+"""
+
+__version__ = "0.1.0"
@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Watch module for converting test cases again whenever the input files change.
+"""
+
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from loguru import logger
+
+from batch import YAML_EXTENSIONS, collect_inputs, merge_results
+from converter import TestCaseConverter, output_digest
+from defaults import DEFAULT_WATCH_INTERVAL
+from manifest import remove_temporary, temporary_path
+from parser import TestCaseParser
+
+
+class Watcher:
+    """Poll input files and regenerate the outputs of the sections that changed."""
+
+    # Seconds between two checks of the input files
+    DEFAULT_INTERVAL = DEFAULT_WATCH_INTERVAL
+
+    # Directories and glob patterns are expanded again after this many polls
+    RESCAN_POLLS = 20
+
+    def __init__(self, patterns: List[str], parser: TestCaseParser, converter: TestCaseConverter,
+                 on_conflict: str = "error", interval: float = DEFAULT_INTERVAL):
+        """
+        Initialize the watcher.
+
+        Args:
+            patterns: Input files, directories or glob patterns to watch.
+            parser: Parser used for the input files.
+            converter: Converter used to write the outputs. Outputs are always overwritten.
+            on_conflict: How to handle a section name defined by more than one file.
+            interval: Seconds between two checks of the input files.
+        """
+        self.patterns = patterns
+        self.parser = parser
+        self.converter = converter
+        self.on_conflict = on_conflict
+        self.interval = interval
+        self._files = []
+        self._polls = 0
+        self._signatures = {}
+        self._results = {}
+        self._sections = {}
+        self._workbook = None
+        # Worksheet names of each section in the workbook
+        self._sheets = {}
+
+    @staticmethod
+    def _signature(file_path: str) -> Optional[Tuple[int, int]]:
+        """Return the modification time and size of a file, or None if it is missing."""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def poll(self) -> List[str]:
+        """
+        Check the input files for changes.
+
+        Returns:
+            Paths of the files that were added, modified or removed since the last poll.
+        """
+        if self._polls % self.RESCAN_POLLS == 0:
+            try:
+                self._files = collect_inputs(self.patterns)
+            except ValueError as e:
+                logger.debug(f"Keeping the previous list of input files: {str(e)}")
+        self._polls += 1
+        
+        changed = []
+        for file_path in self._files:
+            signature = self._signature(file_path)
+            if signature != self._signatures.get(file_path):
+                self._signatures[file_path] = signature
+                changed.append(file_path)
+                
+        for file_path in list(self._signatures):
+            if file_path not in self._files:
+                del self._signatures[file_path]
+                self._results.pop(file_path, None)
+                changed.append(file_path)
+                
+        return changed
+
+    def _parse(self, file_path: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Parse a markdown or YAML input file."""
+        if not os.path.exists(file_path):
+            return {}
+        if Path(file_path).suffix.lower() in YAML_EXTENSIONS:
+            return self.parser.parse_yaml_file(file_path)
+        return self.parser.parse_file(file_path)
+
+    def refresh(self, changed_files: List[str]) -> List[str]:
+        """
+        Parse changed files again and regenerate the outputs of changed sections.
+
+        Args:
+            changed_files: Paths of the files that changed.
+
+        Returns:
+            Names of the sections whose outputs were regenerated.
+        """
+        start_time = time.perf_counter()
+        for file_path in changed_files:
+            if file_path in self._files:
+                logger.info(f"Processing file: {file_path}")
+                self._results[file_path] = self._parse(file_path)
+                
+        try:
+            sections = merge_results(
+                [(file_path, self._results.get(file_path, {})) for file_path in self._files],
+                on_conflict=self.on_conflict,
+            )
+        except ValueError as e:
+            logger.error(str(e))
+            return []
+        sections = {name: cases for name, cases in sections.items() if cases}
+        
+        changed = [name for name, cases in sections.items() if self._sections.get(name) != cases]
+        removed = [name for name in self._sections if name not in sections]
+        self._sections = sections
+        if not changed and not removed:
+            logger.debug("No test case sections changed")
+            return []
+            
+        if changed:
+            self.converter.convert_to_csv({name: sections[name] for name in changed}, force=True)
+        self._update_workbook(changed, removed)
+        
+        elapsed = time.perf_counter() - start_time
+        logger.info(f"Updated {len(changed)} sections and removed {len(removed)} in {elapsed * 1000:.0f} ms")
+        return changed
+
+    def _update_workbook(self, changed: List[str], removed: List[str]):
+        """
+        Rebuild the worksheets of changed sections and save the workbook.
+
+        Sections larger than a worksheet are split as in the batch conversion,
+        see :meth:`TestCaseConverter.sheet_parts`. The workbook is an archive
+        that can only be written as a whole, so it is saved again after each
+        change, unless its rows are the same as those of the saved file.
+        """
+        excel_path = os.path.join(self.converter.output_dir, self.converter.EXCEL_FILE_NAME)
+        if self._workbook is None:
+            import openpyxl
+            
+            self._workbook = openpyxl.Workbook()
+            self._workbook.remove(self._workbook.active)
+        workbook = self._workbook
+        
+        for name in removed:
+            for title in self._sheets.pop(name, []):
+                workbook.remove(workbook[title])
+                
+        order = list(self._sections)
+        for name in changed:
+            for title in self._sheets.pop(name, []):
+                workbook.remove(workbook[title])
+            # Worksheets of the sections before this one, which are already up to date
+            index = sum(len(self._sheets.get(other, ())) for other in order[:order.index(name)])
+            titles = []
+            for offset, (title, part) in enumerate(self.converter.sheet_parts(name, self._sections[name])):
+                sheet = workbook.create_sheet(title, index + offset)
+                self.converter.fill_sheet(sheet, part)
+                # openpyxl renames a worksheet whose title is taken, so keep the title it assigned
+                titles.append(sheet.title)
+            self._sheets[name] = titles
+            
+        if not workbook.sheetnames:
+            logger.warning("No test cases to convert to Excel")
+            return
+            
+        digest = output_digest("xlsx", self._sections)
+        manifest = self.converter.manifest
+        if manifest is not None and manifest.is_unchanged(excel_path, digest):
+            logger.debug(f"Excel file is unchanged: {excel_path}")
+            return
+        temp_path = temporary_path(excel_path)
+        try:
+            workbook.save(temp_path)
+            self.converter.publish(temp_path, excel_path, digest)
+            self.converter.save_manifest()
+            logger.info(f"Updated Excel file: {excel_path}")
+        except Exception as e:
+            logger.error(f"Error creating Excel file {excel_path}: {str(e)}")
+        finally:
+            remove_temporary(temp_path)
+
+    def run(self, max_polls: Optional[int] = None):
+        """
+        Watch the input files until interrupted.
+
+        Args:
+            max_polls: Stop after this many checks of the input files; None to run forever.
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            changed_files = self.poll()
+            if changed_files:
+                self.refresh(changed_files)
+            polls += 1
+            time.sleep(self.interval)